@@ -1,20 +1,112 @@
 from django.contrib import admin
-from .models import Product, Order
+from .customers import search_orders
+from .models import (
+    Category, Customer, Product, Order, OrderItem, OrderStatusEvent, normalize_email, normalize_name
+)
+
+
+@admin.register(Category)
+class CategoryAdmin(admin.ModelAdmin):
+    list_display = ['name', 'product_count', 'in_stock_count', 'updated_at']
+    search_fields = ['name']
+    readonly_fields = ['id', 'product_count', 'in_stock_count', 'created_at', 'updated_at']
+    ordering = ['name']
 
 
 @admin.register(Product)
 class ProductAdmin(admin.ModelAdmin):
-    list_display = ['id', 'name', 'type', 'price_pesos', 'currency', 'stock', 'created_at']
-    list_filter = ['type', 'currency', 'created_at']
+    list_display = ['id', 'name', 'type', 'category', 'price_pesos', 'currency', 'stock', 'created_at', 'deleted_at']
+    list_filter = ['type', 'currency', 'created_at', 'deleted_at']
     search_fields = ['name', 'description']
+    readonly_fields = ['id', 'category', 'created_at', 'updated_at', 'deleted_at']
+    list_select_related = ['category']
+    ordering = ['-created_at']
+
+    def get_queryset(self, request):
+        # Show soft-deleted products too; purge_deleted_products removes them
+        return Product.all_objects.select_related('category')
+
+    def get_deleted_objects(self, objs, request):
+        # Soft delete leaves related orders alone, so nothing else is listed or protected
+        objs = list(objs)
+        return [str(obj) for obj in objs], {Product._meta.verbose_name_plural: len(objs)}, set(), []
+
+    def delete_model(self, request, obj):
+        obj.soft_delete()
+
+    def delete_queryset(self, request, queryset):
+        for product in queryset.filter(deleted_at__isnull=True):
+            product.soft_delete()
+
+
+@admin.register(Customer)
+class CustomerAdmin(admin.ModelAdmin):
+    list_display = ['email', 'name', 'phone', 'created_at', 'updated_at']
+    search_fields = ['email']
     readonly_fields = ['id', 'created_at', 'updated_at']
     ordering = ['-created_at']
 
+    def get_search_results(self, request, queryset, search_term):
+        """
+        Exact normalized email, or a name prefix in any case (a pattern index
+        scan on PostgreSQL, see Customer.Meta)
+        """
+        search_term = search_term.strip()
+        if not search_term:
+            return queryset, False
+        if '@' in search_term:
+            return queryset.filter(email=normalize_email(search_term)), False
+        return queryset.filter(name_key__startswith=normalize_name(search_term)), False
+
+
+class OrderItemInline(admin.TabularInline):
+    model = OrderItem
+    fields = ['position', 'product_name', 'unit_price_pesos', 'quantity', 'product']
+    readonly_fields = fields
+    extra = 0
+    can_delete = False
+
+    def has_add_permission(self, request, obj=None):
+        # Items are fixed at checkout; the sales rollups and stock depend on them
+        return False
+
+
+class OrderStatusEventInline(admin.TabularInline):
+    model = OrderStatusEvent
+    fields = ['created_at', 'old_status', 'new_status', 'source', 'stripe_event_id']
+    readonly_fields = fields
+    extra = 0
+    can_delete = False
+
+    def has_add_permission(self, request, obj=None):
+        # The history is append-only and written by status changes
+        return False
+
 
 @admin.register(Order)
 class OrderAdmin(admin.ModelAdmin):
-    list_display = ['id', 'client_name', 'client_email', 'product', 'status', 'total_pesos', 'currency', 'created_at']
+    # product_name is the order's snapshot, so the list never joins the products table
+    list_display = ['id', 'client_name', 'client_email', 'product_name', 'status', 'total_pesos', 'currency', 'created_at']
     list_filter = ['status', 'currency', 'created_at']
-    search_fields = ['client_name', 'client_email', 'client_phone', 'client_address', 'stripe_session_id']
-    readonly_fields = ['id', 'stripe_session_id', 'created_at', 'updated_at']
+    # Searches use one lookup each, see get_search_results
+    search_fields = ['customer__email']
+    readonly_fields = [
+        'id', 'customer', 'product_name', 'unit_price_pesos', 'product_picture_hash', 'stripe_session_id',
+        'created_at', 'updated_at'
+    ]
+    raw_id_fields = ['product']
     ordering = ['-created_at']
+    inlines = [OrderItemInline, OrderStatusEventInline]
+
+    def get_search_results(self, request, queryset, search_term):
+        """
+        Order id, Stripe session id, email, phone or customer name prefix,
+        instead of icontains scans over the order text columns
+        """
+        return search_orders(queryset, search_term), False
+
+    def save_model(self, request, obj, form, change):
+        if not change or 'product' in form.changed_data:
+            obj.capture_product(obj.product)
+        obj._status_source = 'admin'
+        super().save_model(request, obj, form, change)
@@ -0,0 +1,119 @@
+"""
+Set-based writes for the bulk product endpoint.
+
+Validated items are applied inside one transaction with bulk_create,
+bulk_update and soft-delete UPDATEs, in chunks of BATCH_SIZE rows.
+None of these send model signals, so the work the signals normally do is done
+here once per request: categories are resolved per distinct type,
+updated_at is set by hand, tombstones are written in bulk, the affected
+category counts are recomputed and the catalog is invalidated on commit.
+"""
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.utils import timezone
+
+from .cache import invalidate_catalog
+from .categories import get_category, recount_categories
+from .models import Product, ProductTombstone
+
+BATCH_SIZE = 500
+MAX_ITEMS = 10000
+
+
+def existing_product_ids(data):
+    """
+    Return the (live, soft-deleted) ids among the raw items, for validation context
+    """
+    ids = set()
+    for item in data:
+        try:
+            ids.add(Product._meta.pk.to_python(item.get('id')))
+        except (AttributeError, ValidationError):
+            # Malformed items and ids are reported by the item serializer
+            continue
+    ids.discard(None)
+    live, deleted = set(), set()
+    for pk, deleted_at in Product.all_objects.filter(pk__in=ids).values_list('pk', 'deleted_at'):
+        (live if deleted_at is None else deleted).add(pk)
+    return live, deleted
+
+
+def apply_product_bulk(items):
+    """
+    Apply validated ProductBulkItemSerializer items and return one result per item
+    """
+    now = timezone.now()
+    categories = {}
+    touched_categories = set()
+
+    def category_for(type_name):
+        if type_name not in categories:
+            categories[type_name] = get_category(type_name)
+        return categories[type_name]
+
+    with transaction.atomic():
+        upsert_ids = [item['id'] for item in items if item['action'] == 'upsert' and 'id' in item]
+        existing = Product.objects.select_for_update().in_bulk(upsert_ids) if upsert_ids else {}
+
+        to_create, to_update, deletes = [], [], []
+        update_fields = {'updated_at'}
+        results = []
+        for index, item in enumerate(items):
+            product_id = item.get('id')
+            if item['action'] == 'delete':
+                result = {'index': index, 'id': str(product_id), 'action': 'delete', 'status': 'deleted'}
+                deletes.append((product_id, result))
+                results.append(result)
+                continue
+
+            fields = dict(item['fields'])
+            if 'picture' in fields and fields['picture'] is None:
+                fields['picture'] = ''
+            product = existing.get(product_id)
+            if product is None:
+                product = Product(**fields)
+                if product_id is not None:
+                    product.pk = product_id
+                product.category = category_for(product.type)
+                to_create.append(product)
+                status = 'created'
+            else:
+                touched_categories.add(product.category_id)
+                for name, value in fields.items():
+                    setattr(product, name, value)
+                update_fields.update(fields)
+                if 'type' in fields:
+                    product.category = category_for(product.type)
+                    update_fields.add('category')
+                product.updated_at = now
+                to_update.append(product)
+                status = 'updated'
+            touched_categories.add(product.category_id)
+            results.append({'index': index, 'id': str(product.pk), 'action': 'upsert', 'status': status})
+
+        Product.objects.bulk_create(to_create, batch_size=BATCH_SIZE)
+        if to_update:
+            Product.objects.bulk_update(to_update, sorted(update_fields), batch_size=BATCH_SIZE)
+
+        if deletes:
+            delete_ids = [product_id for product_id, _ in deletes]
+            deleted = set()
+            for start in range(0, len(delete_ids), BATCH_SIZE):
+                chunk = delete_ids[start:start + BATCH_SIZE]
+                rows = list(Product.objects.filter(pk__in=chunk).values_list('pk', 'category_id'))
+                Product.objects.filter(pk__in=[pk for pk, _ in rows]).update(deleted_at=now, updated_at=now)
+                deleted.update(pk for pk, _ in rows)
+                touched_categories.update(category_id for _, category_id in rows)
+            ProductTombstone.objects.bulk_create(
+                [ProductTombstone(product_id=pk, deleted_at=now) for pk in deleted], batch_size=BATCH_SIZE
+            )
+            for product_id, result in deletes:
+                if product_id not in deleted:
+                    result['status'] = 'not_found'
+
+        touched_categories.discard(None)
+        if touched_categories:
+            recount_categories(touched_categories)
+        transaction.on_commit(invalidate_catalog)
+
+    return results
@@ -0,0 +1,68 @@
+"""
+Read-through response cache for the public product catalog.
+
+Entries are keyed by the request URL (scheme, host, path and query string,
+since paginated responses embed absolute next/previous links) plus a global
+catalog version. Any write to the catalog bumps the version, so stale entries are
+never read again and simply expire. The version lives in the same cache, so
+every gunicorn worker sees the bump as long as the backend is shared
+(file-based or Redis).
+"""
+import time
+from hashlib import sha1
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import caches
+
+CATALOG_VERSION_KEY = 'catalog:version'
+
+
+def get_catalog_cache():
+    return caches[getattr(settings, 'CATALOG_CACHE_ALIAS', 'default')]
+
+
+def _new_version():
+    # Start from the clock so an evicted version key never reuses an old number
+    return int(time.time() * 1000)
+
+
+def get_catalog_version():
+    cache = get_catalog_cache()
+    version = cache.get(CATALOG_VERSION_KEY)
+    if version is None:
+        cache.add(CATALOG_VERSION_KEY, _new_version(), timeout=None)
+        version = cache.get(CATALOG_VERSION_KEY)
+    return version
+
+
+def invalidate_catalog():
+    """
+    Bump the catalog version, orphaning every cached catalog response
+    """
+    cache = get_catalog_cache()
+    try:
+        cache.incr(CATALOG_VERSION_KEY)
+    except ValueError:
+        cache.set(CATALOG_VERSION_KEY, _new_version(), timeout=None)
+
+
+def catalog_cache_key(request, suffix=''):
+    query = urlencode(sorted(request.query_params.lists()), doseq=True)
+    url = f"{request.scheme}://{request.get_host()}{request.path}?{query}"
+    digest = sha1(url.encode()).hexdigest()
+    return f"catalog:{get_catalog_version()}:{digest}{suffix}"
+
+
+def cached_catalog_response(request, build, suffix=''):
+    """
+    Return the cached response data for this request, calling build() on a miss.
+    Use a suffix to cache something else derived from the same request.
+    """
+    cache = get_catalog_cache()
+    key = catalog_cache_key(request, suffix)
+    data = cache.get(key)
+    if data is None:
+        data = build()
+        cache.set(key, data, getattr(settings, 'CATALOG_CACHE_TIMEOUT', 300))
+    return data
@@ -0,0 +1,122 @@
+"""
+Multi-item orders.
+
+A cart order has one OrderItem per product, each with its quantity and a
+snapshot of the product. The order itself points at its first item's product
+and carries that item's snapshot, so the order list and everything keyed by
+Order.product keep working; total_pesos is the sum of all lines.
+
+Orders placed before carts (and orders added in the admin) have no items.
+order_lines() treats them as one unit of Order.product at total_pesos, so the
+sales rollups and the stock reduction on payment handle both kinds the same
+way. Lines are cached on the order as _lines: set before the first save, so
+the rollups see them when the creation signal fires, or loaded in bulk with
+load_order_lines().
+"""
+from decimal import Decimal
+
+from django.db import transaction
+
+from .models import Order, OrderItem, picture_hash
+
+# Most distinct products in one cart
+MAX_CART_ITEMS = 50
+
+LOAD_BATCH_SIZE = 500
+
+
+def fallback_lines(order):
+    return [(order.product_id, 1, Decimal(str(order.total_pesos)))]
+
+
+def order_lines(order):
+    """
+    [(product_id, quantity, revenue)] of an order, first line first
+    """
+    lines = getattr(order, '_lines', None)
+    if lines is None:
+        lines = [
+            (product_id, quantity, quantity * unit_price)
+            for product_id, quantity, unit_price in
+            OrderItem.objects.filter(order_id=order.pk).order_by('position')
+            .values_list('product_id', 'quantity', 'unit_price_pesos')
+        ] or fallback_lines(order)
+        order._lines = lines
+    return lines
+
+
+def load_order_lines(orders):
+    """
+    Cache the lines of many orders with one query per batch
+    """
+    orders = [order for order in orders if getattr(order, '_lines', None) is None]
+    for start in range(0, len(orders), LOAD_BATCH_SIZE):
+        chunk = {order.pk: order for order in orders[start:start + LOAD_BATCH_SIZE]}
+        lines = {}
+        items = (
+            OrderItem.objects.filter(order_id__in=chunk).order_by('order_id', 'position')
+            .values_list('order_id', 'product_id', 'quantity', 'unit_price_pesos')
+        )
+        for order_id, product_id, quantity, unit_price in items:
+            lines.setdefault(order_id, []).append((product_id, quantity, quantity * unit_price))
+        for pk, order in chunk.items():
+            order._lines = lines.get(pk) or fallback_lines(order)
+
+
+def build_order(products, client_data):
+    """
+    Unsaved order and items for [(product, quantity)], first product first.
+    All products must share a currency.
+    """
+    items = [
+        OrderItem(
+            position=position,
+            product=product,
+            quantity=quantity,
+            product_name=product.name,
+            unit_price_pesos=product.price_pesos,
+            product_picture_hash=picture_hash(product.picture),
+        )
+        for position, (product, quantity) in enumerate(products)
+    ]
+    order = Order(
+        **client_data,
+        total_pesos=sum((item.line_total for item in items), Decimal(0)),
+        currency=products[0][0].currency,
+    )
+    order.capture_product(products[0][0])
+    order._lines = [(item.product_id, item.quantity, item.line_total) for item in items]
+    for item in items:
+        item.order = order
+    return order, items
+
+
+def place_order(order, items, source='checkout'):
+    """
+    Save a built order and its items in one transaction
+    """
+    with transaction.atomic():
+        order._status_source = source
+        order.save()
+        OrderItem.objects.bulk_create(items)
+    return order
+
+
+def stripe_line_items(items, currency):
+    """
+    Checkout session line_items, one per item
+    """
+    return [
+        {
+            'price_data': {
+                'currency': currency.lower(),
+                'product_data': {
+                    'name': item.product_name,
+                },
+                # Stripe requires amounts in cents
+                'unit_amount': int(item.unit_price_pesos * 100),
+            },
+            'quantity': item.quantity,
+        }
+        for item in items
+    ]
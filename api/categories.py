@@ -0,0 +1,64 @@
+"""
+Category resolution and facet count maintenance.
+
+Counts are adjusted incrementally with F() updates as products are saved,
+deleted or run out of stock. Bulk writes that bypass model signals call
+recount_categories() instead, which recomputes the counts of the given
+categories in one statement.
+"""
+from django.db.models import Count, F, IntegerField, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .models import Category, Product
+
+
+def get_category(name):
+    category, _ = Category.objects.get_or_create(name=name)
+    return category
+
+
+def adjust_category_counts(category_id, products=0, in_stock=0):
+    if category_id is None or not (products or in_stock):
+        return
+    Category.objects.filter(pk=category_id).update(
+        product_count=F('product_count') + products,
+        in_stock_count=F('in_stock_count') + in_stock,
+        updated_at=timezone.now()
+    )
+
+
+def apply_facet_change(old, new):
+    """
+    Move a product between (category_id, in_stock) facets; either side may be None
+    """
+    if old == new:
+        return
+    if old is not None:
+        adjust_category_counts(old[0], products=-1, in_stock=-int(old[1]))
+    if new is not None:
+        adjust_category_counts(new[0], products=1, in_stock=int(new[1]))
+
+
+def recount_categories(category_ids=None):
+    """
+    Recompute the counts of the given categories (all of them by default) from the products table
+    """
+    def count(**filters):
+        return Coalesce(Subquery(
+            Product.objects.filter(category=OuterRef('pk'), **filters)
+            .order_by()
+            .values('category')
+            .annotate(total=Count('pk'))
+            .values('total'),
+            output_field=IntegerField()
+        ), 0)
+
+    categories = Category.objects.all()
+    if category_ids is not None:
+        categories = categories.filter(pk__in=category_ids)
+    categories.update(
+        product_count=count(),
+        in_stock_count=count(stock__gt=0),
+        updated_at=timezone.now()
+    )
@@ -0,0 +1,108 @@
+"""
+Delta sync feed for the product catalog.
+
+Clients keep a local copy of the catalog and fetch only what changed since
+their last cursor: products created or updated, ordered by the indexed
+(updated_at, id) key, and tombstones of deleted products, ordered by
+(deleted_at, id). The cursor is an opaque token holding the last position
+read in both streams.
+
+Rows newer than CHANGES_SETTLE_SECONDS are held back until the next fetch:
+updated_at is set before a transaction commits, so a slow writer could
+otherwise commit a row behind a cursor that already moved past it.
+"""
+import base64
+import json
+import uuid
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+
+from .models import Product, ProductTombstone
+
+DEFAULT_LIMIT = 500
+MAX_LIMIT = 1000
+
+
+def encode_cursor(products_position, deleted_position):
+    """
+    Pack the last (timestamp, id) read from each stream into an opaque token
+    """
+    payload = [
+        [timestamp.isoformat(), str(pk or '')]
+        for timestamp, pk in (products_position, deleted_position)
+    ]
+    return base64.urlsafe_b64encode(json.dumps(payload, separators=(',', ':')).encode()).decode()
+
+
+def decode_cursor(cursor):
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        products_position, deleted_position = (
+            (datetime.fromisoformat(timestamp), uuid.UUID(pk) if pk else None)
+            for timestamp, pk in payload
+        )
+        if timezone.is_naive(products_position[0]) or timezone.is_naive(deleted_position[0]):
+            raise ValueError('Cursor timestamps must be timezone-aware')
+        return products_position, deleted_position
+    except (ValueError, TypeError, AttributeError):
+        raise ValidationError({'since': ['Invalid cursor.']})
+
+
+def after(queryset, field, position):
+    """
+    Rows strictly after (timestamp, id) in (field, id) order
+    """
+    timestamp, pk = position
+    if timestamp is None:
+        return queryset
+    if pk is None:
+        return queryset.filter(**{f'{field}__gt': timestamp})
+    return queryset.filter(Q(**{f'{field}__gt': timestamp}) | Q(**{field: timestamp, 'id__gt': pk}))
+
+
+def read_stream(queryset, field, position, horizon, limit):
+    """
+    Return up to limit rows after position and no newer than horizon, the new
+    position and whether more rows are waiting
+    """
+    rows = list(
+        after(queryset, field, position)
+        .filter(**{f'{field}__lte': horizon})
+        .order_by(field, 'id')[:limit + 1]
+    )
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    if rows:
+        position = (getattr(rows[-1], field), rows[-1].pk)
+    return rows, position, has_more
+
+
+def get_changes(since=None, limit=DEFAULT_LIMIT):
+    """
+    Return (products, deleted product ids, next cursor, has_more).
+    Without a cursor every current product is returned and tombstones start
+    from now, since there is no local copy to delete from yet.
+    """
+    horizon = timezone.now() - timedelta(seconds=getattr(settings, 'CHANGES_SETTLE_SECONDS', 2))
+    if since:
+        products_position, deleted_position = decode_cursor(since)
+    else:
+        products_position, deleted_position = (None, None), (horizon, None)
+
+    products, products_position, more_products = read_stream(
+        Product.objects.only('id', 'updated_at'), 'updated_at', products_position, horizon, limit
+    )
+    tombstones, deleted_position, more_deleted = read_stream(
+        ProductTombstone.objects.all(), 'deleted_at', deleted_position, horizon, limit
+    )
+    if products_position[0] is None:
+        # Nothing read yet; resume from the horizon rather than the beginning
+        products_position = (horizon, None)
+
+    cursor = encode_cursor(products_position, deleted_position)
+    deleted = [str(tombstone.product_id) for tombstone in tombstones]
+    return products, deleted, cursor, more_products or more_deleted
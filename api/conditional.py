@@ -0,0 +1,56 @@
+"""
+Conditional GET support: ETag / Last-Modified validators and 304 responses.
+
+Validators come from ``updated_at`` through a single aggregate query (or a
+single-column lookup for detail views), which is far cheaper than loading and
+serializing the rows themselves.
+"""
+from hashlib import md5
+
+from django.db.models import Count, Max
+from django.utils.http import http_date, parse_etags, parse_http_date_safe, quote_etag
+from rest_framework import status
+from rest_framework.response import Response
+
+
+def make_etag(*parts):
+    digest = md5('|'.join(str(part) for part in parts).encode(), usedforsecurity=False)
+    return quote_etag(digest.hexdigest())
+
+
+def queryset_validators(queryset, *extra):
+    """
+    ETag and Last-Modified for a list, from the newest updated_at and the row count
+    """
+    stats = queryset.order_by().aggregate(last_modified=Max('updated_at'), count=Count('pk'))
+    etag = make_etag(stats['last_modified'], stats['count'], *extra)
+    return etag, stats['last_modified']
+
+
+def is_not_modified(request, etag, last_modified):
+    if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
+    if if_none_match:
+        # Weak comparison, as required for If-None-Match
+        etags = [tag.removeprefix('W/') for tag in parse_etags(if_none_match)]
+        return '*' in etags or etag in etags
+
+    if_modified_since = parse_http_date_safe(request.META.get('HTTP_IF_MODIFIED_SINCE'))
+    if if_modified_since and last_modified:
+        return int(last_modified.timestamp()) <= if_modified_since
+    return False
+
+
+def conditional_response(request, validators, build):
+    """
+    Return 304 when the client's copy is current, otherwise the response from build()
+    """
+    etag, last_modified = validators
+    if is_not_modified(request, etag, last_modified):
+        response = Response(status=status.HTTP_304_NOT_MODIFIED)
+    else:
+        response = build()
+
+    response['ETag'] = etag
+    if last_modified:
+        response['Last-Modified'] = http_date(last_modified.timestamp())
+    return response
@@ -0,0 +1,82 @@
+"""
+Customers and indexed order lookups.
+
+Every order with a client email is linked to the Customer with that
+normalized email when it is first saved (see the pre_save receiver in
+api/signals.py). The customer's name, phone and address follow the latest
+order. The populate migration links older orders in batches.
+
+Support searches go through search_orders(), which picks one lookup from the
+shape of the search term instead of scanning the order text columns with
+icontains. Ids, session ids, emails and phones are indexed equality lookups.
+Phones match the phone given on each order, so orders placed under an older
+number are still found. Names match case-insensitively by prefix on
+Customer.name_key, served by a pattern index on PostgreSQL (SQLite scans the
+customers table). Addresses are not searchable.
+"""
+import re
+import uuid
+
+from django.db import IntegrityError, transaction
+
+from .models import Customer, normalize_email, normalize_name
+
+PHONE_RE = re.compile(r'^\+?[\d\s\-()]{6,}$')
+
+
+def customer_for(email, name='', phone='', address=''):
+    """
+    Get or create the customer for an email, updating its details to the ones given
+    """
+    email = normalize_email(email)
+    details = {'name': name, 'phone': phone, 'address': address}
+    customer = Customer.objects.filter(email=email).first()
+    if customer is None:
+        try:
+            with transaction.atomic():
+                return Customer.objects.create(email=email, **details)
+        except IntegrityError:
+            # Another checkout created it first
+            customer = Customer.objects.get(email=email)
+
+    changed = {field: value for field, value in details.items() if value and getattr(customer, field) != value}
+    if changed:
+        for field, value in changed.items():
+            setattr(customer, field, value)
+        customer.save(update_fields=[*changed, 'updated_at'])
+    return customer
+
+
+def assign_customer(order):
+    """
+    Link an unsaved or unlinked order to the customer of its client email
+    """
+    if order.customer_id is None and normalize_email(order.client_email):
+        order.customer = customer_for(
+            order.client_email, order.client_name, order.client_phone, order.client_address
+        )
+
+
+def search_orders(queryset, term):
+    """
+    Orders matching a support search, through one lookup: an order id, a
+    Stripe session id, an email, a phone number, or else a customer name
+    prefix in any case
+    """
+    term = term.strip()
+    if not term:
+        return queryset
+    try:
+        return queryset.filter(pk=uuid.UUID(term))
+    except ValueError:
+        pass
+    if term.startswith('cs_'):
+        return queryset.filter(stripe_session_id=term)
+    if PHONE_RE.match(term):
+        return queryset.filter(client_phone=term)
+    if '@' in term:
+        customers = Customer.objects.filter(email=normalize_email(term))
+    else:
+        customers = Customer.objects.filter(name_key__startswith=normalize_name(term))
+    # No ordering in the subquery, the model's -created_at would only add a sort
+    return queryset.filter(customer__in=customers.order_by().values('pk'))
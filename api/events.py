@@ -0,0 +1,137 @@
+"""
+Order status fan-out for the Server-Sent Events endpoint.
+
+Status changes made in this process are pushed straight to the subscribers
+through the in-process broadcaster. Changes made by other gunicorn workers
+(webhooks, success page, reconciliation scripts) reach this process through
+the database channel, which polls only the orders that have an open stream,
+once per interval, no matter how many clients are listening.
+"""
+import asyncio
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.db import DatabaseError, close_old_connections
+
+logger = logging.getLogger(__name__)
+
+
+class OrderStatusBroadcaster:
+    """
+    In-process fan-out of order status changes to SSE subscribers.
+
+    Subscribers are asyncio queues living on the ASGI event loop, while
+    publishers are usually sync views running in a worker thread, so the
+    delivery goes through ``call_soon_threadsafe``.
+    """
+
+    def __init__(self, channel=None):
+        self._lock = threading.Lock()
+        self._subscribers = {}  # order_id -> set of (loop, queue)
+        self._last_status = {}  # order_id -> last delivered status
+        self.channel = channel
+
+    def subscribe(self, order_id):
+        loop = asyncio.get_running_loop()
+        queue = asyncio.Queue()
+        with self._lock:
+            self._subscribers.setdefault(order_id, set()).add((loop, queue))
+        if self.channel is not None:
+            self.channel.start(self)
+        return queue
+
+    def unsubscribe(self, order_id, queue):
+        with self._lock:
+            subscribers = self._subscribers.get(order_id, set())
+            subscribers.discard((asyncio.get_running_loop(), queue))
+            if not subscribers:
+                self._subscribers.pop(order_id, None)
+                self._last_status.pop(order_id, None)
+
+    def watched_order_ids(self):
+        with self._lock:
+            return list(self._subscribers)
+
+    def publish(self, order_id, status, updated_at):
+        """
+        Announce a status change made by this process
+        """
+        self.deliver(order_id, status, updated_at)
+
+    def deliver(self, order_id, status, updated_at):
+        """
+        Hand a status to every local subscriber of the order, skipping repeats
+        """
+        with self._lock:
+            subscribers = list(self._subscribers.get(order_id, ()))
+            if not subscribers or self._last_status.get(order_id) == status:
+                return
+            self._last_status[order_id] = status
+
+        event = {
+            'order_id': order_id,
+            'status': status,
+            'updated_at': updated_at.isoformat() if updated_at else None,
+        }
+        for loop, queue in subscribers:
+            try:
+                loop.call_soon_threadsafe(queue.put_nowait, event)
+            except RuntimeError:
+                # Event loop already closed; the stream is going away
+                pass
+
+
+class DatabasePollChannel:
+    """
+    Cross-process notification channel backed by the orders table.
+
+    A single daemon thread per process looks up the current status of the
+    orders with open streams and feeds the broadcaster, which drops the
+    statuses it has already delivered.
+    """
+
+    batch_size = 500
+
+    def __init__(self, interval=1.0):
+        self.interval = interval
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def start(self, broadcaster):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run,
+                    args=(broadcaster,),
+                    name='order-status-poll',
+                    daemon=True,
+                )
+                self._thread.start()
+
+    def _run(self, broadcaster):
+        from .models import Order
+
+        while True:
+            time.sleep(self.interval)
+            order_ids = broadcaster.watched_order_ids()
+            if not order_ids:
+                continue
+            try:
+                for start in range(0, len(order_ids), self.batch_size):
+                    batch = order_ids[start:start + self.batch_size]
+                    rows = Order.objects.filter(pk__in=batch).values_list('id', 'status', 'updated_at')
+                    for order_id, status, updated_at in rows:
+                        broadcaster.deliver(str(order_id), status, updated_at)
+            except DatabaseError:
+                logger.exception("Failed to poll order statuses")
+            finally:
+                close_old_connections()
+
+
+broadcaster = OrderStatusBroadcaster(
+    channel=DatabasePollChannel(
+        interval=getattr(settings, 'ORDER_EVENTS_POLL_INTERVAL', 1.0),
+    ),
+)
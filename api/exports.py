@@ -0,0 +1,187 @@
+"""
+Streaming order exports (CSV and NDJSON).
+
+Orders are walked in (created_at, id) keyset order, one values_list() page of
+EXPORT_PAGE_SIZE rows per query, so memory stays constant whatever the table
+size and no query holds a long read open. Each page is encoded into a single
+bytes block, which is what the HTTP response and the export_orders command
+write out.
+"""
+import csv
+import io
+import json
+from datetime import datetime, time, timedelta
+
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from rest_framework import serializers
+
+from .models import Order
+from .renderers import orjson
+
+EXPORT_PAGE_SIZE = 2000
+
+# (header, values_list lookup)
+EXPORT_COLUMNS = [
+    ('id', 'id'),
+    ('created_at', 'created_at'),
+    ('updated_at', 'updated_at'),
+    ('status', 'status'),
+    ('client_name', 'client_name'),
+    ('client_email', 'client_email'),
+    ('client_phone', 'client_phone'),
+    ('client_address', 'client_address'),
+    ('total_pesos', 'total_pesos'),
+    ('currency', 'currency'),
+    ('stripe_session_id', 'stripe_session_id'),
+    ('product_id', 'product_id'),
+    ('product_name', 'product_name'),
+]
+
+EXPORT_FORMATS = {
+    'csv': 'text/csv; charset=utf-8',
+    'ndjson': 'application/x-ndjson',
+}
+
+
+class ExportFilterError(ValueError):
+    """
+    Invalid export filter; field names the offending parameter
+    """
+
+    def __init__(self, field, message):
+        super().__init__(f"{field}: {message}")
+        self.field = field
+        self.message = message
+
+
+def parse_bound(value, name, end=False):
+    """
+    Parse an ISO date or datetime; a bare date used as an upper bound covers the whole day
+    """
+    moment = parse_datetime(value)
+    if moment is None:
+        day = parse_date(value)
+        if day is None:
+            raise ExportFilterError(name, "Expected an ISO date or datetime.")
+        moment = datetime.combine(day + timedelta(days=1) if end else day, time.min)
+    elif end:
+        # Datetime bounds are inclusive
+        moment += timedelta(microseconds=1)
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment)
+    return moment
+
+
+def export_queryset(date_from=None, date_to=None, statuses=None):
+    """
+    Orders created in [date_from, date_to] with one of statuses; raises ExportFilterError on bad input
+    """
+    queryset = Order.objects.all()
+    if date_from:
+        queryset = queryset.filter(created_at__gte=parse_bound(date_from, 'from'))
+    if date_to:
+        queryset = queryset.filter(created_at__lt=parse_bound(date_to, 'to', end=True))
+    if statuses:
+        valid = {choice for choice, _ in Order.STATUS_CHOICES}
+        unknown = set(statuses) - valid
+        if unknown:
+            raise ExportFilterError('status', f"Unknown status: {', '.join(sorted(unknown))}.")
+        queryset = queryset.filter(status__in=statuses)
+    return queryset
+
+
+def iter_order_pages(queryset, page_size=EXPORT_PAGE_SIZE, key='created_at'):
+    """
+    Yield lists of row tuples (EXPORT_COLUMNS order) in (key, id) keyset order
+    """
+    lookups = [lookup for _, lookup in EXPORT_COLUMNS]
+    queryset = queryset.order_by(key, 'id').values_list(*lookups)
+    key_index, id_index = lookups.index(key), lookups.index('id')
+    page = list(queryset[:page_size])
+    while page:
+        yield page
+        if len(page) < page_size:
+            return
+        last = page[-1]
+        value, pk = last[key_index], last[id_index]
+        page = list(queryset.filter(Q(**{f'{key}__gt': value}) | Q(**{key: value, 'id__gt': pk}))[:page_size])
+
+
+# API payloads format datetimes with this field (UTC as 'Z', like the JSON renderer)
+DATETIME_FIELD = serializers.DateTimeField()
+
+
+def export_value(value):
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return DATETIME_FIELD.to_representation(value)
+    if isinstance(value, (str, int, float, bool)):
+        return value
+    # UUID, Decimal
+    return str(value)
+
+
+def encode_csv(pages):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow([header for header, _ in EXPORT_COLUMNS])
+    for page in pages:
+        for row in page:
+            writer.writerow(['' if value is None else export_value(value) for value in row])
+        yield buffer.getvalue().encode('utf-8')
+        buffer.seek(0)
+        buffer.truncate()
+    # Header only when there are no orders
+    if buffer.tell():
+        yield buffer.getvalue().encode('utf-8')
+
+
+def encode_ndjson(pages):
+    headers = [header for header, _ in EXPORT_COLUMNS]
+
+    def dumps(data):
+        if orjson is not None:
+            return orjson.dumps(data) + b'\n'
+        return (json.dumps(data, ensure_ascii=False) + '\n').encode('utf-8')
+
+    for page in pages:
+        yield b''.join(
+            dumps({header: export_value(value) for header, value in zip(headers, row)})
+            for row in page
+        )
+
+
+def export_orders(queryset, export_format, page_size=EXPORT_PAGE_SIZE):
+    """
+    Yield the export as bytes blocks, one per page of orders
+    """
+    encode = encode_csv if export_format == 'csv' else encode_ndjson
+    return encode(iter_order_pages(queryset, page_size))
+
+
+async def aiter_blocks(blocks):
+    """
+    Async iterator over a sync generator, advanced one page at a time in the sync thread.
+    ASGI servers would otherwise read the whole sync iterator into a list first.
+    """
+    sentinel = object()
+    next_block = sync_to_async(next, thread_sensitive=True)
+    while True:
+        block = await next_block(blocks, sentinel)
+        if block is sentinel:
+            return
+        yield block
+
+
+def streaming_content(request, blocks):
+    """
+    Pick the iterator type the handler streams without buffering
+    """
+    if isinstance(request, ASGIRequest):
+        return aiter_blocks(blocks)
+    return blocks
@@ -0,0 +1,104 @@
+"""
+Read-only fast-path serializers for the list endpoints.
+
+They build the same output as ProductSerializer and the order list serializers
+from ``values_list()`` tuples instead of model instances, skipping model
+instantiation, per-object field binding and attribute lookups. The
+column-to-key mapping and the converter of each column are computed once from
+the DRF serializer's own fields, so the output stays identical to it (see
+test_fast_serializers.py for the golden-output test).
+"""
+from rest_framework import serializers
+
+from .serializers import ProductSerializer, OrderListSerializer
+
+
+def field_converter(field):
+    """
+    Return a function converting a raw column value like field.to_representation
+    """
+    if isinstance(field, (serializers.CharField, serializers.UUIDField)):
+        if isinstance(field, serializers.UUIDField) and field.uuid_format != 'hex_verbose':
+            return field.to_representation
+        return str
+    if isinstance(field, serializers.IntegerField):
+        return int
+    if isinstance(field, serializers.ChoiceField) and all(isinstance(key, str) for key in field.choices):
+        return str
+    # DecimalField, DateTimeField and anything else keep DRF's own conversion
+    return field.to_representation
+
+
+class FastProductSerializer:
+    """
+    ProductSerializer output from values_list() rows
+    """
+
+    def __init__(self, prefix=''):
+        fields = ProductSerializer().fields
+        self.keys = [name for name, field in fields.items() if not field.write_only]
+        self.columns = [prefix + key for key in self.keys]
+        self.converters = [field_converter(fields[key]) for key in self.keys]
+
+    def to_representation(self, row):
+        data = {
+            key: None if value is None else convert(value)
+            for key, convert, value in zip(self.keys, self.converters, row)
+        }
+        # Same picture fix-up as ProductSerializer.to_representation
+        if not data['picture']:
+            data['picture'] = ""
+        return data
+
+    def serialize(self, rows):
+        return [self.to_representation(row) for row in rows]
+
+
+class FastSnapshotSerializer:
+    """
+    Output of a nested serializer with source='*', whose fields read the
+    parent's own columns
+    """
+
+    def __init__(self, serializer):
+        fields = serializer.fields
+        self.keys = list(fields)
+        self.columns = [field.source for field in fields.values()]
+        self.converters = [field_converter(field) for field in fields.values()]
+
+    def to_representation(self, row):
+        return {
+            key: None if value is None else convert(value)
+            for key, convert, value in zip(self.keys, self.converters, row)
+        }
+
+
+class FastOrderSerializer:
+    """
+    Order list output from values_list() rows, for OrderListSerializer (the
+    current product, joined in the same query) or OrderSnapshotListSerializer
+    (the order's own snapshot, so the rows come from the orders table alone)
+    """
+
+    def __init__(self, serializer_class=OrderListSerializer):
+        fields = serializer_class().fields
+        self.keys = [name for name, field in fields.items() if not field.write_only]
+        self.own_keys = [key for key in self.keys if key != 'product']
+        self.converters = [field_converter(fields[key]) for key in self.own_keys]
+        if isinstance(fields['product'], ProductSerializer):
+            self.product = FastProductSerializer(prefix='product__')
+        else:
+            self.product = FastSnapshotSerializer(fields['product'])
+        self.columns = self.own_keys + self.product.columns
+        self.product_offset = len(self.own_keys)
+
+    def to_representation(self, row):
+        data = {
+            key: None if value is None else convert(value)
+            for key, convert, value in zip(self.own_keys, self.converters, row)
+        }
+        data['product'] = self.product.to_representation(row[self.product_offset:])
+        return {key: data[key] for key in self.keys}
+
+    def serialize(self, rows):
+        return [self.to_representation(row) for row in rows]
@@ -0,0 +1,73 @@
+from decimal import Decimal, InvalidOperation
+
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend, OrderingFilter
+
+from .search import search_products
+
+
+class ProductSearchFilter(BaseFilterBackend):
+    """
+    Full-text search on name, description and type with ?q=
+    """
+    search_param = 'q'
+
+    def filter_queryset(self, request, queryset, view):
+        query = request.query_params.get(self.search_param, '').strip()
+        if not query:
+            return queryset
+        return search_products(queryset, query)
+
+
+class ProductFilter(BaseFilterBackend):
+    """
+    Filter products with ?type=, ?min_price=, ?max_price= and ?in_stock=true|false.
+    Every filter runs in SQL and is backed by an index on Product.
+    """
+    true_values = ('true', '1', 'yes')
+    false_values = ('false', '0', 'no')
+
+    def filter_queryset(self, request, queryset, view):
+        params = request.query_params
+
+        product_type = params.get('type')
+        if product_type:
+            queryset = queryset.filter(type=product_type)
+
+        min_price = self.get_price(params, 'min_price')
+        if min_price is not None:
+            queryset = queryset.filter(price_pesos__gte=min_price)
+
+        max_price = self.get_price(params, 'max_price')
+        if max_price is not None:
+            queryset = queryset.filter(price_pesos__lte=max_price)
+
+        in_stock = params.get('in_stock', '').lower()
+        if in_stock in self.true_values:
+            queryset = queryset.filter(stock__gt=0)
+        elif in_stock in self.false_values:
+            queryset = queryset.filter(stock=0)
+        elif in_stock:
+            raise ValidationError({'in_stock': ['Must be true or false.']})
+
+        return queryset
+
+    def get_price(self, params, name):
+        value = params.get(name)
+        if not value:
+            return None
+        try:
+            price = Decimal(value)
+        except InvalidOperation:
+            raise ValidationError({name: ['A valid number is required.']})
+        if not price.is_finite() or price < 0:
+            raise ValidationError({name: ['A valid non-negative number is required.']})
+        return price
+
+
+class ProductOrderingFilter(OrderingFilter):
+    """
+    ?ordering=price_pesos|-created_at|name (any field, either direction).
+    Without it, search results keep their relevance order.
+    """
+    ordering_fields = ['price_pesos', 'created_at', 'name']
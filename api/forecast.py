@@ -0,0 +1,152 @@
+"""
+Sales velocity and restock forecast for the admin restock report.
+
+Units sold per product over the last 7, 30 and 90 full days are summed in one
+grouped query over the daily sales rollups (api/reports.py), so the cost
+depends on products and days, not on orders. The rest is vectorized with
+NumPy over one row per product:
+
+- velocity per window is units / days, with days capped at the product's age
+  so new products aren't diluted by days they weren't on sale;
+- the forecast velocity blends the windows with VELOCITY_WEIGHTS, favouring
+  recent sales;
+- days of stock = stock / velocity;
+- reorder point = velocity * (lead time + safety days), and products at or
+  below it get a suggested order covering lead time + cover days.
+
+The result is cached in the catalog cache (CATALOG_CACHE_ALIAS, see
+api/cache.py), which both settings files point at a backend shared between
+processes, so a refresh by the refresh_restock_report command reaches every
+web worker.
+"""
+import time
+from datetime import timedelta
+
+import numpy as np
+from django.conf import settings
+from django.db.models import Q, Sum
+from django.utils import timezone
+
+from .cache import get_catalog_cache
+from .models import DailySalesRollup, Product
+from .reports import bucket_start
+
+# Statuses of orders that were paid for
+PAID_STATUSES = ('success', 'sent', 'shipped', 'delivered')
+
+WINDOWS = (7, 30, 90)
+VELOCITY_WEIGHTS = (0.5, 0.3, 0.2)
+
+RESTOCK_REPORT_CACHE_KEY = 'reports:restock'
+
+
+def window_sales(windows, today):
+    """
+    Units sold per product in each window of full days before today
+    """
+    sums = {
+        f'units_{days}': Sum('units', filter=Q(bucket__gte=today - timedelta(days=days)))
+        for days in windows
+    }
+    return (
+        DailySalesRollup.objects
+        .filter(status__in=PAID_STATUSES, bucket__gte=today - timedelta(days=max(windows)), bucket__lt=today)
+        .order_by()
+        .values('product_id')
+        .annotate(**sums)
+        .values_list('product_id', *sums)
+    )
+
+
+def forecast_restock(lead_time_days=None, safety_days=None, cover_days=None):
+    """
+    Compute the restock report for every live product, most urgent first
+    """
+    started = time.perf_counter()
+    lead_time_days = lead_time_days if lead_time_days is not None else settings.RESTOCK_LEAD_TIME_DAYS
+    safety_days = safety_days if safety_days is not None else settings.RESTOCK_SAFETY_DAYS
+    cover_days = cover_days if cover_days is not None else settings.RESTOCK_COVER_DAYS
+    now = timezone.now()
+    today = bucket_start(now, 'day')
+
+    products = list(Product.objects.order_by().values_list('id', 'name', 'stock', 'created_at'))
+    ids = [product[0] for product in products]
+    count = len(products)
+    stock = np.fromiter((product[2] for product in products), dtype=np.float64, count=count)
+    age_days = np.fromiter(
+        ((now - product[3]).total_seconds() / 86400 for product in products), dtype=np.float64, count=count
+    )
+
+    units = np.zeros((count, len(WINDOWS)))
+    rows = list(window_sales(WINDOWS, today))
+    if rows:
+        index = {pk: position for position, pk in enumerate(ids)}
+        positions = np.fromiter((index.get(row[0], -1) for row in rows), dtype=np.int64, count=len(rows))
+        sums = np.array([row[1:] for row in rows], dtype=np.float64)
+        # Rollups of soft-deleted products have no row to go to
+        live = positions >= 0
+        units[positions[live]] = np.nan_to_num(sums[live])
+
+    days = np.clip(age_days[:, None], 1, np.array(WINDOWS, dtype=np.float64))
+    velocities = units / days
+    weights = np.array(VELOCITY_WEIGHTS) / sum(VELOCITY_WEIGHTS)
+    velocity = velocities @ weights
+
+    selling = velocity > 0
+    days_of_stock = np.divide(stock, velocity, out=np.full(count, np.inf), where=selling)
+    reorder_point = np.ceil(velocity * (lead_time_days + safety_days))
+    needs_restock = selling & (stock <= reorder_point)
+    suggested = np.where(
+        needs_restock, np.maximum(np.ceil(velocity * (lead_time_days + cover_days)) - stock, 0), 0
+    )
+
+    order = np.lexsort((-velocity, days_of_stock))
+    velocity_columns = [np.round(velocities[:, column], 3).tolist() for column in range(len(WINDOWS))]
+    velocity_list = np.round(velocity, 3).tolist()
+    days_list = np.where(selling, np.round(days_of_stock, 1), -1).tolist()
+    reorder_list = reorder_point.astype(np.int64).tolist()
+    suggested_list = suggested.astype(np.int64).tolist()
+    needs_list = needs_restock.tolist()
+
+    results = []
+    for position in order.tolist():
+        pk, name, product_stock, _ = products[position]
+        results.append({
+            'product_id': str(pk),
+            'name': name,
+            'stock': product_stock,
+            'velocity': velocity_list[position],
+            'velocity_by_window': {
+                str(window): column[position] for window, column in zip(WINDOWS, velocity_columns)
+            },
+            'days_of_stock': days_list[position] if selling[position] else None,
+            'reorder_point': reorder_list[position],
+            'suggested_order': suggested_list[position],
+            'needs_restock': needs_list[position],
+        })
+
+    return {
+        'generated_at': now.isoformat(),
+        'windows': list(WINDOWS),
+        'lead_time_days': lead_time_days,
+        'safety_days': safety_days,
+        'cover_days': cover_days,
+        'seconds': round(time.perf_counter() - started, 3),
+        'products': results,
+    }
+
+
+def refresh_restock_report():
+    report = forecast_restock()
+    get_catalog_cache().set(RESTOCK_REPORT_CACHE_KEY, report, settings.RESTOCK_REPORT_TIMEOUT)
+    return report
+
+
+def get_restock_report():
+    """
+    Cached restock report, computed on a miss
+    """
+    report = get_catalog_cache().get(RESTOCK_REPORT_CACHE_KEY)
+    if report is None:
+        report = refresh_restock_report()
+    return report
@@ -0,0 +1,69 @@
+"""
+Per-product cache of rendered JSON fragments.
+
+Each product's JSON is stored under its id and updated_at, so a list is
+assembled by fetching the fragments of the whole page in one cache round trip
+and serializing only the products that changed since they were cached. Every
+product write bumps updated_at, so fragments never need to be invalidated.
+"""
+from django.conf import settings
+from django.core.cache import caches
+
+from .fast_serializers import FastProductSerializer
+from .models import Product
+from .renderers import JSONRenderer, RenderedJSON
+
+
+def fragment_key(pk, updated_at):
+    return f"product-fragment:{pk.hex}:{updated_at.isoformat()}"
+
+
+def render_product_fragments(products):
+    """
+    Return the rendered JSON of each product, in order.
+    Products only need id and updated_at loaded; the rows of the products
+    missing from the cache are fetched in one values_list() query.
+    """
+    cache = caches[getattr(settings, 'PRODUCT_FRAGMENT_CACHE_ALIAS', 'default')]
+    keys = [fragment_key(product.pk, product.updated_at) for product in products]
+    fragments = cache.get_many(keys)
+
+    missing = {product.pk: key for key, product in zip(keys, products) if key not in fragments}
+    if missing:
+        serializer = FastProductSerializer()
+        id_index = serializer.keys.index('id')
+        updated_at_index = serializer.keys.index('updated_at')
+        renderer = JSONRenderer()
+
+        rendered = {}
+        for row in Product._base_manager.filter(pk__in=missing).values_list(*serializer.columns):
+            pk = row[id_index]
+            fragment = renderer.render(serializer.to_representation(row))
+            # Key by the row just read, in case the product changed since the page query
+            rendered[fragment_key(pk, row[updated_at_index])] = fragment
+            fragments[missing[pk]] = fragment
+        cache.set_many(rendered, getattr(settings, 'PRODUCT_FRAGMENT_TIMEOUT', 86400))
+
+    # Products deleted since the page query are left out
+    return [fragments[key] for key in keys if key in fragments]
+
+
+def render_product_list(products):
+    return RenderedJSON(b'[' + b','.join(render_product_fragments(products)) + b']')
+
+
+def render_product_envelope(data, key, products):
+    """
+    Render data with the product fragments as the list under key.
+    Put key first in data so no other value can contain its marker.
+    """
+    envelope = JSONRenderer().render({**data, key: []})
+    marker = b'"' + key.encode() + b'":[]'
+    return RenderedJSON(envelope.replace(marker, marker[:-1] + render_product_list(products)[1:], 1))
+
+
+def render_product_page(paginator, page):
+    """
+    Render the paginator's envelope around the fragments of the current page
+    """
+    return render_product_envelope(paginator.get_paginated_response([]).data, 'results', page)
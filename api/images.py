@@ -0,0 +1,93 @@
+"""
+Product picture normalization for catalog imports.
+
+process_image() turns an imported picture value (a base64 data URI, or a file
+path when reading from disk is allowed) into the data URI stored on Product.
+It only uses the standard library, plus Pillow for downscaling when it is
+installed, and doesn't touch Django, so it can run in a process pool.
+"""
+import base64
+import binascii
+import io
+import os
+
+try:
+    from PIL import Image
+except ImportError:  # Pictures are stored as-is without Pillow
+    Image = None
+
+# Leading bytes of the formats browsers display
+SIGNATURES = [
+    (b'\x89PNG\r\n\x1a\n', 'image/png'),
+    (b'\xff\xd8\xff', 'image/jpeg'),
+    (b'GIF87a', 'image/gif'),
+    (b'GIF89a', 'image/gif'),
+    (b'BM', 'image/bmp'),
+]
+
+
+def sniff_mime(data):
+    for signature, mime in SIGNATURES:
+        if data.startswith(signature):
+            return mime
+    if data[:4] == b'RIFF' and data[8:12] == b'WEBP':
+        return 'image/webp'
+    head = data.lstrip()[:5]
+    if head == b'<?xml' or head.startswith(b'<svg'):
+        return 'image/svg+xml'
+    return None
+
+
+def downscale(data, mime, max_size):
+    """
+    Shrink raster images larger than max_size pixels on either side (Pillow only)
+    """
+    if Image is None or not max_size or mime == 'image/svg+xml':
+        return data
+    with Image.open(io.BytesIO(data)) as image:
+        if max(image.size) <= max_size:
+            return data
+        image_format = image.format
+        image.thumbnail((max_size, max_size))
+        output = io.BytesIO()
+        image.save(output, format=image_format)
+        return output.getvalue()
+
+
+def process_image(value, base_dir=None, max_size=None):
+    """
+    Return (data URI, None) for a valid picture or (None, error message).
+    Empty values give ('', None). Relative file paths are resolved against
+    base_dir, and files are only read when base_dir is given.
+    """
+    value = (value or '').strip()
+    if not value:
+        return '', None
+
+    if value.startswith('data:'):
+        header, _, encoded = value.partition(',')
+        if not header.startswith('data:image/') or not header.endswith(';base64') or not encoded:
+            return None, "Picture must be a base64 data URI starting with 'data:image/'"
+        try:
+            data = base64.b64decode(''.join(encoded.split()), validate=True)
+        except (binascii.Error, ValueError):
+            return None, "Invalid base64 image data"
+        mime = header[len('data:'):-len(';base64')]
+    elif base_dir is not None:
+        path = os.path.join(base_dir, value)
+        try:
+            with open(path, 'rb') as image_file:
+                data = image_file.read()
+        except OSError as e:
+            return None, f"Cannot read picture {value}: {e.strerror}"
+        mime = sniff_mime(data)
+        if mime is None:
+            return None, f"Unrecognized image format: {value}"
+    else:
+        return None, "Picture must be a base64 data URI starting with 'data:image/'"
+
+    try:
+        data = downscale(data, mime, max_size)
+    except Exception as e:
+        return None, f"Invalid image: {e}"
+    return f"data:{mime};base64,{base64.b64encode(data).decode('ascii')}", None
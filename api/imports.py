@@ -0,0 +1,196 @@
+"""
+Streaming product catalog import from CSV or NDJSON.
+
+Rows are read one at a time and handled in chunks: the chunk's pictures are
+normalized in a process pool (api/images.py), or in the calling process when
+there is a single worker, as for uploads to the web endpoint, which must not
+start processes per request. The other fields are validated
+with the bulk endpoint's item serializer (ProductCreateUpdateSerializer
+rules), and valid rows are upserted with apply_product_bulk() in one
+transaction per chunk. Rows with an id update that product, or create it with
+that id; rows without one create a new product. Invalid rows are handed to a
+reject callback with their errors and never stop the import.
+"""
+import csv
+import json
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from functools import partial
+from itertools import repeat
+
+from django.conf import settings
+from django.db import DatabaseError
+from rest_framework.exceptions import ValidationError
+
+from .bulk import apply_product_bulk, existing_product_ids
+from .images import process_image
+from .serializers import ProductBulkItemSerializer
+
+logger = logging.getLogger(__name__)
+
+FORMATS = ('csv', 'ndjson')
+
+# Rejected rows listed in an upload response; the counts cover all of them
+MAX_REPORTED_REJECTS = 100
+
+
+def detect_format(filename):
+    extension = os.path.splitext(filename)[1].lower()
+    if extension == '.csv':
+        return 'csv'
+    if extension in ('.ndjson', '.jsonl'):
+        return 'ndjson'
+    return None
+
+
+def read_rows(text_file, file_format):
+    """
+    Yield (line number, row dict or raw line, error) without loading the whole file
+    """
+    if file_format == 'csv':
+        reader = csv.DictReader(text_file)
+        for row in reader:
+            # Blank cells mean "not given", so updates keep the stored value
+            yield reader.line_num, {key: value for key, value in row.items() if key and value != ''}, None
+        return
+
+    for number, line in enumerate(text_file, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as e:
+            yield number, line.rstrip('\n'), f"Invalid JSON: {e}"
+            continue
+        if not isinstance(row, dict):
+            yield number, line.rstrip('\n'), "Each line must be a JSON object"
+            continue
+        yield number, row, None
+
+
+@dataclass
+class ImportStats:
+    rows: int = 0
+    created: int = 0
+    updated: int = 0
+    rejected: int = 0
+    started: float = field(default_factory=time.perf_counter)
+
+    @property
+    def seconds(self):
+        return time.perf_counter() - self.started
+
+    @property
+    def rows_per_second(self):
+        return self.rows / self.seconds if self.seconds else 0.0
+
+    def as_dict(self):
+        return {
+            'rows': self.rows,
+            'created': self.created,
+            'updated': self.updated,
+            'rejected': self.rejected,
+            'seconds': round(self.seconds, 2),
+            'rows_per_second': round(self.rows_per_second, 1),
+        }
+
+
+class ProductImporter:
+    """
+    Import rows from read_rows(). reject(number, row, errors) is called for every bad row
+    and progress(stats) after every chunk. Set base_dir to allow picture file paths
+    relative to it; without it only data URIs are accepted. With workers=1 pictures are
+    processed in this process and no pool is started.
+    """
+
+    def __init__(self, reject, progress=None, workers=None, chunk_size=None, base_dir=None):
+        self.reject = reject
+        self.progress = progress
+        self.workers = workers or getattr(settings, 'PRODUCT_IMPORT_WORKERS', None) or os.cpu_count() or 1
+        self.chunk_size = chunk_size or getattr(settings, 'PRODUCT_IMPORT_CHUNK_SIZE', 500)
+        self.base_dir = base_dir
+        self.max_image_size = getattr(settings, 'PRODUCT_IMPORT_MAX_IMAGE_SIZE', None)
+        self.stats = ImportStats()
+
+    def run(self, rows):
+        if self.workers == 1:
+            self._import_rows(rows, map)
+            return self.stats
+        # spawn: forking a threaded server process is unsafe, and the image
+        # worker doesn't need Django
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=self.workers, mp_context=context) as pool:
+            self._import_rows(rows, partial(pool.map, chunksize=max(1, self.chunk_size // (self.workers * 4))))
+        return self.stats
+
+    def _import_rows(self, rows, map_pictures):
+        chunk, chunk_ids = [], set()
+        for number, row, error in rows:
+            self.stats.rows += 1
+            if error:
+                self._reject(number, row, {'non_field_errors': [error]})
+                continue
+            row_id = row.get('id')
+            if row_id is not None and row_id in chunk_ids:
+                # A chunk is one bulk write, so repeated ids go to the next one
+                self._import_chunk(map_pictures, chunk)
+                chunk, chunk_ids = [], set()
+            chunk.append((number, row))
+            if row_id is not None:
+                chunk_ids.add(row_id)
+            if len(chunk) >= self.chunk_size:
+                self._import_chunk(map_pictures, chunk)
+                chunk, chunk_ids = [], set()
+        if chunk:
+            self._import_chunk(map_pictures, chunk)
+
+    def _reject(self, number, row, errors):
+        self.stats.rejected += 1
+        self.reject(number, row, errors)
+
+    def _import_chunk(self, map_pictures, chunk):
+        pictures = map_pictures(
+            process_image,
+            [row.get('picture') for _, row in chunk],
+            repeat(self.base_dir),
+            repeat(self.max_image_size),
+        )
+        existing_ids, deleted_ids = existing_product_ids([row for _, row in chunk])
+        serializer = ProductBulkItemSerializer(context={'existing_ids': existing_ids, 'deleted_ids': deleted_ids})
+
+        valid = []
+        for (number, row), (picture, picture_error) in zip(chunk, pictures):
+            data = {key: value for key, value in row.items() if key not in ('action', 'picture')}
+            try:
+                item, errors = serializer.run_validation(data), {}
+            except ValidationError as e:
+                item, errors = None, dict(e.detail)
+            if picture_error:
+                errors['picture'] = [picture_error]
+            if errors:
+                self._reject(number, row, errors)
+                continue
+            if 'picture' in row:
+                item['fields']['picture'] = picture
+            valid.append((number, row, item))
+
+        if valid:
+            try:
+                results = apply_product_bulk([item for _, _, item in valid])
+            except DatabaseError as e:
+                logger.exception("Product import chunk failed")
+                for number, row, _ in valid:
+                    self._reject(number, row, {'non_field_errors': [f"Database error: {e}"]})
+            else:
+                for result in results:
+                    if result['status'] == 'created':
+                        self.stats.created += 1
+                    else:
+                        self.stats.updated += 1
+
+        if self.progress:
+            self.progress(self.stats)
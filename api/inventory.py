@@ -0,0 +1,67 @@
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .cache import invalidate_catalog
+from .cart import order_lines
+from .categories import adjust_category_counts
+from .models import Product
+
+
+def reduce_product_stock(product, quantity=1):
+    """
+    Reduce product stock by the specified quantity
+    Returns True if successful, False if insufficient stock
+    """
+    with transaction.atomic():
+        # Single conditional UPDATE so concurrent payments can't oversell
+        updated = Product.objects.filter(pk=product.pk, stock__gte=quantity).update(
+            stock=F('stock') - quantity,
+            updated_at=timezone.now()
+        )
+        if not updated:
+            return False
+
+        # Read back inside the transaction, so only the update that emptied the stock sees 0
+        product.refresh_from_db(fields=['stock', 'updated_at', 'category'])
+        if quantity > 0 and product.stock == 0:
+            adjust_category_counts(product.category_id, in_stock=-1)
+        product._loaded_facet = product.facet
+
+    # update() doesn't send signals, so invalidate the catalog here
+    transaction.on_commit(invalidate_catalog)
+    return True
+
+
+def reduce_order_stock(order):
+    """
+    Reduce the stock of every product in a paid order, all or nothing
+    Returns the names of the products without enough stock (empty if successful)
+    """
+    quantities = {}
+    for product_id, quantity, _ in order_lines(order):
+        quantities[product_id] = quantities.get(product_id, 0) + quantity
+
+    now = timezone.now()
+    with transaction.atomic():
+        short = []
+        # Same lock order in every transaction, so concurrent carts can't deadlock
+        for product_id, quantity in sorted(quantities.items(), key=lambda item: str(item[0])):
+            updated = Product.objects.filter(pk=product_id, stock__gte=quantity).update(
+                stock=F('stock') - quantity,
+                updated_at=now
+            )
+            if not updated:
+                short.append(product_id)
+        if short:
+            transaction.set_rollback(True)
+        else:
+            # Only the update that emptied a product reads 0 here, as in reduce_product_stock()
+            emptied = Product.objects.filter(pk__in=quantities, stock=0).values_list('category_id', flat=True)
+            for category_id in emptied:
+                adjust_category_counts(category_id, in_stock=-1)
+
+    if short:
+        return list(Product.all_objects.filter(pk__in=short).values_list('name', flat=True))
+    transaction.on_commit(invalidate_catalog)
+    return []
@@ -0,0 +1,138 @@
+"""
+Shipping label and packing slip batches.
+
+Rendering never runs in a web worker: POST /api/orders/labels/ only records a
+LabelBatch, and the process_label_batches worker claims pending batches with
+a compare-and-set UPDATE (so several workers can share the queue), renders
+the orders' pages across a process pool (api/pdf.py) and stores the merged
+PDF on the batch for download. Batches stuck in processing longer than
+LABEL_STALE_SECONDS, e.g. after a worker crash, are claimed again; a worker
+whose batch was reclaimed that way discards its result instead of
+overwriting the new claim.
+"""
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import LabelBatch, Order, OrderItem
+from .pdf import build_document, render_order_pages
+
+logger = logging.getLogger(__name__)
+
+LABEL_FIELDS = (
+    'id', 'created_at', 'client_name', 'client_email', 'client_phone', 'client_address',
+    'total_pesos', 'currency', 'product_name',
+)
+LOAD_BATCH_SIZE = 500
+
+
+def label_pool(workers=None):
+    """
+    Return (executor, worker count) for rendering; spawn, since the renderer doesn't need Django
+    """
+    workers = workers or getattr(settings, 'LABEL_WORKERS', None) or os.cpu_count() or 1
+    return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn')), workers
+
+
+def label_orders(order_ids):
+    """
+    Plain dicts for the render workers, in the given order; unknown ids are skipped
+    """
+    order_ids = [str(pk) for pk in order_ids]
+    rows = {}
+    for start in range(0, len(order_ids), LOAD_BATCH_SIZE):
+        chunk = order_ids[start:start + LOAD_BATCH_SIZE]
+        for values in Order.objects.filter(pk__in=chunk).values_list(*LABEL_FIELDS):
+            row = dict(zip(LABEL_FIELDS, values))
+            row['id'] = str(row['id'])
+            row['created_at'] = row['created_at'].isoformat()
+            row['total_pesos'] = str(row['total_pesos'])
+            row['items'] = []
+            rows[row['id']] = row
+        items = (
+            OrderItem.objects.filter(order_id__in=chunk).order_by('order_id', 'position')
+            .values_list('order_id', 'product_name', 'quantity', 'unit_price_pesos')
+        )
+        for order_id, name, quantity, unit_price in items:
+            rows[str(order_id)]['items'].append({
+                'name': name, 'quantity': quantity,
+                'unit_price': str(unit_price), 'total': str(unit_price * quantity),
+            })
+    for row in rows.values():
+        # Orders placed before carts hold one unit of their product
+        if not row['items']:
+            row['items'] = [{
+                'name': row['product_name'], 'quantity': 1,
+                'unit_price': row['total_pesos'], 'total': row['total_pesos'],
+            }]
+    return [rows[pk] for pk in order_ids if pk in rows]
+
+
+def render_labels(orders, pool, workers):
+    """
+    Render a label and a packing slip per order into one PDF; returns (document, page count)
+    """
+    pages = []
+    chunksize = max(1, len(orders) // (workers * 4))
+    for order_pages in pool.map(render_order_pages, orders, chunksize=chunksize):
+        pages.extend(order_pages)
+    return build_document(pages), len(pages)
+
+
+def claim_next_batch():
+    """
+    Take the oldest waiting batch for this worker, or return None when the queue is empty
+    """
+    now = timezone.now()
+    stale = now - timedelta(seconds=getattr(settings, 'LABEL_STALE_SECONDS', 600))
+    waiting = (
+        LabelBatch.objects
+        .filter(Q(status='pending') | Q(status='processing', started_at__lt=stale))
+        .order_by('created_at')
+        .values_list('pk', 'status', 'started_at')
+    )
+    for pk, status, started_at in waiting[:10]:
+        # Another worker may claim the same batch; only one UPDATE matches
+        claimed = LabelBatch.objects.filter(pk=pk, status=status, started_at=started_at).update(
+            status='processing', started_at=now
+        )
+        if claimed:
+            return LabelBatch.objects.defer('document').get(pk=pk)
+    return None
+
+
+def process_batch(batch, pool, workers):
+    """
+    Render a claimed batch and store the result; returns True on success.
+    The result is only stored while this worker still holds the claim: if the
+    batch went stale and another worker reclaimed it, this one's result is
+    discarded.
+    """
+    try:
+        document, page_count = render_labels(label_orders(batch.order_ids), pool, workers)
+    except Exception as e:
+        logger.exception("Label batch %s failed", batch.pk)
+        finish_batch(batch, status='failed', error=str(e))
+        return False
+    if not finish_batch(batch, status='done', document=document, page_count=page_count, error=''):
+        return False
+    logger.info("Label batch %s: %d pages", batch.pk, page_count)
+    return True
+
+
+def finish_batch(batch, **fields):
+    """
+    Store a batch's outcome if its claim is still ours; returns whether it was
+    """
+    finished = LabelBatch.objects.filter(
+        pk=batch.pk, status='processing', started_at=batch.started_at
+    ).update(finished_at=timezone.now(), **fields)
+    if not finished:
+        logger.warning("Label batch %s was reclaimed by another worker; discarding this result", batch.pk)
+    return bool(finished)
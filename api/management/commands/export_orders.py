@@ -0,0 +1,35 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from api.exports import EXPORT_FORMATS, ExportFilterError, export_orders, export_queryset
+
+
+class Command(BaseCommand):
+    help = 'Stream orders (joined to the product name) to a CSV or NDJSON file in constant memory'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--format', choices=sorted(EXPORT_FORMATS), default='csv')
+        parser.add_argument('--from', dest='date_from', help='ISO date or datetime, inclusive')
+        parser.add_argument('--to', dest='date_to', help='ISO date or datetime, inclusive')
+        parser.add_argument('--status', action='append', help='Repeat to export several statuses')
+        parser.add_argument('--output', '-o', default='-', help='Output file (default: stdout)')
+
+    def handle(self, *args, **options):
+        try:
+            queryset = export_queryset(options['date_from'], options['date_to'], options['status'])
+        except ExportFilterError as e:
+            raise CommandError(str(e))
+
+        output = sys.stdout.buffer if options['output'] == '-' else open(options['output'], 'wb')
+        written = 0
+        try:
+            for block in export_orders(queryset, options['format']):
+                output.write(block)
+                written += len(block)
+        finally:
+            if output is not sys.stdout.buffer:
+                output.close()
+
+        if options['output'] != '-':
+            self.stdout.write(self.style.SUCCESS(f'Wrote {written} bytes to {options["output"]}'))
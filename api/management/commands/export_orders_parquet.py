@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from api.exports import EXPORT_PAGE_SIZE
+from api.parquet_export import export_orders_parquet, pa
+
+
+class Command(BaseCommand):
+    help = 'Export orders changed since the last run to month-partitioned Parquet files (needs pyarrow)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('directory', help='Dataset directory; holds the month=YYYY-MM partitions and the watermark')
+        parser.add_argument('--full', action='store_true', help='Ignore the watermark and export every order')
+        parser.add_argument('--batch-size', type=int, default=EXPORT_PAGE_SIZE, help='Orders per record batch')
+
+    def handle(self, *args, **options):
+        if pa is None:
+            raise CommandError('pyarrow is not installed: pip install pyarrow')
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be at least 1')
+
+        rows, months = export_orders_parquet(options['directory'], options['full'], options['batch_size'])
+        if not rows:
+            self.stdout.write('No new or updated orders since the last export')
+            return
+        self.stdout.write(self.style.SUCCESS(
+            f'Wrote {rows} orders to {len(months)} partition(s): {", ".join(months)}'
+        ))
@@ -0,0 +1,85 @@
+import csv
+import json
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+
+from api.imports import FORMATS, ProductImporter, detect_format, read_rows
+
+
+class Command(BaseCommand):
+    help = (
+        'Stream a CSV or NDJSON product catalog into the database. Rows with an id update '
+        'that product, the rest are created. Bad rows are written to a reject file.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='CSV or NDJSON file (.csv, .ndjson or .jsonl)')
+        parser.add_argument('--format', choices=FORMATS, help='Defaults to the file extension')
+        parser.add_argument('--rejects', help='Reject file path (default: <path>.rejects.<ext>)')
+        parser.add_argument(
+            '--workers', type=int,
+            help='Image processing processes (default: PRODUCT_IMPORT_WORKERS or the CPU count; 1 runs in-process)'
+        )
+        parser.add_argument('--chunk-size', type=int, help='Rows per transaction')
+        parser.add_argument(
+            '--images-dir',
+            help='Directory for picture file paths (default: the directory of the import file)'
+        )
+
+    def handle(self, *args, **options):
+        path = options['path']
+        file_format = options['format'] or detect_format(path)
+        if file_format is None:
+            raise CommandError('Cannot tell the file format from its extension, pass --format')
+        if not os.path.exists(path):
+            raise CommandError(f'File not found: {path}')
+
+        extension = 'csv' if file_format == 'csv' else 'ndjson'
+        rejects_path = options['rejects'] or f'{path}.rejects.{extension}'
+        base_dir = options['images_dir'] or os.path.dirname(os.path.abspath(path))
+
+        with open(path, encoding='utf-8-sig', newline='') as source, \
+                open(rejects_path, 'w', encoding='utf-8', newline='') as rejects_file:
+            if file_format == 'csv':
+                header = next(csv.reader(source), [])
+                source.seek(0)
+                reject = self.csv_rejecter(rejects_file, header)
+            else:
+                reject = self.ndjson_rejecter(rejects_file)
+            importer = ProductImporter(
+                reject=reject,
+                progress=self.report,
+                workers=options['workers'],
+                chunk_size=options['chunk_size'],
+                base_dir=base_dir,
+            )
+            stats = importer.run(read_rows(source, file_format))
+
+        if not stats.rejected:
+            os.remove(rejects_path)
+        self.stdout.write(self.style.SUCCESS(
+            f'Imported {stats.rows} rows in {stats.seconds:.1f}s ({stats.rows_per_second:.0f} rows/s): '
+            f'{stats.created} created, {stats.updated} updated, {stats.rejected} rejected'
+        ))
+        if stats.rejected:
+            self.stdout.write(self.style.WARNING(f'Rejected rows written to {rejects_path}'))
+
+    def report(self, stats):
+        self.stdout.write(f'{stats.rows} rows, {stats.rows_per_second:.0f} rows/s, {stats.rejected} rejected')
+
+    def csv_rejecter(self, rejects_file, header):
+        """
+        Rejected rows keep the input columns, so the file can be fixed and imported again
+        """
+        writer = csv.DictWriter(rejects_file, fieldnames=header + ['line', 'errors'], extrasaction='ignore')
+        writer.writeheader()
+
+        def reject(number, row, errors):
+            writer.writerow({**row, 'line': number, 'errors': json.dumps(errors, ensure_ascii=False)})
+        return reject
+
+    def ndjson_rejecter(self, rejects_file):
+        def reject(number, row, errors):
+            rejects_file.write(json.dumps({'line': number, 'errors': errors, 'row': row}, ensure_ascii=False) + '\n')
+        return reject
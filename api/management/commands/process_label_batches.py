@@ -0,0 +1,33 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from api.labels import claim_next_batch, label_pool, process_batch
+
+
+class Command(BaseCommand):
+    help = 'Render queued shipping label batches into PDFs across a process pool'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='Exit when the queue is empty instead of polling')
+        parser.add_argument('--workers', type=int, help='Render processes (default: LABEL_WORKERS or the CPU count)')
+
+    def handle(self, *args, **options):
+        pool, workers = label_pool(options['workers'])
+        with pool:
+            while True:
+                batch = claim_next_batch()
+                if batch is None:
+                    if options['once']:
+                        break
+                    time.sleep(getattr(settings, 'LABEL_POLL_INTERVAL', 5))
+                    continue
+
+                started = time.perf_counter()
+                if process_batch(batch, pool, workers):
+                    self.stdout.write(self.style.SUCCESS(
+                        f'Rendered batch {batch.pk}: {len(batch.order_ids)} orders in {time.perf_counter() - started:.1f}s'
+                    ))
+                else:
+                    self.stdout.write(self.style.ERROR(f'Batch {batch.pk} failed or was reclaimed, see the log'))
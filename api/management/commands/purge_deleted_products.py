@@ -0,0 +1,52 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+
+from api.models import Order, OrderItem, Product
+
+
+class Command(BaseCommand):
+    help = (
+        'Hard-delete products soft-deleted more than --days ago, in bounded batches. '
+        'Products that still have orders or cart order lines are kept, since orders protect them.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=30, help='Only purge products deleted at least this many days ago')
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument('--sleep', type=float, default=0.1, help='Seconds to pause between batches')
+        parser.add_argument('--dry-run', action='store_true')
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=options['days'])
+        candidates = (
+            Product.all_objects
+            .filter(deleted_at__lte=cutoff)
+            .exclude(Exists(Order.objects.filter(product=OuterRef('pk'))))
+            # Later lines of cart orders reference products the order itself doesn't
+            .exclude(Exists(OrderItem.objects.filter(product=OuterRef('pk'))))
+            .order_by('deleted_at', 'id')
+        )
+
+        if options['dry_run']:
+            self.stdout.write(f'{candidates.count()} products would be purged')
+            return
+
+        purged = 0
+        while True:
+            # Short transactions keep the write lock brief; a new order for a
+            # product between batches just makes it drop out of the candidates
+            with transaction.atomic():
+                batch = list(candidates.values_list('pk', flat=True)[:options['batch_size']])
+                if not batch:
+                    break
+                Product.all_objects.filter(pk__in=batch).delete()
+            purged += len(batch)
+            self.stdout.write(f'Purged {purged} products...')
+            time.sleep(options['sleep'])
+
+        self.stdout.write(self.style.SUCCESS(f'Purged {purged} soft-deleted products'))
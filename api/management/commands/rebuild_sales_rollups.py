@@ -0,0 +1,21 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from api.reports import REBUILD_BATCH_SIZE, rebuild_rollups
+
+
+class Command(BaseCommand):
+    help = 'Recompute the hourly and daily sales rollups from the orders table in one transaction'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=REBUILD_BATCH_SIZE, help='Rollup rows per insert')
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be at least 1')
+
+        started = time.perf_counter()
+        written = rebuild_rollups(options['batch_size'])
+        rows = ', '.join(f'{count} {granularity}ly rows' for granularity, count in written.items())
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt sales rollups: {rows} in {time.perf_counter() - started:.1f}s'))
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from api.search import install_search_index
+
+
+class Command(BaseCommand):
+    help = 'Recreate the product full-text search index (FTS5 table and triggers, or the PostgreSQL GIN index)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args, **options):
+        connection = connections[options['database']]
+        install_search_index(connection)
+        self.stdout.write(self.style.SUCCESS(f'Search index rebuilt ({connection.vendor})'))
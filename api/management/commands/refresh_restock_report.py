@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from api.forecast import refresh_restock_report
+
+
+class Command(BaseCommand):
+    help = 'Recompute the cached restock forecast served by GET /api/reports/restock/'
+
+    def handle(self, *args, **options):
+        report = refresh_restock_report()
+        restock = sum(1 for product in report['products'] if product['needs_restock'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Forecast {len(report["products"])} products in {report["seconds"]}s, {restock} need restocking'
+        ))
@@ -0,0 +1,41 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from api.labels import label_orders, label_pool, render_labels
+from api.models import Order
+
+
+class Command(BaseCommand):
+    help = 'Render shipping labels and packing slips for the given orders into one PDF file'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--order', action='append', default=[], help='Order id; repeat for several orders')
+        parser.add_argument('--status', help='Every order in this status, e.g. sent')
+        parser.add_argument('--output', '-o', required=True, help='PDF file to write')
+        parser.add_argument('--workers', type=int, help='Render processes (default: LABEL_WORKERS or the CPU count)')
+
+    def handle(self, *args, **options):
+        order_ids = list(options['order'])
+        if options['status']:
+            order_ids += [
+                str(pk) for pk in
+                Order.objects.filter(status=options['status']).order_by('created_at').values_list('pk', flat=True)
+            ]
+        if not order_ids:
+            raise CommandError('Give --order ids or a --status with orders in it')
+
+        started = time.perf_counter()
+        try:
+            orders = label_orders(order_ids)
+        except Exception as e:
+            raise CommandError(f'Invalid order id: {e}')
+        pool, workers = label_pool(options['workers'])
+        with pool:
+            document, page_count = render_labels(orders, pool, workers)
+        with open(options['output'], 'wb') as output:
+            output.write(document)
+        self.stdout.write(self.style.SUCCESS(
+            f'Wrote {page_count} pages for {len(orders)} orders to {options["output"]} '
+            f'in {time.perf_counter() - started:.1f}s'
+        ))
@@ -0,0 +1,27 @@
+from django.db import migrations
+from django.db.utils import OperationalError
+
+from api.search import install_search_index, uninstall_search_index
+
+
+def create_search_index(apps, schema_editor):
+    try:
+        install_search_index(schema_editor.connection)
+    except OperationalError as e:
+        # SQLite built without FTS5: search falls back to substring matching
+        print(f"Skipping full-text search index: {e}")
+
+
+def drop_search_index(apps, schema_editor):
+    uninstall_search_index(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0005_product_updated_at_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,51 @@
+from django.db import migrations, transaction
+from django.db.models import Count, Q
+from django.utils import timezone
+
+BATCH_SIZE = 1000
+
+
+def populate_categories(apps, schema_editor):
+    """
+    Create a category per distinct product type and link products in batches
+    """
+    Category = apps.get_model('api', 'Category')
+    Product = apps.get_model('api', 'Product')
+
+    types = Product.objects.order_by().values_list('type', flat=True).distinct()
+    for name in list(types):
+        category, _ = Category.objects.get_or_create(name=name)
+        while True:
+            # Each batch is its own short transaction to keep write locks brief
+            with transaction.atomic():
+                batch = list(
+                    Product.objects.filter(type=name, category__isnull=True)
+                    .values_list('pk', flat=True)[:BATCH_SIZE]
+                )
+                if not batch:
+                    break
+                Product.objects.filter(pk__in=batch).update(category=category)
+
+    counts = (
+        Product.objects.order_by()
+        .values('category')
+        .annotate(total=Count('pk'), in_stock=Count('pk', filter=Q(stock__gt=0)))
+    )
+    for row in counts:
+        Category.objects.filter(pk=row['category']).update(
+            product_count=row['total'],
+            in_stock_count=row['in_stock'],
+            updated_at=timezone.now()
+        )
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('api', '0008_category'),
+    ]
+
+    operations = [
+        migrations.RunPython(populate_categories, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,46 @@
+from django.db import migrations
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncDay, TruncHour
+from django.utils import timezone
+
+BATCH_SIZE = 1000
+
+
+def populate_sales_rollups(apps, schema_editor):
+    """
+    Aggregate existing orders into the hourly and daily rollups, one unit per order
+    """
+    Order = apps.get_model('api', 'Order')
+    tzinfo = timezone.get_current_timezone()
+
+    for model_name, trunc in (('HourlySalesRollup', TruncHour), ('DailySalesRollup', TruncDay)):
+        model = apps.get_model('api', model_name)
+        groups = (
+            Order.objects.order_by()
+            .annotate(bucket=trunc('created_at', tzinfo=tzinfo))
+            .values('bucket', 'status', 'product_id', 'currency')
+            .annotate(orders=Count('pk'), revenue=Sum('total_pesos'))
+        )
+        batch = []
+        for group in groups.iterator(chunk_size=BATCH_SIZE):
+            batch.append(model(**group, units=group['orders']))
+            if len(batch) >= BATCH_SIZE:
+                model.objects.bulk_create(batch)
+                batch = []
+        model.objects.bulk_create(batch)
+
+
+def clear_sales_rollups(apps, schema_editor):
+    apps.get_model('api', 'HourlySalesRollup').objects.all().delete()
+    apps.get_model('api', 'DailySalesRollup').objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0014_sales_rollups'),
+    ]
+
+    operations = [
+        migrations.RunPython(populate_sales_rollups, clear_sales_rollups),
+    ]
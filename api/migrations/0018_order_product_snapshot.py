@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0017_label_batch'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='order',
+            name='product_name',
+            field=models.CharField(default='', max_length=255),
+        ),
+        migrations.AddField(
+            model_name='order',
+            name='product_picture_hash',
+            field=models.CharField(blank=True, default='', max_length=32),
+        ),
+        migrations.AddField(
+            model_name='order',
+            name='unit_price_pesos',
+            field=models.DecimalField(decimal_places=2, default=0.0, max_digits=10),
+        ),
+    ]
@@ -0,0 +1,46 @@
+from hashlib import md5
+
+from django.db import migrations, transaction
+from django.db.models import F
+
+BATCH_SIZE = 1000
+
+
+def populate_order_product_snapshot(apps, schema_editor):
+    """
+    Copy each product's name and picture hash onto its orders in batches. Orders
+    hold one unit, so the unit price is the total that was actually charged.
+    """
+    Order = apps.get_model('api', 'Order')
+    Product = apps.get_model('api', 'Product')
+
+    product_ids = Order.objects.filter(product_name='').order_by().values_list('product_id', flat=True).distinct()
+    for product_id in list(product_ids):
+        name, picture = Product.objects.values_list('name', 'picture').get(pk=product_id)
+        picture_hash = md5(picture.encode(), usedforsecurity=False).hexdigest() if picture else ''
+        while True:
+            # Each batch is its own short transaction to keep write locks brief
+            with transaction.atomic():
+                batch = list(
+                    Order.objects.filter(product_id=product_id, product_name='')
+                    .values_list('pk', flat=True)[:BATCH_SIZE]
+                )
+                if not batch:
+                    break
+                Order.objects.filter(pk__in=batch).update(
+                    product_name=name or '-',
+                    unit_price_pesos=F('total_pesos'),
+                    product_picture_hash=picture_hash
+                )
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('api', '0018_order_product_snapshot'),
+    ]
+
+    operations = [
+        migrations.RunPython(populate_order_product_snapshot, migrations.RunPython.noop),
+    ]
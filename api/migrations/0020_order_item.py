@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:33
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0019_populate_order_product_snapshot'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OrderItem',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('position', models.PositiveSmallIntegerField(default=0)),
+                ('quantity', models.PositiveIntegerField(default=1)),
+                ('product_name', models.CharField(default='', max_length=255)),
+                ('unit_price_pesos', models.DecimalField(decimal_places=2, default=0.0, max_digits=10)),
+                ('product_picture_hash', models.CharField(blank=True, default='', max_length=32)),
+                ('order', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='items', to='api.order')),
+                ('product', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='order_items', to='api.product')),
+            ],
+            options={
+                'ordering': ['order', 'position'],
+                'constraints': [models.UniqueConstraint(fields=('order', 'position'), name='order_item_position_key')],
+            },
+        ),
+    ]
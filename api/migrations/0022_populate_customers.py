@@ -0,0 +1,66 @@
+from django.db import migrations, transaction
+from django.db.models import Q
+
+BATCH_SIZE = 1000
+
+
+def normalize_email(email):
+    return (email or '').strip().lower()
+
+
+def populate_customers(apps, schema_editor):
+    """
+    Create a customer per normalized client email and link orders in batches,
+    newest orders first so customers get their latest details
+    """
+    Customer = apps.get_model('api', 'Customer')
+    Order = apps.get_model('api', 'Order')
+
+    pending = Order.objects.filter(customer__isnull=True).exclude(client_email='').order_by('-created_at', '-id')
+    position = None
+    while True:
+        # Each batch is its own short transaction to keep write locks brief
+        with transaction.atomic():
+            batch = pending
+            if position:
+                created_at, pk = position
+                batch = batch.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk))
+            orders = list(
+                batch.only('id', 'created_at', 'client_name', 'client_email', 'client_phone', 'client_address')
+                [:BATCH_SIZE]
+            )
+            if not orders:
+                break
+            position = (orders[-1].created_at, orders[-1].pk)
+
+            emails = {normalize_email(order.client_email) for order in orders}
+            customers = dict(Customer.objects.filter(email__in=emails).values_list('email', 'pk'))
+            new = {}
+            for order in orders:
+                email = normalize_email(order.client_email)
+                if email and email not in customers and email not in new:
+                    new[email] = Customer(
+                        email=email, name=order.client_name, phone=order.client_phone, address=order.client_address
+                    )
+            Customer.objects.bulk_create(new.values())
+            customers.update((email, customer.pk) for email, customer in new.items())
+
+            linked = {}
+            for order in orders:
+                email = normalize_email(order.client_email)
+                if email:
+                    linked.setdefault(customers[email], []).append(order.pk)
+            for customer_id, order_ids in linked.items():
+                Order.objects.filter(pk__in=order_ids).update(customer_id=customer_id)
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('api', '0021_customer'),
+    ]
+
+    operations = [
+        migrations.RunPython(populate_customers, migrations.RunPython.noop),
+    ]
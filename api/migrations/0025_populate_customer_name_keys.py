@@ -0,0 +1,47 @@
+from django.db import migrations, transaction
+
+BATCH_SIZE = 1000
+
+
+def normalize_name(name):
+    return (name or '').strip().lower()
+
+
+def populate_name_keys(apps, schema_editor):
+    """
+    Fill name_key for existing customers in keyset batches. The lowercasing is
+    done in Python, as Customer.save() does; SQLite's LOWER() is ASCII-only.
+    """
+    Customer = apps.get_model('api', 'Customer')
+
+    position = None
+    while True:
+        # Each batch is its own short transaction to keep write locks brief
+        with transaction.atomic():
+            batch = Customer.objects.order_by('pk')
+            if position:
+                batch = batch.filter(pk__gt=position)
+            customers = list(batch.only('id', 'name', 'name_key')[:BATCH_SIZE])
+            if not customers:
+                break
+            position = customers[-1].pk
+
+            changed = []
+            for customer in customers:
+                name_key = normalize_name(customer.name)
+                if customer.name_key != name_key:
+                    customer.name_key = name_key
+                    changed.append(customer)
+            Customer.objects.bulk_update(changed, ['name_key'])
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('api', '0024_customer_name_key'),
+    ]
+
+    operations = [
+        migrations.RunPython(populate_name_keys, migrations.RunPython.noop),
+    ]
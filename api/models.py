@@ -1,5 +1,36 @@
 import uuid
-from django.db import models
+from hashlib import md5
+from django.db import models, transaction
+from django.utils import timezone
+
+
+class Category(models.Model):
+    """
+    Normalized product type with precomputed facet counts
+    """
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    name = models.CharField(max_length=100, unique=True)
+    # Maintained incrementally on product save/delete and stock changes
+    product_count = models.PositiveIntegerField(default=0)
+    in_stock_count = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return self.name
+
+    class Meta:
+        ordering = ['name']
+        verbose_name_plural = 'categories'
+
+
+class ProductManager(models.Manager):
+    """
+    Hides soft-deleted products
+    """
+
+    def get_queryset(self):
+        return super().get_queryset().filter(deleted_at__isnull=True)
 
 
 class Product(models.Model):
@@ -9,16 +40,151 @@ class Product(models.Model):
     description = models.TextField()
     stock = models.PositiveIntegerField()
     type = models.CharField(max_length=100)
+    # Set from type on save, see api/categories.py
+    category = models.ForeignKey(
+        Category, on_delete=models.PROTECT, related_name='products',
+        null=True, blank=True, editable=False
+    )
     price_pesos = models.DecimalField(max_digits=10, decimal_places=2, default=0.00)
     currency = models.CharField(max_length=10, default='MXN')
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # Set by soft_delete(); purge_deleted_products removes the row later
+    deleted_at = models.DateTimeField(null=True, blank=True, editable=False)
+
+    objects = ProductManager()
+    all_objects = models.Manager()
 
     def __str__(self):
         return self.name
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored type and facet state so category counts can be adjusted on save
+        if {'type', 'category_id', 'stock', 'deleted_at'} <= instance.__dict__.keys():
+            instance._loaded_type = instance.type
+            instance._loaded_facet = instance.facet
+        return instance
+
+    @property
+    def facet(self):
+        """
+        (category_id, in_stock) pair counted in the category facets, None once deleted
+        """
+        if self.deleted_at is not None:
+            return None
+        return (self.category_id, self.stock > 0)
+
+    def soft_delete(self):
+        """
+        Hide the product and leave a tombstone; its orders keep pointing at it
+        """
+        with transaction.atomic():
+            self.deleted_at = timezone.now()
+            self.save(update_fields=['deleted_at', 'updated_at'])
+            ProductTombstone.objects.create(product_id=self.pk, deleted_at=self.deleted_at)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            # Cheap MAX(updated_at) for list ETags
+            models.Index(fields=['updated_at'], name='product_updated_at_idx'),
+            # Keyset order of the changes feed, see api/changes.py
+            models.Index(fields=['updated_at', 'id'], name='product_updated_at_id_idx'),
+            # Product list filters and ordering
+            models.Index(fields=['-created_at'], name='product_created_at_idx'),
+            models.Index(fields=['name'], name='product_name_idx'),
+            models.Index(fields=['price_pesos'], name='product_price_idx'),
+            models.Index(fields=['type', 'price_pesos'], name='product_type_price_idx'),
+            models.Index(
+                fields=['price_pesos'],
+                condition=models.Q(stock__gt=0),
+                name='product_in_stock_price_idx'
+            ),
+            # Purge scans for soft-deleted products
+            models.Index(
+                fields=['deleted_at'],
+                condition=models.Q(deleted_at__isnull=False),
+                name='product_deleted_at_idx'
+            ),
+        ]
+
+
+class ProductTombstone(models.Model):
+    """
+    Record of a deleted product, so delta sync clients can drop their copy
+    """
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    product_id = models.UUIDField()
+    deleted_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f"Deleted product {self.product_id}"
+
+    class Meta:
+        ordering = ['deleted_at', 'id']
+        indexes = [
+            models.Index(fields=['deleted_at', 'id'], name='tombstone_deleted_at_id_idx'),
+        ]
+
+
+def normalize_email(email):
+    """
+    Key customers are matched on: addresses differing only in case or spacing are one customer
+    """
+    return (email or '').strip().lower()
+
+
+def normalize_name(name):
+    """
+    Key customer name searches are matched on, so they ignore case on every database
+    """
+    return (name or '').strip().lower()
+
+
+class Customer(models.Model):
+    """
+    A buyer, keyed by normalized email. Name, phone and address are the latest
+    ones given at checkout; each order keeps its own copy as well.
+    """
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    email = models.EmailField(unique=True)
+    name = models.CharField(max_length=255, default='')
+    # normalize_name(name), kept in step by save()
+    name_key = models.CharField(max_length=255, default='', editable=False)
+    phone = models.CharField(max_length=20, default='', blank=True)
+    address = models.TextField(default='', blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.name} <{self.email}>" if self.name else self.email
+
+    def save(self, *args, **kwargs):
+        self.name_key = normalize_name(self.name)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'name' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'name_key'}
+        super().save(*args, **kwargs)
+
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Name prefix searches, see api/customers.py. They are prefix LIKEs,
+            # which a plain btree only serves in the C collation, so PostgreSQL
+            # gets the pattern operator class (ignored elsewhere)
+            models.Index(fields=['name_key'], name='customer_name_key_idx', opclasses=['varchar_pattern_ops']),
+        ]
+
+
+def picture_hash(picture):
+    """
+    Short fingerprint of a base64 picture, for client caches; '' without a picture
+    """
+    if not picture:
+        return ''
+    return md5(picture.encode(), usedforsecurity=False).hexdigest()
 
 
 class Order(models.Model):
@@ -33,7 +199,17 @@ class Order(models.Model):
     ]
 
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
-    product = models.ForeignKey(Product, on_delete=models.CASCADE)
+    # PROTECT: products are soft-deleted and only purged once they have no orders
+    product = models.ForeignKey(Product, on_delete=models.PROTECT)
+    # The product as it was when the order was placed, see capture_product()
+    product_name = models.CharField(max_length=255, default='')
+    unit_price_pesos = models.DecimalField(max_digits=10, decimal_places=2, default=0.00)
+    product_picture_hash = models.CharField(max_length=32, blank=True, default='')
+    # Set from client_email on save, see api/customers.py; indexed with created_at below
+    customer = models.ForeignKey(
+        Customer, on_delete=models.PROTECT, related_name='orders',
+        null=True, blank=True, db_index=False
+    )
     # Client information
     client_name = models.CharField(max_length=255, default='')
     client_email = models.EmailField(default='')
@@ -50,5 +226,179 @@ class Order(models.Model):
     def __str__(self):
         return f"Order {self.id} - {self.client_name}"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored status so status changes can be detected on save
+        instance._loaded_status = instance.__dict__.get('status')
+        return instance
+
+    def capture_product(self, product):
+        """
+        Snapshot what lists show of the product, so later product edits don't change
+        the order and lists can be rendered without reading the products table.
+        The order's currency is the product's, see OrderCreateSerializer.
+        """
+        self.product = product
+        self.product_name = product.name
+        self.unit_price_pesos = product.price_pesos
+        self.product_picture_hash = picture_hash(product.picture)
+
+    def save(self, *args, **kwargs):
+        # Status change receivers (history, sales rollups) commit or roll back with the order
+        with transaction.atomic(using=kwargs.get('using')):
+            super().save(*args, **kwargs)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            # Keyset order of the order exports, see api/exports.py
+            models.Index(fields=['created_at', 'id'], name='order_created_at_id_idx'),
+            # Incremental analytics exports, see api/parquet_export.py
+            models.Index(fields=['updated_at', 'id'], name='order_updated_at_id_idx'),
+            # A customer's orders, newest first, paged by created_at
+            models.Index(fields=['customer', 'created_at'], name='order_customer_created_idx'),
+            # Support searches by the phone given on the order, see api/customers.py
+            models.Index(fields=['client_phone'], name='order_client_phone_idx'),
+        ]
+
+
+class OrderItem(models.Model):
+    """
+    One line of a cart order: a product, its quantity and its snapshot at purchase time.
+    Orders placed before carts have no items; their product is Order.product, see api/cart.py
+    """
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    order = models.ForeignKey(Order, on_delete=models.CASCADE, related_name='items')
+    # Line number; the first line is also the order's product
+    position = models.PositiveSmallIntegerField(default=0)
+    product = models.ForeignKey(Product, on_delete=models.PROTECT, related_name='order_items')
+    quantity = models.PositiveIntegerField(default=1)
+    product_name = models.CharField(max_length=255, default='')
+    unit_price_pesos = models.DecimalField(max_digits=10, decimal_places=2, default=0.00)
+    product_picture_hash = models.CharField(max_length=32, blank=True, default='')
+
+    def __str__(self):
+        return f"{self.quantity} x {self.product_name}"
+
+    @property
+    def line_total(self):
+        return self.unit_price_pesos * self.quantity
+
+    class Meta:
+        ordering = ['order', 'position']
+        constraints = [
+            models.UniqueConstraint(fields=['order', 'position'], name='order_item_position_key'),
+        ]
+
+
+class OrderStatusEvent(models.Model):
+    """
+    Append-only history of order status changes, one row per transition
+    """
+    SOURCE_CHOICES = [
+        ('checkout', 'Checkout'),
+        ('api', 'API'),
+        ('admin', 'Admin'),
+        ('webhook', 'Stripe webhook'),
+        ('stripe_check', 'Stripe status check'),
+        ('success_page', 'Success page'),
+        ('cancel_page', 'Cancel page'),
+        ('system', 'System'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    order = models.ForeignKey(Order, on_delete=models.CASCADE, related_name='status_events')
+    # None when the event records the order's creation
+    old_status = models.CharField(max_length=20, choices=Order.STATUS_CHOICES, null=True, blank=True)
+    new_status = models.CharField(max_length=20, choices=Order.STATUS_CHOICES)
+    source = models.CharField(max_length=20, choices=SOURCE_CHOICES, default='system')
+    stripe_event_id = models.CharField(max_length=255, null=True, blank=True)
+    created_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f"Order {self.order_id}: {self.old_status} -> {self.new_status}"
+
+    class Meta:
+        ordering = ['created_at']
+        indexes = [
+            # An order's history, and time spent in each status
+            models.Index(fields=['order', 'created_at'], name='status_event_order_idx'),
+            # Feeds of transitions into a status
+            models.Index(fields=['new_status', 'created_at'], name='status_event_status_idx'),
+        ]
+
+
+class SalesRollup(models.Model):
+    """
+    Orders, units and revenue per (time bucket, status, product, currency),
+    kept in step with order status changes, see api/reports.py
+    """
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    # Start of the hour or day the orders were placed in
+    bucket = models.DateTimeField()
+    status = models.CharField(max_length=20, choices=Order.STATUS_CHOICES)
+    # Plain id rather than a foreign key, so purging a product keeps its sales history
+    product_id = models.UUIDField()
+    currency = models.CharField(max_length=10)
+    orders = models.IntegerField(default=0)
+    units = models.IntegerField(default=0)
+    revenue = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+
+    def __str__(self):
+        return f"{self.bucket:%Y-%m-%d %H:%M} {self.status} {self.product_id}: {self.orders} orders"
+
+    class Meta:
+        abstract = True
+        ordering = ['bucket']
+
+
+class HourlySalesRollup(SalesRollup):
+    class Meta(SalesRollup.Meta):
+        constraints = [
+            models.UniqueConstraint(
+                fields=['bucket', 'status', 'product_id', 'currency'], name='hourly_sales_rollup_key'
+            ),
+        ]
+
+
+class DailySalesRollup(SalesRollup):
+    class Meta(SalesRollup.Meta):
+        constraints = [
+            models.UniqueConstraint(
+                fields=['bucket', 'status', 'product_id', 'currency'], name='daily_sales_rollup_key'
+            ),
+        ]
+
+
+class LabelBatch(models.Model):
+    """
+    Shipping labels and packing slips for a set of orders, rendered into one
+    PDF by the process_label_batches worker, see api/labels.py
+    """
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('processing', 'Processing'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    order_ids = models.JSONField(default=list)
+    document = models.BinaryField(null=True, blank=True, editable=False)
+    page_count = models.IntegerField(default=0)
+    error = models.TextField(blank=True, default='')
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"Label batch {self.id} ({len(self.order_ids)} orders, {self.status})"
+
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Worker queue
+            models.Index(fields=['status', 'created_at'], name='label_batch_queue_idx'),
+        ]
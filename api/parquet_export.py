@@ -0,0 +1,178 @@
+"""
+Columnar order export for analytics: Arrow record batches written to Parquet.
+
+Orders are read in (updated_at, id) keyset pages (api/exports.py) and turned
+into typed record batches: ids as 16-byte fixed binary, total_pesos as
+decimal(10, 2), UTC timestamps, and status/currency dictionary-encoded. Rows
+go to one file per run in hive-style month partitions of created_at
+(month=YYYY-MM/part-<run>.parquet), so pyarrow.dataset and pandas read the
+directory as one table.
+
+Runs are incremental: the (updated_at, id) position of the last exported row
+is kept in _watermark.json next to the data and the next run starts after it.
+An order updated after it was exported (e.g. its status changed) is exported
+again by a later run, so readers should keep the row with the latest
+updated_at per id.
+
+pyarrow is an optional dependency, needed only here.
+"""
+import json
+import os
+import uuid
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+
+from .exports import EXPORT_COLUMNS, EXPORT_PAGE_SIZE, iter_order_pages
+from .models import Order
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Only the Parquet export needs it
+    pa = pq = None
+
+WATERMARK_FILE = '_watermark.json'
+
+
+def order_schema():
+    uuid_type = pa.binary(16)
+    category = pa.dictionary(pa.int8(), pa.string())
+    timestamp = pa.timestamp('us', tz='UTC')
+    types = {
+        'id': uuid_type,
+        'created_at': timestamp,
+        'updated_at': timestamp,
+        'status': category,
+        'total_pesos': pa.decimal128(10, 2),
+        'currency': category,
+        'product_id': uuid_type,
+    }
+    return pa.schema([
+        pa.field(header, types.get(header, pa.string()), nullable=header not in ('id', 'created_at'))
+        for header, _ in EXPORT_COLUMNS
+    ])
+
+
+def record_batch(rows, schema):
+    """
+    Build a RecordBatch from values_list() rows in EXPORT_COLUMNS order
+    """
+    columns = list(zip(*rows))
+    arrays = []
+    for field, values in zip(schema, columns):
+        if field.type == pa.binary(16):
+            values = [None if value is None else value.bytes for value in values]
+        arrays.append(pa.array(values, type=field.type))
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+def read_watermark(directory):
+    """
+    Return the (updated_at, id) position of the last exported order, or None
+    """
+    path = os.path.join(directory, WATERMARK_FILE)
+    if not os.path.exists(path):
+        return None
+    with open(path) as watermark_file:
+        data = json.load(watermark_file)
+    return datetime.fromisoformat(data['updated_at']), uuid.UUID(data['id'])
+
+
+def write_watermark(directory, position, rows):
+    path = os.path.join(directory, WATERMARK_FILE)
+    temporary = path + '.tmp'
+    with open(temporary, 'w') as watermark_file:
+        json.dump({
+            'updated_at': position[0].isoformat(),
+            'id': str(position[1]),
+            'exported_at': timezone.now().isoformat(),
+            'rows': rows,
+        }, watermark_file, indent=2)
+    # Atomic, so a crash never leaves a half-written watermark
+    os.replace(temporary, path)
+
+
+class MonthPartitionWriter:
+    """
+    One ParquetWriter per month partition touched by this run. Files are
+    written under a hidden name and only renamed into place by commit().
+    """
+
+    def __init__(self, directory, schema, run_id):
+        self.directory = directory
+        self.schema = schema
+        self.filename = f'part-{run_id}.parquet'
+        self.writers = {}
+
+    def paths(self, month):
+        partition = os.path.join(self.directory, f'month={month}')
+        return os.path.join(partition, f'.{self.filename}.tmp'), os.path.join(partition, self.filename)
+
+    def write(self, month, batch):
+        if month not in self.writers:
+            temporary, _ = self.paths(month)
+            os.makedirs(os.path.dirname(temporary), exist_ok=True)
+            self.writers[month] = pq.ParquetWriter(temporary, self.schema, compression='zstd')
+        self.writers[month].write_batch(batch)
+
+    def commit(self):
+        for month, writer in self.writers.items():
+            writer.close()
+            os.replace(*self.paths(month))
+        return sorted(self.writers)
+
+    def abort(self):
+        for month, writer in self.writers.items():
+            writer.close()
+            os.remove(self.paths(month)[0])
+
+
+def export_orders_parquet(directory, full=False, page_size=EXPORT_PAGE_SIZE):
+    """
+    Export orders updated since the watermark (all of them with full=True).
+    Returns (rows written, months written).
+    """
+    if pa is None:
+        raise RuntimeError('pyarrow is required for Parquet exports: pip install pyarrow')
+
+    os.makedirs(directory, exist_ok=True)
+    position = None if full else read_watermark(directory)
+    # Rows updated this recently are left for the next run, so a transaction
+    # committing late can't end up behind the watermark
+    horizon = timezone.now() - timedelta(seconds=getattr(settings, 'ORDER_EXPORT_SETTLE_SECONDS', 5))
+
+    queryset = Order.objects.filter(updated_at__lte=horizon)
+    if position is not None:
+        updated_at, pk = position
+        queryset = queryset.filter(Q(updated_at__gt=updated_at) | Q(updated_at=updated_at, id__gt=pk))
+
+    schema = order_schema()
+    run_id = f'{timezone.now():%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:8]}'
+    writer = MonthPartitionWriter(directory, schema, run_id)
+    headers = [header for header, _ in EXPORT_COLUMNS]
+    created_at_index, updated_at_index, id_index = (
+        headers.index('created_at'), headers.index('updated_at'), headers.index('id')
+    )
+
+    rows_written = 0
+    last = None
+    try:
+        for page in iter_order_pages(queryset, page_size, key='updated_at'):
+            by_month = {}
+            for row in page:
+                by_month.setdefault(f'{row[created_at_index]:%Y-%m}', []).append(row)
+            for month, rows in by_month.items():
+                writer.write(month, record_batch(rows, schema))
+            rows_written += len(page)
+            last = page[-1]
+    except BaseException:
+        writer.abort()
+        raise
+
+    months = writer.commit()
+    if last is not None:
+        write_watermark(directory, (last[updated_at_index], last[id_index]), rows_written)
+    return rows_written, months
@@ -0,0 +1,194 @@
+"""
+Minimal PDF writer for shipping labels and packing slips.
+
+Pages only need text, lines and boxes in the standard Helvetica fonts, so the
+PDF is written by hand rather than pulling in a rendering library. Rendering
+is split so it can be parallelized: render_order_pages() turns one order dict
+into compressed page content streams and needs nothing but the standard
+library (no Django), so it runs in a process pool; build_document() then
+stitches all the pages into one file with a single font table and xref.
+"""
+import zlib
+
+# Points (1/72 inch)
+LABEL_SIZE = (288, 432)  # 4 x 6 in thermal label
+SLIP_SIZE = (612, 792)  # US Letter
+
+# Average Helvetica glyph width as a fraction of the font size, for wrapping
+AVERAGE_CHAR_WIDTH = 0.52
+
+FONTS = {'F1': 'Helvetica', 'F2': 'Helvetica-Bold'}
+
+
+def pdf_string(text):
+    """
+    Literal string in the fonts' WinAnsi encoding; characters it lacks become '?'
+    """
+    data = str(text).encode('cp1252', errors='replace')
+    return b'(' + data.replace(b'\\', b'\\\\').replace(b'(', b'\\(').replace(b')', b'\\)') + b')'
+
+
+def wrap(text, size, width):
+    """
+    Split text into lines that fit width points at the given font size
+    """
+    limit = max(1, int(width / (size * AVERAGE_CHAR_WIDTH)))
+    lines = []
+    for paragraph in str(text).splitlines() or ['']:
+        line = ''
+        for word in paragraph.split():
+            while len(word) > limit:
+                if line:
+                    lines.append(line)
+                    line = ''
+                lines.append(word[:limit])
+                word = word[limit:]
+            candidate = f'{line} {word}' if line else word
+            if len(candidate) > limit:
+                lines.append(line)
+                line = word
+            else:
+                line = candidate
+        lines.append(line)
+    return lines
+
+
+class Canvas:
+    """
+    Collects drawing operators for one page; y grows upwards from the bottom
+    """
+
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self.operations = []
+
+    def text(self, x, y, value, size=10, bold=False):
+        font = 'F2' if bold else 'F1'
+        self.operations.append(b'BT /%s %d Tf %.1f %.1f Td %s Tj ET' % (font.encode(), size, x, y, pdf_string(value)))
+
+    def paragraph(self, x, y, value, size=10, width=None, leading=None, bold=False):
+        """
+        Draw wrapped text starting at y; returns the y below the last line
+        """
+        leading = leading or size * 1.25
+        for line in wrap(value, size, width or self.width - x - 18):
+            self.text(x, y, line, size, bold)
+            y -= leading
+        return y
+
+    def line(self, x1, y1, x2, y2, weight=1):
+        self.operations.append(b'%.1f w %.1f %.1f m %.1f %.1f l S' % (weight, x1, y1, x2, y2))
+
+    def rect(self, x, y, width, height, weight=1):
+        self.operations.append(b'%.1f w %.1f %.1f %.1f %.1f re S' % (weight, x, y, width, height))
+
+    def content(self):
+        return zlib.compress(b'\n'.join(self.operations))
+
+
+def render_label(order):
+    canvas = Canvas(*LABEL_SIZE)
+    width, height = LABEL_SIZE
+    canvas.rect(9, 9, width - 18, height - 18, weight=1.5)
+    canvas.text(18, height - 36, 'SHIP TO', size=11, bold=True)
+    canvas.line(18, height - 44, width - 18, height - 44)
+    y = canvas.paragraph(18, height - 68, order['client_name'], size=16, bold=True)
+    y = canvas.paragraph(18, y - 4, order['client_address'], size=12)
+    if order['client_phone']:
+        y = canvas.paragraph(18, y - 4, f"Tel. {order['client_phone']}", size=11)
+    canvas.line(18, 96, width - 18, 96)
+    canvas.text(18, 78, 'ORDER', size=9, bold=True)
+    canvas.text(18, 64, order['id'], size=8)
+    items = order['items']
+    summary = items[0]['name'] if len(items) == 1 else f"{items[0]['name']} + {len(items) - 1} more"
+    canvas.paragraph(18, 46, summary, size=10, width=width - 36)
+    return canvas.content()
+
+
+def render_slip(order):
+    canvas = Canvas(*SLIP_SIZE)
+    width, height = SLIP_SIZE
+    canvas.text(54, height - 72, 'Packing slip', size=22, bold=True)
+    canvas.text(54, height - 96, f"Order {order['id']}", size=10)
+    canvas.text(54, height - 110, f"Placed {order['created_at'][:10]}", size=10)
+
+    canvas.text(54, height - 150, 'Ship to', size=11, bold=True)
+    y = canvas.paragraph(54, height - 168, order['client_name'], size=11, width=300)
+    y = canvas.paragraph(54, y, order['client_address'], size=11, width=300)
+    for contact in (order['client_phone'], order['client_email']):
+        if contact:
+            y = canvas.paragraph(54, y, contact, size=11, width=300)
+
+    y -= 30
+    columns = ((54, 'Item'), (380, 'Qty'), (430, 'Price'), (510, 'Total'))
+    for x, title in columns:
+        canvas.text(x, y, title, size=10, bold=True)
+    canvas.line(54, y - 6, width - 54, y - 6)
+    y -= 24
+    for shown, item in enumerate(order['items']):
+        # Keep the total and the footer on the page
+        if y < 130:
+            canvas.text(54, y, f"... and {len(order['items']) - shown} more items", size=10)
+            y -= 18
+            break
+        y_after = canvas.paragraph(54, y, item['name'], size=10, width=310)
+        canvas.text(380, y, str(item['quantity']), size=10)
+        canvas.text(430, y, item['unit_price'], size=10)
+        canvas.text(510, y, item['total'], size=10)
+        y = min(y_after, y - 14) - 4
+    y -= 2
+    canvas.line(54, y, width - 54, y)
+    canvas.text(430, y - 20, 'Total', size=11, bold=True)
+    canvas.text(510, y - 20, f"{order['total_pesos']} {order['currency']}", size=11, bold=True)
+    canvas.text(54, 54, 'Thank you for your order!', size=10)
+    return canvas.content()
+
+
+def render_order_pages(order):
+    """
+    Return [(page size, compressed content stream)] for an order: its shipping label, then its packing slip
+    """
+    return [(LABEL_SIZE, render_label(order)), (SLIP_SIZE, render_slip(order))]
+
+
+def build_document(pages):
+    """
+    Assemble (page size, compressed content stream) pairs into one PDF file
+    """
+    objects = []
+
+    def add(body):
+        objects.append(body)
+        return len(objects)
+
+    catalog = add(None)
+    page_tree = add(None)
+    fonts = {
+        name: add(b'<< /Type /Font /Subtype /Type1 /BaseFont /%s /Encoding /WinAnsiEncoding >>' % base.encode())
+        for name, base in FONTS.items()
+    }
+    resources = b'<< /Font << %s >> >>' % b' '.join(b'/%s %d 0 R' % (name.encode(), number) for name, number in fonts.items())
+
+    kids = []
+    for (width, height), content in pages:
+        stream = add(b'<< /Length %d /Filter /FlateDecode >>\nstream\n%s\nendstream' % (len(content), content))
+        kids.append(add(
+            b'<< /Type /Page /Parent %d 0 R /MediaBox [0 0 %d %d] /Resources %s /Contents %d 0 R >>'
+            % (page_tree, width, height, resources, stream)
+        ))
+    objects[catalog - 1] = b'<< /Type /Catalog /Pages %d 0 R >>' % page_tree
+    objects[page_tree - 1] = b'<< /Type /Pages /Kids [%s] /Count %d >>' % (
+        b' '.join(b'%d 0 R' % kid for kid in kids), len(kids)
+    )
+
+    output = bytearray(b'%PDF-1.4\n%\xe2\xe3\xcf\xd3\n')
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(output))
+        output += b'%d 0 obj\n%s\nendobj\n' % (number, body)
+    xref = len(output)
+    output += b'xref\n0 %d\n0000000000 65535 f \n' % (len(objects) + 1)
+    output += b''.join(b'%010d 00000 n \n' % offset for offset in offsets)
+    output += b'trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (len(objects) + 1, catalog, xref)
+    return bytes(output)
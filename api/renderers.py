@@ -0,0 +1,114 @@
+import csv
+import io
+import json
+
+from rest_framework import renderers
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # Fall back to the stdlib json module
+    orjson = None
+
+
+class RenderedJSON(bytes):
+    """
+    JSON body that has already been rendered, e.g. concatenated product fragments
+    """
+
+
+class JSONRenderer(renderers.JSONRenderer):
+    """
+    orjson-backed JSON renderer producing the same bytes as DRF's renderer.
+    UUID and datetime values are encoded natively; everything else orjson
+    doesn't know (Decimal, timedelta, lazy strings...) goes through DRF's
+    encoder. Falls back to the stdlib when orjson is missing or when the
+    output must be indented (browsable API). Pre-rendered bodies are passed
+    through untouched.
+    """
+
+    orjson_options = (orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS) if orjson else 0
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        indent = self.get_indent(accepted_media_type or '', renderer_context or {})
+
+        if isinstance(data, RenderedJSON):
+            if not indent:
+                return bytes(data)
+            # Re-render so the browsable API can pretty print it
+            data = json.loads(data)
+
+        if data is None:
+            return b''
+
+        if orjson is not None and not indent and self.compact and not self.ensure_ascii:
+            try:
+                ret = orjson.dumps(data, default=self.encoder_default, option=self.orjson_options)
+            except orjson.JSONEncodeError:
+                pass  # e.g. integers wider than 64 bits
+            else:
+                # Same escaping as DRF, for embedding in <script> tags
+                if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+                    ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+                return ret
+
+        return super().render(data, accepted_media_type, renderer_context)
+
+    @staticmethod
+    def encoder_default(obj):
+        return JSONEncoder().default(obj)
+
+
+class CSVRenderer(renderers.BaseRenderer):
+    """
+    Lets ?format=csv through content negotiation for the streaming exports.
+    Exports write their own body; this only renders error responses.
+    """
+    media_type = 'text/csv'
+    format = 'csv'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        output = io.StringIO()
+        writer = csv.writer(output)
+        writer.writerow(['field', 'message'])
+        items = data.items() if isinstance(data, dict) else [('detail', data)]
+        for field, messages in items:
+            for message in messages if isinstance(messages, list) else [messages]:
+                writer.writerow([field, message])
+        return output.getvalue().encode(self.charset)
+
+
+class NDJSONRenderer(renderers.BaseRenderer):
+    """
+    Lets ?format=ndjson through content negotiation for the streaming exports.
+    Error responses are rendered as a single JSON line.
+    """
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+    charset = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return JSONRenderer().render(data) + b'\n'
+
+
+class PDFRenderer(renderers.BaseRenderer):
+    """
+    Lets Accept: application/pdf through content negotiation for label downloads.
+    Downloads return their own body; this only renders error responses, as plain text.
+    """
+    media_type = 'application/pdf'
+    format = 'pdf'
+    charset = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if isinstance(data, bytes):
+            return data
+        items = data.items() if isinstance(data, dict) else [('detail', data)]
+        return '\n'.join(f'{field}: {messages}' for field, messages in items).encode('utf-8')
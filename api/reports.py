@@ -0,0 +1,195 @@
+"""
+Sales rollups behind the admin sales report.
+
+Every order counts once in the hourly and the daily rollup row of the hour and
+day it was created in, under its current status. Its units and revenue go to
+the rows of its lines' products (api/cart.py); the order itself is counted
+under its first line's product. On a status change it moves from the old
+status rows to the new ones: two F() updates per row and table, or an insert
+the first time a (bucket, status, product, currency) key is seen. The
+report therefore reads at most one row per bucket, status, product and
+currency, however many orders there are. Bulk status changes sum their
+deltas per row first, so they cost one update per row touched.
+
+The rebuild_sales_rollups command recomputes both tables from the orders and
+order items in bulk, to backfill them or to correct drift (e.g. a total edited in the admin).
+"""
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import TruncDay, TruncHour
+from django.utils import timezone
+
+from .exports import ExportFilterError, parse_bound
+from .cart import order_lines
+from .models import DailySalesRollup, HourlySalesRollup, Order, OrderItem
+
+GRANULARITIES = {
+    'hour': (HourlySalesRollup, TruncHour, timedelta(hours=1)),
+    'day': (DailySalesRollup, TruncDay, timedelta(days=1)),
+}
+
+# Report range when ?from= is missing, and the most buckets one report may span
+DEFAULT_BUCKETS = {'hour': 48, 'day': 30}
+MAX_BUCKETS = 2000
+
+REBUILD_BATCH_SIZE = 1000
+
+
+def bucket_start(moment, granularity):
+    moment = timezone.localtime(moment)
+    if granularity == 'day':
+        return moment.replace(hour=0, minute=0, second=0, microsecond=0)
+    return moment.replace(minute=0, second=0, microsecond=0)
+
+
+def rollup_deltas(changes):
+    """
+    Sum (order, old_status, new_status) changes into {(granularity, bucket, status,
+    product_id, currency): [orders, units, revenue]}; either status may be None.
+    Each order line counts under its product; the order itself is counted under
+    its first line's product, so orders add up once across products.
+    """
+    deltas = {}
+    for order, old_status, new_status in changes:
+        if old_status == new_status:
+            continue
+        for position, (product_id, units, revenue) in enumerate(order_lines(order)):
+            for status, sign in ((old_status, -1), (new_status, 1)):
+                if status is None:
+                    continue
+                for granularity in GRANULARITIES:
+                    key = (granularity, bucket_start(order.created_at, granularity), status, product_id, order.currency)
+                    delta = deltas.setdefault(key, [0, 0, Decimal(0)])
+                    delta[0] += sign if position == 0 else 0
+                    delta[1] += sign * units
+                    delta[2] += sign * revenue
+    return deltas
+
+
+def apply_rollup_deltas(deltas):
+    """
+    Add each delta to its rollup row: one F() update, or an insert for a new key
+    """
+    for (granularity, bucket, status, product_id, currency), (orders, units, revenue) in deltas.items():
+        if not (orders or units or revenue):
+            continue
+        model = GRANULARITIES[granularity][0]
+        key = {'bucket': bucket, 'status': status, 'product_id': product_id, 'currency': currency}
+        changes = {'orders': F('orders') + orders, 'units': F('units') + units, 'revenue': F('revenue') + revenue}
+        if model.objects.filter(**key).update(**changes):
+            continue
+        try:
+            with transaction.atomic():
+                model.objects.create(**key, orders=orders, units=units, revenue=revenue)
+        except IntegrityError:
+            # Another transaction created the row first
+            model.objects.filter(**key).update(**changes)
+
+
+def apply_status_change(order, old_status, new_status):
+    """
+    Move the order between status rows; old_status is None for new orders
+    """
+    apply_rollup_deltas(rollup_deltas([(order, old_status, new_status)]))
+
+
+def rebuild_rollups(batch_size=REBUILD_BATCH_SIZE):
+    """
+    Recompute both rollup tables from the orders and order items; returns {granularity: rows}
+    """
+    tzinfo = timezone.get_current_timezone()
+    written = {}
+    with transaction.atomic():
+        for granularity, (model, trunc, _) in GRANULARITIES.items():
+            model.objects.all().delete()
+            # Orders without items are one unit of their product, see api/cart.py
+            single = (
+                Order.objects.filter(items__isnull=True).order_by()
+                .annotate(bucket=trunc('created_at', tzinfo=tzinfo))
+                .values('bucket', 'status', 'product_id', 'currency')
+                .annotate(orders=Count('pk'), units=Count('pk'), revenue=Sum('total_pesos'))
+            )
+            lines = (
+                OrderItem.objects.order_by()
+                .annotate(
+                    bucket=trunc('order__created_at', tzinfo=tzinfo),
+                    status=F('order__status'),
+                    currency=F('order__currency'),
+                )
+                .values('bucket', 'status', 'product_id', 'currency')
+                .annotate(
+                    orders=Count('pk', filter=Q(position=0)),
+                    units=Sum('quantity'),
+                    revenue=Sum(F('quantity') * F('unit_price_pesos')),
+                )
+            )
+            # Both kinds can land in the same row
+            rows = {}
+            for groups in (single, lines):
+                for group in groups.iterator(chunk_size=batch_size):
+                    key = (group['bucket'], group['status'], group['product_id'], group['currency'])
+                    row = rows.setdefault(key, [0, 0, Decimal(0)])
+                    row[0] += group['orders']
+                    row[1] += group['units']
+                    row[2] += group['revenue']
+
+            model.objects.bulk_create(
+                (
+                    model(bucket=bucket, status=status, product_id=product_id, currency=currency,
+                          orders=orders, units=units, revenue=revenue)
+                    for (bucket, status, product_id, currency), (orders, units, revenue) in rows.items()
+                ),
+                batch_size=batch_size
+            )
+            written[granularity] = len(rows)
+    return written
+
+
+def sales_report(granularity, date_from=None, date_to=None, by_product=False):
+    """
+    Rollup totals per bucket (and product with by_product) plus totals for the whole range.
+    Raises ExportFilterError on bad input.
+    """
+    if granularity not in GRANULARITIES:
+        raise ExportFilterError('granularity', f"Expected one of: {', '.join(GRANULARITIES)}.")
+    model, _, step = GRANULARITIES[granularity]
+
+    end = parse_bound(date_to, 'to', end=True) if date_to else timezone.now()
+    start = parse_bound(date_from, 'from') if date_from else end - step * DEFAULT_BUCKETS[granularity]
+    start = bucket_start(start, granularity)
+    if start >= end:
+        raise ExportFilterError('from', "Must be before 'to'.")
+    if (end - start) / step > MAX_BUCKETS:
+        raise ExportFilterError('from', f"The range spans more than {MAX_BUCKETS} {granularity}s.")
+
+    rows = model.objects.filter(bucket__gte=start, bucket__lt=end).order_by()
+    group = ['status', 'currency'] + (['product_id'] if by_product else [])
+    totals = {'orders': Sum('orders'), 'units': Sum('units'), 'revenue': Sum('revenue')}
+    # Rows of a cart's later lines have units but no orders
+    nonzero = Q(orders__gt=0) | Q(units__gt=0)
+
+    def serialize(values):
+        values = dict(values)
+        if 'bucket' in values:
+            values['bucket'] = timezone.localtime(values['bucket']).isoformat()
+        if 'product_id' in values:
+            values['product_id'] = str(values['product_id'])
+        values['revenue'] = f"{values['revenue']:.2f}"
+        return values
+
+    return {
+        'granularity': granularity,
+        'from': start.isoformat(),
+        'to': end.isoformat(),
+        'buckets': [
+            serialize(values) for values in
+            rows.values('bucket', *group).annotate(**totals).filter(nonzero).order_by('bucket', *group)
+        ],
+        'totals': [
+            serialize(values) for values in
+            rows.values(*group).annotate(**totals).filter(nonzero).order_by(*group)
+        ],
+    }
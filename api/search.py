@@ -0,0 +1,146 @@
+"""
+Full-text product search over name, description and type.
+
+SQLite: an FTS5 table (api_product_fts) whose rowid mirrors api_product's
+rowid, kept in sync by triggers. Terms are prefix-matched and results ranked
+with bm25.
+
+PostgreSQL: a GIN index over a tsvector expression of the same columns,
+queried with prefix tsquery terms and ranked with ts_rank.
+
+Django rebuilds SQLite tables for some schema changes, which drops the
+triggers and may renumber rowids; migrations that do that must call
+install_search_index() again (or run ``manage.py rebuild_search_index``).
+"""
+import re
+from functools import reduce
+from operator import and_
+
+from django.db import connections
+from django.db.models import Q
+
+FTS_TABLE = 'api_product_fts'
+
+# Column weights for bm25(): name, description, type
+FTS_WEIGHTS = (10.0, 2.0, 5.0)
+
+SEARCH_VECTOR_SQL = (
+    "to_tsvector('simple', coalesce(api_product.name, '') || ' ' || "
+    "coalesce(api_product.description, '') || ' ' || coalesce(api_product.type, ''))"
+)
+
+MAX_TERMS = 10
+
+TERM_RE = re.compile(r'\w+')
+
+SQLITE_STATEMENTS = [
+    f"DROP TABLE IF EXISTS {FTS_TABLE}",
+    f"""CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5(
+        name, description, type,
+        tokenize = 'unicode61 remove_diacritics 2',
+        prefix = '2 3'
+    )""",
+    f"""INSERT INTO {FTS_TABLE} (rowid, name, description, type)
+        SELECT rowid, name, description, type FROM api_product""",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_insert",
+    f"""CREATE TRIGGER {FTS_TABLE}_insert AFTER INSERT ON api_product BEGIN
+        INSERT INTO {FTS_TABLE} (rowid, name, description, type)
+        VALUES (new.rowid, new.name, new.description, new.type);
+    END""",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_update",
+    f"""CREATE TRIGGER {FTS_TABLE}_update AFTER UPDATE OF name, description, type ON api_product BEGIN
+        UPDATE {FTS_TABLE} SET name = new.name, description = new.description, type = new.type
+        WHERE rowid = old.rowid;
+    END""",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_delete",
+    f"""CREATE TRIGGER {FTS_TABLE}_delete AFTER DELETE ON api_product BEGIN
+        DELETE FROM {FTS_TABLE} WHERE rowid = old.rowid;
+    END""",
+]
+
+POSTGRESQL_STATEMENTS = [
+    "DROP INDEX IF EXISTS api_product_search_idx",
+    f"CREATE INDEX api_product_search_idx ON api_product USING GIN (({SEARCH_VECTOR_SQL}))",
+]
+
+_fts_available = {}
+
+
+def uninstall_search_index(connection):
+    if connection.vendor == 'sqlite':
+        statements = [f"DROP TRIGGER IF EXISTS {FTS_TABLE}_{suffix}" for suffix in ('insert', 'update', 'delete')]
+        statements.append(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+    elif connection.vendor == 'postgresql':
+        statements = ["DROP INDEX IF EXISTS api_product_search_idx"]
+    else:
+        return
+
+    with connection.cursor() as cursor:
+        for statement in statements:
+            cursor.execute(statement)
+    _fts_available.pop(connection.alias, None)
+
+
+def install_search_index(connection):
+    """
+    (Re)create the search index for the connection's backend and fill it
+    """
+    if connection.vendor == 'sqlite':
+        statements = SQLITE_STATEMENTS
+    elif connection.vendor == 'postgresql':
+        statements = POSTGRESQL_STATEMENTS
+    else:
+        return
+
+    with connection.cursor() as cursor:
+        for statement in statements:
+            cursor.execute(statement)
+    _fts_available.pop(connection.alias, None)
+
+
+def fts_available(connection):
+    if connection.alias not in _fts_available:
+        _fts_available[connection.alias] = FTS_TABLE in connection.introspection.table_names()
+    return _fts_available[connection.alias]
+
+
+def search_terms(query):
+    return TERM_RE.findall(query)[:MAX_TERMS]
+
+
+def search_products(queryset, query):
+    """
+    Filter a Product queryset to the matches of a free-text query, best first
+    """
+    terms = search_terms(query)
+    if not terms:
+        return queryset.none()
+
+    connection = connections[queryset.db]
+
+    if connection.vendor == 'sqlite' and fts_available(connection):
+        match = ' '.join(f'"{term}"*' for term in terms)
+        weights = ', '.join(str(weight) for weight in FTS_WEIGHTS)
+        return queryset.extra(
+            tables=[FTS_TABLE],
+            where=[f'{FTS_TABLE}.rowid = api_product.rowid', f'{FTS_TABLE} MATCH %s'],
+            params=[match],
+            select={'search_rank': f'bm25({FTS_TABLE}, {weights})'},
+            order_by=['search_rank'],
+        )
+
+    if connection.vendor == 'postgresql':
+        tsquery = ' & '.join(f'{term}:*' for term in terms)
+        return queryset.extra(
+            where=[f"{SEARCH_VECTOR_SQL} @@ to_tsquery('simple', %s)"],
+            params=[tsquery],
+            select={'search_rank': f"ts_rank({SEARCH_VECTOR_SQL}, to_tsquery('simple', %s))"},
+            select_params=[tsquery],
+            order_by=['-search_rank'],
+        )
+
+    # No full-text index available: substring match on every term
+    return queryset.filter(reduce(and_, [
+        Q(name__icontains=term) | Q(description__icontains=term) | Q(type__icontains=term)
+        for term in terms
+    ]))
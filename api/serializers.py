@@ -1,5 +1,7 @@
 from rest_framework import serializers
-from .models import Product, Order
+from rest_framework.reverse import reverse
+from .cart import MAX_CART_ITEMS
+from .models import Category, Product, Customer, Order, OrderItem, LabelBatch
 
 
 class ProductSerializer(serializers.ModelSerializer):
@@ -24,6 +26,16 @@ class ProductSerializer(serializers.ModelSerializer):
         return data
 
 
+class CategorySerializer(serializers.ModelSerializer):
+    """
+    Category facet with its precomputed product counts
+    """
+    class Meta:
+        model = Category
+        fields = ['id', 'name', 'product_count', 'in_stock_count']
+        read_only_fields = fields
+
+
 class ProductCreateUpdateSerializer(serializers.ModelSerializer):
     """
     Serializer for creating and updating products with base64 image validation
@@ -62,27 +74,135 @@ class ProductCreateUpdateSerializer(serializers.ModelSerializer):
         return value
 
 
+class ProductBulkListSerializer(serializers.ListSerializer):
+    """
+    Rejects batches that touch the same product twice
+    """
+    def validate(self, attrs):
+        ids = [item['id'] for item in attrs if 'id' in item]
+        if len(ids) != len(set(ids)):
+            raise serializers.ValidationError("Each product id may appear only once per request")
+        return attrs
+
+
+class ProductBulkItemSerializer(serializers.Serializer):
+    """
+    One item of a bulk request: an upsert (create, or update if the id exists) or a delete.
+    Upsert fields are validated with ProductCreateUpdateSerializer, partially for updates.
+    Expects 'existing_ids' and 'deleted_ids' sets in the context.
+    """
+    ACTION_CHOICES = ['upsert', 'delete']
+
+    action = serializers.ChoiceField(choices=ACTION_CHOICES, default='upsert')
+    id = serializers.UUIDField(required=False)
+
+    class Meta:
+        list_serializer_class = ProductBulkListSerializer
+
+    def to_internal_value(self, data):
+        validated = super().to_internal_value(data)
+        product_id = validated.get('id')
+        if product_id in self.context['deleted_ids']:
+            raise serializers.ValidationError({'id': ["Product was deleted"]})
+        if validated['action'] == 'delete':
+            if product_id is None:
+                raise serializers.ValidationError({'id': ["This field is required."]})
+            return validated
+
+        validated['fields'] = self.product_serializer(partial=product_id in self.context['existing_ids']).run_validation(data)
+        return validated
+
+    def product_serializer(self, partial):
+        """
+        One ProductCreateUpdateSerializer per mode, reused for every item so its fields are built once
+        """
+        cache = self.__dict__.setdefault('_product_serializers', {})
+        if partial not in cache:
+            cache[partial] = ProductCreateUpdateSerializer(partial=partial)
+        return cache[partial]
+
+
+class OrderItemSerializer(serializers.ModelSerializer):
+    """
+    A cart order line with its product snapshot
+    """
+    product_id = serializers.UUIDField(read_only=True)
+
+    class Meta:
+        model = OrderItem
+        fields = ['position', 'product_id', 'product_name', 'unit_price_pesos', 'product_picture_hash', 'quantity']
+        read_only_fields = fields
+
+
 class OrderSerializer(serializers.ModelSerializer):
     product = ProductSerializer(read_only=True)
     product_id = serializers.UUIDField(write_only=True)
+    # Empty for orders placed before carts
+    items = OrderItemSerializer(many=True, read_only=True)
+    customer_id = serializers.UUIDField(read_only=True)
     
     class Meta:
         model = Order
         fields = [
-            'id', 'product', 'product_id', 'client_name', 'client_email', 'client_phone', 'client_address',
+            'id', 'product', 'product_id', 'product_name', 'unit_price_pesos', 'product_picture_hash', 'items',
+            'customer_id', 'client_name', 'client_email', 'client_phone', 'client_address',
             'stripe_session_id', 'status', 'total_pesos', 'currency',
             'created_at', 'updated_at'
         ]
-        read_only_fields = ['id', 'stripe_session_id', 'status', 'created_at', 'updated_at']
+        read_only_fields = [
+            'id', 'product_name', 'unit_price_pesos', 'product_picture_hash',
+            'stripe_session_id', 'status', 'created_at', 'updated_at'
+        ]
 
     def create(self, validated_data):
         product_id = validated_data.pop('product_id')
         try:
             product = Product.objects.get(id=product_id)
-            validated_data['product'] = product
-            return super().create(validated_data)
         except Product.DoesNotExist:
             raise serializers.ValidationError("Product not found")
+        order = Order(**validated_data)
+        order.capture_product(product)
+        order.save()
+        return order
+
+
+class OrderProductSnapshotSerializer(serializers.Serializer):
+    """
+    An order's product as it was at purchase time, read from the order's own columns
+    """
+    id = serializers.UUIDField(source='product_id')
+    name = serializers.CharField(source='product_name')
+    price_pesos = serializers.DecimalField(max_digits=10, decimal_places=2, source='unit_price_pesos')
+    currency = serializers.CharField()
+    picture_hash = serializers.CharField(source='product_picture_hash')
+
+
+class OrderListSerializer(serializers.ModelSerializer):
+    """
+    Order list entries, with the current product like the order detail
+    """
+    product = ProductSerializer(read_only=True)
+    customer_id = serializers.UUIDField(read_only=True)
+    
+    class Meta:
+        model = Order
+        fields = [
+            'id', 'product', 'customer_id', 'client_name', 'client_email', 'client_phone', 'client_address',
+            'stripe_session_id', 'status', 'total_pesos', 'currency',
+            'created_at', 'updated_at'
+        ]
+        read_only_fields = fields
+
+
+class OrderSnapshotListSerializer(OrderListSerializer):
+    """
+    Order list entries for ?version=2: the product comes from the order's snapshot
+    instead of the products table
+    """
+    product = OrderProductSnapshotSerializer(source='*', read_only=True)
+
+    class Meta(OrderListSerializer.Meta):
+        pass
 
 
 class OrderCreateSerializer(serializers.ModelSerializer):
@@ -131,3 +251,118 @@ class OrderCreateSerializer(serializers.ModelSerializer):
                 raise serializers.ValidationError("Product not found")
         
         return data
+
+
+class CustomerSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Customer
+        fields = ['id', 'email', 'name', 'phone', 'address', 'created_at', 'updated_at']
+        read_only_fields = fields
+
+
+class CartItemSerializer(serializers.Serializer):
+    product_id = serializers.UUIDField()
+    quantity = serializers.IntegerField(min_value=1, default=1)
+
+
+class CartCheckoutSerializer(serializers.ModelSerializer):
+    """
+    Cart checkout: products with quantities plus the client's details.
+    Repeated products are merged; all products are checked with one query.
+    """
+    items = CartItemSerializer(many=True, allow_empty=False)
+
+    class Meta:
+        model = Order
+        fields = [
+            'items', 'client_name', 'client_email', 'client_phone', 'client_address'
+        ]
+
+    def validate_items(self, value):
+        quantities = {}
+        for item in value:
+            quantities[item['product_id']] = quantities.get(item['product_id'], 0) + item['quantity']
+        if len(quantities) > MAX_CART_ITEMS:
+            raise serializers.ValidationError(f"At most {MAX_CART_ITEMS} different products per order")
+        return quantities
+
+    def validate(self, data):
+        """
+        Check every product exists and has stock, then set products to [(product, quantity)]
+        """
+        quantities = data.pop('items')
+        products = Product.objects.in_bulk(list(quantities))
+        missing = [str(product_id) for product_id in quantities if product_id not in products]
+        if missing:
+            raise serializers.ValidationError({'items': [f"Products not found: {', '.join(missing)}"]})
+
+        errors = []
+        for product_id, quantity in quantities.items():
+            product = products[product_id]
+            if product.stock < quantity:
+                errors.append(
+                    f"Product '{product.name}' has only {product.stock} in stock, {quantity} requested"
+                )
+        if errors:
+            raise serializers.ValidationError({'items': errors})
+
+        currencies = {product.currency.upper() for product in products.values()}
+        if len(currencies) > 1:
+            raise serializers.ValidationError(
+                {'items': [f"All products must be priced in one currency, got {', '.join(sorted(currencies))}"]}
+            )
+
+        # Check if amount meets Stripe minimum requirements
+        total = sum(products[product_id].price_pesos * quantity for product_id, quantity in quantities.items())
+        if currencies == {'MXN'} and total < 10:
+            raise serializers.ValidationError(
+                f"Amount must be at least $10.00 MXN. Current amount: ${total} MXN"
+            )
+
+        data['products'] = [(products[product_id], quantity) for product_id, quantity in quantities.items()]
+        return data
+
+
+class OrderIdListSerializer(serializers.Serializer):
+    """
+    A list of order ids; repeated ids count once. Pass max_orders in the context to cap it.
+    """
+    order_ids = serializers.ListField(child=serializers.UUIDField(), allow_empty=False)
+
+    def validate_order_ids(self, value):
+        max_orders = self.context.get('max_orders')
+        value = list(dict.fromkeys(value))
+        if max_orders and len(value) > max_orders:
+            raise serializers.ValidationError(f"At most {max_orders} orders per request")
+        return value
+
+
+class OrderBulkStatusSerializer(OrderIdListSerializer):
+    """
+    Target status for a list of orders; repeated ids are applied once
+    """
+    status = serializers.ChoiceField(choices=Order.STATUS_CHOICES)
+
+
+class LabelBatchSerializer(serializers.ModelSerializer):
+    """
+    Label batch progress; the PDF itself is served by the download action
+    """
+    order_count = serializers.SerializerMethodField()
+    download_url = serializers.SerializerMethodField()
+
+    class Meta:
+        model = LabelBatch
+        fields = [
+            'id', 'status', 'order_count', 'page_count', 'error',
+            'created_at', 'started_at', 'finished_at', 'download_url'
+        ]
+        read_only_fields = fields
+
+    def get_order_count(self, obj):
+        return len(obj.order_ids)
+
+    def get_download_url(self, obj):
+        if obj.status != 'done':
+            return None
+        return reverse('labelbatch-download', args=[obj.id], request=self.context.get('request'))
@@ -0,0 +1,132 @@
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import Signal, receiver
+
+from .cache import invalidate_catalog
+from .categories import apply_facet_change, get_category
+from .customers import assign_customer
+from .events import broadcaster
+from .models import Order, OrderStatusEvent, Product, ProductTombstone
+from .reports import apply_status_change
+
+# Sent whenever an order's status changes.
+# Arguments: order, old_status (None for new orders), new_status,
+# source (an OrderStatusEvent source) and stripe_event_id (or None)
+order_status_changed = Signal()
+
+
+@receiver(pre_save, sender=Order)
+def link_order_customer(sender, instance, **kwargs):
+    """
+    Link the order to the customer of its client email, see api/customers.py
+    """
+    assign_customer(instance)
+
+
+@receiver(post_save, sender=Order)
+def detect_order_status_change(sender, instance, created, **kwargs):
+    """
+    Compare the saved status with the one loaded from the database and
+    announce the transition if it changed
+    """
+    old_status = None if created else getattr(instance, '_loaded_status', None)
+    if created or old_status != instance.status:
+        order_status_changed.send(
+            sender=Order,
+            order=instance,
+            old_status=old_status,
+            new_status=instance.status,
+            source=getattr(instance, '_status_source', None) or 'system',
+            stripe_event_id=getattr(instance, '_stripe_event_id', None),
+        )
+    instance._loaded_status = instance.status
+    instance._status_source = instance._stripe_event_id = None
+
+
+@receiver(order_status_changed)
+def record_order_status_event(sender, order, old_status, new_status, source='system', stripe_event_id=None, **kwargs):
+    """
+    Append the transition to the order's status history, in the transaction that saved it
+    """
+    OrderStatusEvent.objects.create(
+        order=order,
+        old_status=old_status,
+        new_status=new_status,
+        source=source,
+        stripe_event_id=stripe_event_id,
+    )
+
+
+@receiver(order_status_changed)
+def publish_order_status(sender, order, new_status, **kwargs):
+    """
+    Push the new status to SSE subscribers once the transaction commits
+    """
+    transaction.on_commit(
+        partial(broadcaster.publish, str(order.pk), new_status, order.updated_at)
+    )
+
+
+@receiver(order_status_changed)
+def update_sales_rollups(sender, order, old_status, new_status, **kwargs):
+    """
+    Move the order between sales rollup rows, see api/reports.py
+    """
+    apply_status_change(order, old_status, new_status)
+
+
+@receiver(pre_delete, sender=Order)
+def remove_from_sales_rollups(sender, instance, **kwargs):
+    """
+    Drop a deleted order from the sales rollups, before its items are deleted with it
+    """
+    apply_status_change(instance, getattr(instance, '_loaded_status', None) or instance.status, None)
+
+
+@receiver(post_save, sender=Product)
+@receiver(post_delete, sender=Product)
+def invalidate_product_catalog(sender, **kwargs):
+    """
+    Drop cached catalog responses once the product write commits
+    """
+    transaction.on_commit(invalidate_catalog)
+
+
+@receiver(pre_save, sender=Product)
+def assign_product_category(sender, instance, **kwargs):
+    """
+    Keep the category in step with the free-text type
+    """
+    if instance.category_id is None or instance.type != getattr(instance, '_loaded_type', None):
+        instance.category = get_category(instance.type)
+
+
+@receiver(post_save, sender=Product)
+def update_category_counts(sender, instance, created, **kwargs):
+    """
+    Move the product between category facets after it is written
+    """
+    old_facet = None if created else getattr(instance, '_loaded_facet', None)
+    apply_facet_change(old_facet, instance.facet)
+    instance._loaded_type = instance.type
+    instance._loaded_facet = instance.facet
+
+
+@receiver(post_delete, sender=Product)
+def remove_from_category_counts(sender, instance, **kwargs):
+    """
+    Drop a deleted product from its category facet
+    """
+    apply_facet_change(getattr(instance, '_loaded_facet', instance.facet), None)
+
+
+@receiver(post_delete, sender=Product)
+def record_product_tombstone(sender, instance, **kwargs):
+    """
+    Leave a tombstone for delta sync clients, see api/changes.py
+    Soft-deleted products already got theirs from soft_delete()
+    """
+    if instance.deleted_at is None:
+        ProductTombstone.objects.create(product_id=instance.pk)
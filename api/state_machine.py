@@ -0,0 +1,204 @@
+"""
+Order status state machine.
+
+TRANSITIONS lists, for each status, the statuses an order may move to next;
+everything else is derived from it. transition() applies a change as one
+conditional UPDATE:
+
+    UPDATE api_order SET status = <new>, updated_at = <now>
+    WHERE id = <order> AND status = <status the caller saw>
+
+Validation against TRANSITIONS happens first, so the WHERE clause only
+matches a permitted predecessor. If another request or webhook moved the
+order in between, no row matches and the call reports it lost the race
+instead of overwriting the newer status. That makes one-off side effects
+(reducing stock on payment) safe under duplicate or concurrent webhooks.
+
+The UPDATE bypasses Model.save(), so transition() sends order_status_changed
+itself, in the same transaction, for the history, sales rollups and SSE
+subscribers.
+
+bulk_transition() moves many orders at once: one locking read validates them
+all, then there is one UPDATE per predecessor status and batch. Instead of a
+signal per order it writes the history with bulk_create, sums the rollup
+changes per row, and publishes to SSE subscribers after commit.
+"""
+from django.db import transaction
+from django.utils import timezone
+
+from .cart import load_order_lines
+from .events import broadcaster
+from .models import Order, OrderStatusEvent
+from .reports import apply_rollup_deltas, rollup_deltas
+from .signals import order_status_changed
+
+BULK_BATCH_SIZE = 500
+BULK_MAX_ORDERS = 5000
+
+TRANSITIONS = {
+    'pending': ('success', 'failed', 'cancelled'),
+    'success': ('sent', 'shipped', 'delivered'),
+    'sent': ('shipped', 'delivered'),
+    'shipped': ('delivered',),
+    'failed': (),
+    'cancelled': (),
+    'delivered': (),
+}
+
+STATUSES = tuple(status for status, _ in Order.STATUS_CHOICES)
+FINAL_STATUSES = tuple(status for status in STATUSES if not TRANSITIONS[status])
+
+# Statuses an order may be in to move to each status
+PREDECESSORS = {
+    status: tuple(previous for previous in STATUSES if status in TRANSITIONS[previous])
+    for status in STATUSES
+}
+
+
+class InvalidTransition(ValueError):
+    """
+    The requested status change isn't allowed from the order's current status
+    """
+
+
+def human_join(values):
+    values = list(values)
+    if len(values) <= 2:
+        return ' or '.join(values)
+    return f"{', '.join(values[:-1])}, or {values[-1]}"
+
+
+def can_transition(current, new):
+    return new in TRANSITIONS.get(current, ())
+
+
+def transition_error(current, new):
+    """
+    Explain why current -> new isn't allowed, or return None if it is
+    """
+    if new not in STATUSES:
+        return f'Invalid status. Valid statuses are: {", ".join(STATUSES)}'
+    if current in FINAL_STATUSES:
+        return f'Cannot change status from "{current}". This status is final.'
+    if not can_transition(current, new):
+        return (
+            f'Cannot change status from "{current}" to "{new}". '
+            f'{current.capitalize()} orders can only be changed to {human_join(TRANSITIONS[current])}.'
+        )
+    return None
+
+
+def transition(order, new_status, source, stripe_event_id=None):
+    """
+    Move a loaded order to new_status with a single compare-and-set UPDATE.
+    Returns True if this call made the change. Returns False if the order's
+    stored status no longer matched order.status; order.status is then
+    refreshed. Raises InvalidTransition if the table doesn't allow the change.
+    """
+    old_status = order.status
+    error = transition_error(old_status, new_status)
+    if error:
+        raise InvalidTransition(error)
+
+    now = timezone.now()
+    with transaction.atomic():
+        updated = Order.objects.filter(pk=order.pk, status=old_status).update(status=new_status, updated_at=now)
+        if not updated:
+            order.refresh_from_db(fields=['status', 'updated_at'])
+            order._loaded_status = order.status
+            return False
+
+        order.status, order.updated_at = new_status, now
+        order._loaded_status = new_status
+        order_status_changed.send(
+            sender=Order,
+            order=order,
+            old_status=old_status,
+            new_status=new_status,
+            source=source,
+            stripe_event_id=stripe_event_id,
+        )
+    return True
+
+
+def try_transition(order, new_status, source, stripe_event_id=None):
+    """
+    transition() for webhooks and pages that may see an order in any status:
+    returns False instead of raising when the change isn't allowed
+    """
+    return can_transition(order.status, new_status) and transition(order, new_status, source, stripe_event_id)
+
+
+def bulk_transition(order_ids, new_status, source):
+    """
+    Move the given orders to new_status. Returns one result per id, in order:
+    updated, unchanged (already in new_status), invalid (with the error),
+    conflict (changed concurrently) or not_found.
+    """
+    if new_status not in STATUSES:
+        raise InvalidTransition(transition_error(None, new_status))
+
+    now = timezone.now()
+    with transaction.atomic():
+        orders = {}
+        for start in range(0, len(order_ids), BULK_BATCH_SIZE):
+            chunk = order_ids[start:start + BULK_BATCH_SIZE]
+            orders.update(
+                (order.pk, order) for order in
+                Order.objects.select_for_update()
+                .filter(pk__in=chunk)
+                .only('id', 'status', 'created_at', 'product', 'currency', 'total_pesos')
+            )
+
+        results, by_status = {}, {}
+        for pk in order_ids:
+            order = orders.get(pk)
+            if order is None:
+                results[pk] = {'id': str(pk), 'result': 'not_found'}
+            elif order.status == new_status:
+                results[pk] = {'id': str(pk), 'result': 'unchanged', 'status': new_status}
+            elif not can_transition(order.status, new_status):
+                results[pk] = {
+                    'id': str(pk), 'result': 'invalid', 'status': order.status,
+                    'error': transition_error(order.status, new_status),
+                }
+            else:
+                by_status.setdefault(order.status, []).append(order)
+
+        changes = []
+        for old_status, group in by_status.items():
+            for start in range(0, len(group), BULK_BATCH_SIZE):
+                chunk = group[start:start + BULK_BATCH_SIZE]
+                ids = [order.pk for order in chunk]
+                updated = Order.objects.filter(pk__in=ids, status=old_status).update(status=new_status, updated_at=now)
+                if updated < len(chunk):
+                    # Backends that can't lock rows may let a concurrent change in first
+                    ours = set(
+                        Order.objects.filter(pk__in=ids, status=new_status, updated_at=now).values_list('pk', flat=True)
+                    )
+                    chunk = [order for order in chunk if order.pk in ours]
+                for order in chunk:
+                    order.status, order.updated_at = new_status, now
+                    changes.append((order, old_status, new_status))
+                    results[order.pk] = {'id': str(order.pk), 'result': 'updated', 'status': new_status, 'old_status': old_status}
+
+        for order in orders.values():
+            if order.pk not in results:
+                results[order.pk] = {
+                    'id': str(order.pk), 'result': 'conflict',
+                    'error': 'Order status changed concurrently.',
+                }
+
+        load_order_lines([order for order, _, _ in changes])
+        OrderStatusEvent.objects.bulk_create([
+            OrderStatusEvent(order=order, old_status=old_status, new_status=new_status, source=source, created_at=now)
+            for order, old_status, _ in changes
+        ], batch_size=BULK_BATCH_SIZE)
+        apply_rollup_deltas(rollup_deltas(changes))
+
+        def publish():
+            for order, _, _ in changes:
+                broadcaster.publish(str(order.pk), new_status, now)
+        transaction.on_commit(publish)
+
+    return [results[pk] for pk in order_ids]
@@ -0,0 +1,132 @@
+"""
+Type-ahead product name suggestions from an in-memory prefix index.
+
+Each worker keeps a sorted array of normalized keys (casefolded, accents
+stripped) and answers a prefix with two bisects, so no keystroke reaches the
+database. Names are indexed whole and at every word start: "Paleta de Mango"
+is found by "pal", "man" and "de m". Matches on the start of the name rank
+first.
+
+The index is built lazily from ``values_list('id', 'name')`` and rebuilt when
+the catalog version (api/cache.py) changes.
+"""
+import logging
+import sys
+import threading
+import unicodedata
+from bisect import bisect_left
+
+from .cache import get_catalog_version
+from .models import Product
+
+logger = logging.getLogger(__name__)
+
+# Sorts after every character a normalized key can contain
+KEY_END = '\U0010ffff'
+
+# Keys are truncated to this many characters to keep the index small; longer
+# prefixes are checked against the full name
+KEY_LENGTH = 20
+
+DEFAULT_LIMIT = 10
+MAX_LIMIT = 50
+
+
+def normalize(text):
+    """
+    Casefold and strip accents, so "limon" matches "Limón"
+    """
+    decomposed = unicodedata.normalize('NFKD', text.casefold())
+    return ''.join(char for char in decomposed if not unicodedata.combining(char))
+
+
+class PrefixIndex:
+    """
+    Sorted keys with parallel arrays of product positions, one array for
+    whole names and one for word starts
+    """
+
+    def __init__(self, rows, version=None):
+        self.version = version
+        self.ids = []
+        self.names = []
+        name_entries = []
+        word_entries = []
+        for position, (pk, name) in enumerate(rows):
+            self.ids.append(str(pk))
+            self.names.append(name)
+            key = normalize(name)
+            name_entries.append((key[:KEY_LENGTH], position))
+            start = 0
+            for word in key.split()[1:]:
+                start = key.index(word, start + 1)
+                word_entries.append((key[start:start + KEY_LENGTH], position))
+        name_entries.sort()
+        word_entries.sort()
+        self.name_keys = [key for key, _ in name_entries]
+        self.name_positions = [position for _, position in name_entries]
+        self.word_keys = [key for key, _ in word_entries]
+        self.word_positions = [position for _, position in word_entries]
+
+    def __len__(self):
+        return len(self.names)
+
+    def suggest(self, prefix, limit=10):
+        """
+        Return up to limit {'id', 'name'} dicts whose name or a word of it starts with prefix
+        """
+        prefix = normalize(prefix).strip()
+        if not prefix or limit <= 0:
+            return []
+        key = prefix[:KEY_LENGTH]
+        seen = set()
+        results = []
+        for keys, positions in ((self.name_keys, self.name_positions), (self.word_keys, self.word_positions)):
+            start = bisect_left(keys, key)
+            end = bisect_left(keys, key + KEY_END, start)
+            for i in range(start, end):
+                position = positions[i]
+                if position in seen:
+                    continue
+                seen.add(position)
+                if key != prefix and prefix not in normalize(self.names[position]):
+                    continue
+                results.append({'id': self.ids[position], 'name': self.names[position]})
+                if len(results) == limit:
+                    return results
+        return results
+
+    def memory_footprint(self):
+        """
+        Approximate bytes held by the index (arrays plus the strings they own)
+        """
+        lists = (self.ids, self.names, self.name_keys, self.name_positions, self.word_keys, self.word_positions)
+        size = sum(sys.getsizeof(values) for values in lists)
+        # Both position arrays share the same int objects, so count them once
+        for values in (self.ids, self.names, self.name_keys, self.word_keys, self.name_positions):
+            size += sum(sys.getsizeof(value) for value in values)
+        return size
+
+
+_index = None
+_lock = threading.Lock()
+
+
+def get_prefix_index():
+    """
+    Return this worker's index, rebuilding it if the catalog changed since it was built
+    """
+    global _index
+    version = get_catalog_version()
+    index = _index
+    if index is not None and index.version == version:
+        return index
+    with _lock:
+        if _index is None or _index.version != version:
+            rows = Product.objects.order_by().values_list('id', 'name').iterator(chunk_size=5000)
+            _index = PrefixIndex(rows, version)
+            logger.info(
+                "Built product suggest index: %d products, %d word keys, %.1f KiB",
+                len(_index), len(_index.word_keys), _index.memory_footprint() / 1024
+            )
+        return _index
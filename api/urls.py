@@ -1,14 +1,18 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from .views import (
-    LoginView, ProductViewSet, OrderViewSet, 
-    StripeWebhookView, OrderSuccessView, OrderCancelView, CORSTestView
+    LoginView, CategoryViewSet, ProductViewSet, OrderViewSet, CustomerViewSet, LabelBatchViewSet, ReportViewSet,
+    StripeWebhookView, OrderSuccessView, OrderCancelView, OrderEventsView, CORSTestView
 )
 
 # Create router for ViewSets
 router = DefaultRouter()
+router.register(r'categories', CategoryViewSet)
 router.register(r'products', ProductViewSet)
 router.register(r'orders', OrderViewSet)
+router.register(r'customers', CustomerViewSet)
+router.register(r'label-batches', LabelBatchViewSet)
+router.register(r'reports', ReportViewSet, basename='report')
 
 urlpatterns = [
     # Authentication
@@ -20,6 +24,7 @@ urlpatterns = [
     # Order success/cancel pages (must come before router to avoid conflicts)
     path('orders/<uuid:order_id>/success/', OrderSuccessView.as_view(), name='order-success'),
     path('orders/<uuid:order_id>/cancel/', OrderCancelView.as_view(), name='order-cancel'),
+    path('orders/<uuid:order_id>/events/', OrderEventsView.as_view(), name='order-events'),
     
     # Stripe webhook
     path('stripe/webhook/', StripeWebhookView.as_view(), name='stripe-webhook'),
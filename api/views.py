@@ -1,30 +1,51 @@
+import asyncio
+import io
+import json
 import stripe
 from django.conf import settings
-from django.http import JsonResponse, HttpResponse
+from django.db import transaction
+from django.http import JsonResponse, HttpResponse, StreamingHttpResponse
+from django.views import View
 from django.views.decorators.csrf import csrf_exempt
+from django.utils import timezone
 from django.utils.decorators import method_decorator
 from rest_framework import status, viewsets, permissions
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework_simplejwt.tokens import RefreshToken
-from rest_framework.pagination import PageNumberPagination
-from .models import Product, Order
-from .serializers import ProductSerializer, ProductCreateUpdateSerializer, OrderSerializer, OrderCreateSerializer
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+from rest_framework.versioning import QueryParameterVersioning
+from rest_framework.generics import get_object_or_404
+from .models import Category, Product, Customer, Order, LabelBatch, normalize_email
+from .serializers import (
+    CategorySerializer, ProductSerializer, ProductCreateUpdateSerializer, ProductBulkItemSerializer,
+    OrderSerializer, OrderListSerializer, OrderSnapshotListSerializer, OrderCreateSerializer, CartCheckoutSerializer, OrderIdListSerializer,
+    OrderBulkStatusSerializer, LabelBatchSerializer, CustomerSerializer
+)
 from .permissions import IsAuthenticatedOrReadOnly, IsAdminUser
+from .events import broadcaster
+from .cache import cached_catalog_response
+from .conditional import conditional_response, make_etag, queryset_validators
+from .fast_serializers import FastOrderSerializer
+from .filters import ProductSearchFilter, ProductFilter, ProductOrderingFilter
+from .bulk import MAX_ITEMS as BULK_MAX_ITEMS, apply_product_bulk, existing_product_ids
+from .imports import MAX_REPORTED_REJECTS, ProductImporter, detect_format, read_rows
+from .changes import DEFAULT_LIMIT as CHANGES_DEFAULT_LIMIT, MAX_LIMIT as CHANGES_MAX_LIMIT, get_changes
+from .fragments import render_product_envelope, render_product_fragments, render_product_list, render_product_page
+from .renderers import CSVRenderer, JSONRenderer, NDJSONRenderer, PDFRenderer, RenderedJSON
+from .exports import EXPORT_FORMATS, ExportFilterError, export_orders, export_queryset, streaming_content
+from .inventory import reduce_order_stock
+from .cart import build_order, order_lines, place_order, stripe_line_items
+from .suggest import DEFAULT_LIMIT, MAX_LIMIT, get_prefix_index
+from .state_machine import (
+    BULK_MAX_ORDERS, FINAL_STATUSES, bulk_transition, can_transition, transition, transition_error, try_transition
+)
+from .reports import sales_report
+from .forecast import get_restock_report
 
 
-def reduce_product_stock(product, quantity=1):
-    """
-    Reduce product stock by the specified quantity
-    Returns True if successful, False if insufficient stock
-    """
-    if product.stock >= quantity:
-        product.stock -= quantity
-        product.save()
-        return True
-    return False
-
 # Configure Stripe
 stripe.api_key = settings.STRIPE_SECRET_KEY
 
@@ -39,6 +60,29 @@ class OrderPagination(PageNumberPagination):
     page_query_param = 'page'  # Page number parameter
 
 
+class CustomerOrderPagination(CursorPagination):
+    """
+    Keyset pages of a customer's orders, newest first, on the (customer, created_at) index
+    """
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    ordering = '-created_at'
+
+
+class OrderListVersioning(QueryParameterVersioning):
+    """
+    Order lists default to version 1, each order with its current product.
+    ?version=2 nests the order's product snapshot instead, so the list is read
+    from the orders table alone.
+    """
+    default_version = '1'
+    allowed_versions = ('1', '2')
+
+
+ORDER_LIST_SERIALIZERS = {'1': OrderListSerializer, '2': OrderSnapshotListSerializer}
+
+
 class LoginView(APIView):
     """
     Hardcoded authentication view that returns JWT tokens
@@ -83,12 +127,13 @@ class ProductViewSet(viewsets.ModelViewSet):
     """
     queryset = Product.objects.all()
     serializer_class = ProductSerializer
+    filter_backends = [ProductSearchFilter, ProductFilter, ProductOrderingFilter]
     
     def get_permissions(self):
         """
         Instantiates and returns the list of permissions that this view requires.
         """
-        if self.action in ['create', 'update', 'partial_update', 'destroy']:
+        if self.action in ['create', 'update', 'partial_update', 'destroy', 'bulk', 'import_products']:
             return [IsAdminUser()]
         # Allow public access for read operations (list and retrieve)
         return []  # No permissions required for read operations
@@ -101,24 +146,161 @@ class ProductViewSet(viewsets.ModelViewSet):
             return ProductCreateUpdateSerializer
         return ProductSerializer
     
+    def perform_destroy(self, instance):
+        """
+        Soft delete, so the product's orders and sales history stay intact
+        """
+        instance.soft_delete()
+    
     def list(self, request, *args, **kwargs):
         """
-        Public endpoint to list all products
+        Public endpoint to list all products (cached until the catalog changes)
         """
         queryset = self.filter_queryset(self.get_queryset())
-        page = self.paginate_queryset(queryset)
-        if page is not None:
-            serializer = self.get_serializer(page, many=True)
-            return self.get_paginated_response(serializer.data)
+        validators = cached_catalog_response(
+            request,
+            lambda: queryset_validators(queryset, request.get_full_path(), request.accepted_renderer.format),
+            suffix=':validators'
+        )
         
-        serializer = self.get_serializer(queryset, many=True)
-        return Response(serializer.data)
+        def build():
+            # Assembled from per-product JSON fragments, see api/fragments.py
+            keys = queryset.only('id', 'updated_at')
+            page = self.paginate_queryset(keys)
+            if page is not None:
+                return render_product_page(self.paginator, page)
+            return render_product_list(keys)
+        
+        return conditional_response(
+            request, validators, lambda: Response(cached_catalog_response(request, build))
+        )
     
     def retrieve(self, request, *args, **kwargs):
         """
-        Public endpoint to retrieve a specific product
+        Public endpoint to retrieve a specific product (cached until the catalog changes)
+        """
+        def get_validators():
+            updated_at = get_object_or_404(
+                self.get_queryset().values_list('updated_at', flat=True), pk=kwargs['pk']
+            )
+            return make_etag(kwargs['pk'], updated_at, request.accepted_renderer.format), updated_at
+        
+        def build():
+            return RenderedJSON(render_product_fragments([self.get_object()])[0])
+        
+        validators = cached_catalog_response(request, get_validators, suffix=':validators')
+        return conditional_response(
+            request, validators, lambda: Response(cached_catalog_response(request, build))
+        )
+    
+    @action(detail=False, methods=['get'])
+    def suggest(self, request):
+        """
+        Public type-ahead endpoint: product names starting with ?prefix=
+        Served from this worker's in-memory prefix index, see api/suggest.py
+        """
+        prefix = request.query_params.get('prefix', '')
+        try:
+            limit = min(int(request.query_params.get('limit', DEFAULT_LIMIT)), MAX_LIMIT)
+        except ValueError:
+            raise ValidationError({'limit': ['A valid integer is required.']})
+        return Response(get_prefix_index().suggest(prefix, limit))
+    
+    @action(detail=False, methods=['post'])
+    def bulk(self, request):
+        """
+        Admin endpoint to upsert and delete many products in one transaction
+        Body: a list of {"action": "upsert"|"delete", "id": ..., <product fields>}
         """
-        return super().retrieve(request, *args, **kwargs)
+        if not isinstance(request.data, list):
+            return Response({'error': 'Expected a list of items'}, status=status.HTTP_400_BAD_REQUEST)
+        if len(request.data) > BULK_MAX_ITEMS:
+            return Response(
+                {'error': f'At most {BULK_MAX_ITEMS} items per request'}, status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        existing_ids, deleted_ids = existing_product_ids(request.data)
+        serializer = ProductBulkItemSerializer(
+            data=request.data, many=True, allow_empty=False,
+            context={'existing_ids': existing_ids, 'deleted_ids': deleted_ids}
+        )
+        if not serializer.is_valid():
+            # Nothing is written unless every item is valid
+            return Response({'errors': serializer.errors}, status=status.HTTP_400_BAD_REQUEST)
+        
+        results = apply_product_bulk(serializer.validated_data)
+        print(f"📦 Bulk product update: {len(results)} items")
+        return Response({'results': results})
+    
+    @action(detail=False, methods=['post'], url_path='import')
+    def import_products(self, request):
+        """
+        Admin endpoint to import a CSV or NDJSON catalog uploaded as "file"
+        The upload is streamed row by row; see api/imports.py
+        """
+        upload = request.FILES.get('file')
+        if upload is None:
+            return Response({'error': 'Upload the catalog as "file"'}, status=status.HTTP_400_BAD_REQUEST)
+        file_format = detect_format(upload.name)
+        if file_format is None:
+            return Response(
+                {'error': 'File must be .csv, .ndjson or .jsonl'}, status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        rejects = []
+        
+        def reject(number, row, errors):
+            if len(rejects) < MAX_REPORTED_REJECTS:
+                rejects.append({'line': number, 'errors': errors})
+        
+        # Pictures must be data URIs here: no base_dir, so no server paths are read.
+        # Parsed in this process: a pool per request would start fresh interpreters on
+        # every upload and multiply with concurrent ones. Large catalogs go through
+        # manage.py import_products, which uses PRODUCT_IMPORT_WORKERS processes.
+        text_file = io.TextIOWrapper(upload.file, encoding='utf-8-sig', newline='')
+        stats = ProductImporter(reject=reject, workers=1).run(read_rows(text_file, file_format))
+        print(f"📥 Product import: {stats.as_dict()}")
+        return Response({**stats.as_dict(), 'rejects': rejects})
+    
+    @action(detail=False, methods=['get'])
+    def changes(self, request):
+        """
+        Public delta sync endpoint: products changed and deleted since ?since=<cursor>
+        Start without a cursor, then pass back the returned cursor until has_more is false
+        """
+        try:
+            limit = min(int(request.query_params.get('limit', CHANGES_DEFAULT_LIMIT)), CHANGES_MAX_LIMIT)
+        except ValueError:
+            raise ValidationError({'limit': ['A valid integer is required.']})
+        if limit < 1:
+            raise ValidationError({'limit': ['Must be at least 1.']})
+        
+        products, deleted, cursor, has_more = get_changes(request.query_params.get('since'), limit)
+        return Response(render_product_envelope({
+            'products': [],
+            'deleted': deleted,
+            'cursor': cursor,
+            'has_more': has_more,
+        }, 'products', products))
+
+
+class CategoryViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    Public read-only category facets
+    Counts are maintained on product writes, so listing never scans the products table
+    """
+    queryset = Category.objects.filter(product_count__gt=0)
+    serializer_class = CategorySerializer
+    pagination_class = None
+    permission_classes = [permissions.AllowAny]
+    
+    def list(self, request, *args, **kwargs):
+        """
+        Public endpoint to list categories with products (cached until the catalog changes)
+        """
+        return Response(cached_catalog_response(
+            request, lambda: self.get_serializer(self.get_queryset(), many=True).data
+        ))
 
 
 class OrderViewSet(viewsets.ModelViewSet):
@@ -128,18 +310,23 @@ class OrderViewSet(viewsets.ModelViewSet):
     queryset = Order.objects.all()
     serializer_class = OrderSerializer
     pagination_class = OrderPagination
+    versioning_class = OrderListVersioning
     
     def get_permissions(self):
         """
         Allow public access for order creation and retrieval, require auth for other operations
         """
-        if self.action in ['create', 'retrieve']:
+        if self.action in ['create', 'cart', 'retrieve']:
             return [permissions.AllowAny()]
+        if self.action == 'export':
+            return [IsAdminUser()]
         return [permissions.IsAuthenticated()]
     
     def get_serializer_class(self):
         if self.action == 'create':
             return OrderCreateSerializer
+        if self.action == 'list':
+            return ORDER_LIST_SERIALIZERS[self.request.version]
         return OrderSerializer
     
     def create(self, request, *args, **kwargs):
@@ -150,78 +337,127 @@ class OrderViewSet(viewsets.ModelViewSet):
         serializer.is_valid(raise_exception=True)
         
         # Get the product
-        product = Product.objects.get(id=serializer.validated_data['product_id'])
+        data = serializer.validated_data.copy()
+        product = Product.objects.get(id=data.pop('product_id'))
+        data.pop('total_pesos', None)
+        data.pop('currency', None)
         
         # Create order with pending status first
-        order_data = serializer.validated_data.copy()
-        order = Order.objects.create(**order_data)
+        order, items = build_order([(product, 1)], data)
+        place_order(order, items)
+        return self.start_checkout(order, items)
+    
+    @action(detail=False, methods=['post'])
+    def cart(self, request):
+        """
+        Create one order for several products and quantities with a single Stripe checkout:
+        {"items": [{"product_id": "...", "quantity": 2}, ...], "client_name": ..., "client_email": ...}
+        Stock for every item is reduced together once the payment succeeds.
+        """
+        serializer = CartCheckoutSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
         
-        # Create Stripe checkout session
+        data = serializer.validated_data.copy()
+        order, items = build_order(data.pop('products'), data)
+        place_order(order, items)
+        print(f"🛒 Cart order {order.id}: {len(items)} products, {sum(item.quantity for item in items)} units")
+        return self.start_checkout(order, items)
+    
+    def start_checkout(self, order, items):
+        """
+        Create the Stripe checkout session for a placed order, one line item per order item
+        """
         try:
-            # Convert pesos to cents for Stripe (Stripe requires amounts in cents)
-            price_cents = int(float(product.price_pesos) * 100)
-            
             checkout_session = stripe.checkout.Session.create(
                 payment_method_types=['card'],
-                line_items=[{
-                    'price_data': {
-                        'currency': serializer.validated_data['currency'].lower(),
-                        'product_data': {
-                            'name': product.name,
-                        },
-                        'unit_amount': price_cents,
-                    },
-                    'quantity': 1,
-                }],
+                line_items=stripe_line_items(items, order.currency),
                 mode='payment',
                 success_url=f'{settings.FRONTEND_URL}?order_id={order.id}&status=success',
                 cancel_url=f'{settings.FRONTEND_URL}?order_id={order.id}&status=cancel',
                 metadata={
                     'order_id': str(order.id),
-                    'product_id': str(product.id),
-                    'client_name': serializer.validated_data['client_name'],
-                    'client_email': serializer.validated_data['client_email'],
+                    'product_id': str(order.product_id),
+                    'item_count': str(len(items)),
+                    'client_name': order.client_name,
+                    'client_email': order.client_email,
                 }
             )
             
             # Update order with Stripe session ID
             order.stripe_session_id = checkout_session.id
-            order.save()
+            order.save(update_fields=['stripe_session_id', 'updated_at'])
             
             return Response({
                 'order_id': str(order.id),
                 'checkout_url': checkout_session.url,
                 'session_id': checkout_session.id,
-                'status': order.status
+                'status': order.status,
+                'total_pesos': str(order.total_pesos),
+                'currency': order.currency
             }, status=status.HTTP_201_CREATED)
             
         except stripe.error.StripeError as e:
             # If Stripe fails, mark order as failed
-            order.status = 'failed'
-            order.save()
+            try_transition(order, 'failed', 'checkout')
             return Response(
                 {'error': str(e)}, 
                 status=status.HTTP_400_BAD_REQUEST
             )
     
+    @action(
+        detail=False, methods=['get'], renderer_classes=[CSVRenderer, NDJSONRenderer]
+    )
+    def export(self, request):
+        """
+        Stream every order matching ?from=&to=&status= as CSV or NDJSON (?format=csv|ndjson)
+        Rows are read in keyset pages, so memory stays flat for any table size
+        """
+        export_format = request.accepted_renderer.format
+        statuses = [value for value in request.query_params.get('status', '').split(',') if value]
+        try:
+            queryset = export_queryset(
+                request.query_params.get('from'), request.query_params.get('to'), statuses
+            )
+        except ExportFilterError as e:
+            raise ValidationError({e.field: [e.message]})
+        
+        filename = f"orders-{timezone.now():%Y%m%d-%H%M%S}.{export_format}"
+        response = StreamingHttpResponse(
+            streaming_content(request._request, export_orders(queryset, export_format)),
+            content_type=EXPORT_FORMATS[export_format]
+        )
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        response['Cache-Control'] = 'no-cache'
+        print(f"📤 Order export started: {export_format}, filters {dict(request.query_params)}")
+        return response
+    
     def list(self, request, *args, **kwargs):
         """
         Get all orders (requires authentication)
         """
-        queryset = self.filter_queryset(self.get_queryset())
+        # Same output as the list serializer, built straight from values_list() rows
+        serializer = FastOrderSerializer(self.get_serializer_class())
+        queryset = self.filter_queryset(self.get_queryset()).values_list(*serializer.columns)
         page = self.paginate_queryset(queryset)
         if page is not None:
-            serializer = self.get_serializer(page, many=True)
-            return self.get_paginated_response(serializer.data)
+            return self.get_paginated_response(serializer.serialize(page))
         
-        serializer = self.get_serializer(queryset, many=True)
-        return Response(serializer.data)
+        return Response(serializer.serialize(queryset))
     
     def retrieve(self, request, *args, **kwargs):
         """
         Get order by ID (public access - customers can view their orders)
         """
-        return super().retrieve(request, *args, **kwargs)
+        order_updated_at, product_updated_at = get_object_or_404(
+            Order.objects.values_list('updated_at', 'product__updated_at'), pk=kwargs['pk']
+        )
+        validators = (
+            make_etag(kwargs['pk'], order_updated_at, product_updated_at, request.accepted_renderer.format),
+            max(order_updated_at, product_updated_at)
+        )
+        return conditional_response(
+            request, validators, lambda: super(OrderViewSet, self).retrieve(request, *args, **kwargs)
+        )
     
     def partial_update(self, request, *args, **kwargs):
         """
@@ -232,45 +468,23 @@ class OrderViewSet(viewsets.ModelViewSet):
             new_status = request.data.get('status')
             
             if new_status:
-                # Validate status
-                valid_statuses = [choice[0] for choice in Order.STATUS_CHOICES]
-                if new_status not in valid_statuses:
-                    return Response({
-                        'error': f'Invalid status. Valid statuses are: {", ".join(valid_statuses)}'
-                    }, status=status.HTTP_400_BAD_REQUEST)
-                
-                # Check status transition rules
-                current_status = order.status
-                if current_status == 'pending' and new_status not in ['success', 'failed', 'cancelled']:
-                    return Response({
-                        'error': f'Cannot change status from "{current_status}" to "{new_status}". Pending orders can only be changed to success, failed, or cancelled.'
-                    }, status=status.HTTP_400_BAD_REQUEST)
-                
-                if current_status == 'success' and new_status not in ['sent', 'shipped', 'delivered']:
-                    return Response({
-                        'error': f'Cannot change status from "{current_status}" to "{new_status}". Success orders can only be changed to sent, shipped, or delivered.'
-                    }, status=status.HTTP_400_BAD_REQUEST)
-                
-                if current_status == 'sent' and new_status not in ['shipped', 'delivered']:
-                    return Response({
-                        'error': f'Cannot change status from "{current_status}" to "{new_status}". Sent orders can only be changed to shipped or delivered.'
-                    }, status=status.HTTP_400_BAD_REQUEST)
-                
-                if current_status == 'shipped' and new_status != 'delivered':
-                    return Response({
-                        'error': f'Cannot change status from "{current_status}" to "{new_status}". Shipped orders can only be changed to delivered.'
-                    }, status=status.HTTP_400_BAD_REQUEST)
-                
-                if current_status in ['failed', 'cancelled', 'delivered']:
-                    return Response({
-                        'error': f'Cannot change status from "{current_status}". This status is final.'
-                    }, status=status.HTTP_400_BAD_REQUEST)
+                # Check status transition rules, see api/state_machine.py
+                error = transition_error(order.status, new_status)
+                if error:
+                    return Response({'error': error}, status=status.HTTP_400_BAD_REQUEST)
             
             # Update the order
             old_status = order.status
             serializer = self.get_serializer(order, data=request.data, partial=True)
             serializer.is_valid(raise_exception=True)
-            serializer.save()
+            with transaction.atomic():
+                # Status first, so the row save below can't overwrite a concurrent change
+                if new_status and not transition(order, new_status, 'api'):
+                    return Response({
+                        'error': f'Order status changed concurrently. Current status: {order.status}'
+                    }, status=status.HTTP_409_CONFLICT)
+                order._status_source = 'api'
+                serializer.save()
             
             return Response({
                 'order_id': str(order.id),
@@ -293,13 +507,19 @@ class OrderViewSet(viewsets.ModelViewSet):
         Get order status
         """
         try:
-            order = self.get_object()
-            return Response({
-                'order_id': str(order.id),
-                'status': order.status,
-                'created_at': order.created_at,
-                'updated_at': order.updated_at
-            })
+            updated_at = get_object_or_404(Order.objects.values_list('updated_at', flat=True), pk=pk)
+            validators = (make_etag(pk, updated_at, request.accepted_renderer.format), updated_at)
+            
+            def build():
+                order = self.get_object()
+                return Response({
+                    'order_id': str(order.id),
+                    'status': order.status,
+                    'created_at': order.created_at,
+                    'updated_at': order.updated_at
+                })
+            
+            return conditional_response(request, validators, build)
         except Order.DoesNotExist:
             return Response(
                 {'error': 'Order not found'}, 
@@ -325,23 +545,19 @@ class OrderViewSet(viewsets.ModelViewSet):
                 
                 # Update order status based on Stripe session status
                 if session.payment_status == 'paid':
-                    # Only update if not already success to avoid duplicate stock reduction
-                    if order.status != 'success':
-                        order.status = 'success'
-                        order.save()
-                        
-                        # Reduce product stock
-                        product = order.product
-                        if reduce_product_stock(product, 1):
-                            print(f"Order {order.id} marked as success - stock reduced for product {product.name} (new stock: {product.stock})")
+                    # Only the call that moves the order to success reduces stock, so duplicates are skipped
+                    if try_transition(order, 'success', 'stripe_check'):
+                        # Reduce stock for every item, all or nothing
+                        short = reduce_order_stock(order)
+                        if not short:
+                            print(f"Order {order.id} marked as success - stock reduced for {len(order_lines(order))} item(s)")
                         else:
-                            print(f"Warning: Order {order.id} completed but product {product.name} has no stock left")
+                            print(f"Warning: Order {order.id} completed but {', '.join(short)} has no stock left")
                     
                     message = f"Order status updated to success - payment completed"
                 elif session.payment_status == 'unpaid':
                     if session.status == 'expired':
-                        order.status = 'failed'
-                        order.save()
+                        try_transition(order, 'failed', 'stripe_check')
                         message = f"Order status updated to failed - session expired"
                     else:
                         message = f"Order still pending - payment status: {session.payment_status}, session status: {session.status}"
@@ -377,14 +593,16 @@ class OrderViewSet(viewsets.ModelViewSet):
             order = self.get_object()
             
             # Check if order is in a valid state to be marked as sent
-            if order.status not in ['success']:
+            if not can_transition(order.status, 'sent'):
                 return Response({
                     'error': f'Order must be in "success" status to be marked as sent. Current status: {order.status}'
                 }, status=status.HTTP_400_BAD_REQUEST)
             
-            # Update order status to sent
-            order.status = 'sent'
-            order.save()
+            # Update order status to sent, unless it changed since it was read
+            if not transition(order, 'sent', 'api'):
+                return Response({
+                    'error': f'Order status changed concurrently. Current status: {order.status}'
+                }, status=status.HTTP_409_CONFLICT)
             
             return Response({
                 'order_id': str(order.id),
@@ -399,6 +617,48 @@ class OrderViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_404_NOT_FOUND
             )
 
+    @action(detail=False, methods=['post'])
+    def bulk_status(self, request):
+        """
+        Move many orders to one status: {"order_ids": [...], "status": "sent"}
+        Returns a result per order: updated, unchanged, invalid, conflict or not_found
+        """
+        serializer = OrderBulkStatusSerializer(data=request.data, context={'max_orders': BULK_MAX_ORDERS})
+        serializer.is_valid(raise_exception=True)
+        new_status = serializer.validated_data['status']
+        
+        results = bulk_transition(serializer.validated_data['order_ids'], new_status, 'api')
+        updated = sum(1 for result in results if result['result'] == 'updated')
+        print(f"📦 Bulk status update to {new_status}: {updated} of {len(results)} orders updated")
+        return Response({
+            'status': new_status,
+            'updated': updated,
+            'results': results
+        })
+    
+    @action(detail=False, methods=['post'])
+    def labels(self, request):
+        """
+        Queue shipping labels and packing slips for {"order_ids": [...]} as one PDF.
+        Rendering happens in the process_label_batches worker, never in the request;
+        poll the returned batch until its download_url is set.
+        """
+        serializer = OrderIdListSerializer(data=request.data, context={'max_orders': settings.LABEL_MAX_ORDERS})
+        serializer.is_valid(raise_exception=True)
+        order_ids = serializer.validated_data['order_ids']
+        
+        found = set(Order.objects.filter(pk__in=order_ids).values_list('pk', flat=True))
+        missing = [str(pk) for pk in order_ids if pk not in found]
+        if missing:
+            raise ValidationError({'order_ids': [f"Orders not found: {', '.join(missing[:20])}"]})
+        
+        batch = LabelBatch.objects.create(order_ids=[str(pk) for pk in order_ids])
+        print(f"🏷️ Queued label batch {batch.id} for {len(order_ids)} orders")
+        return Response(
+            LabelBatchSerializer(batch, context={'request': request}).data,
+            status=status.HTTP_202_ACCEPTED
+        )
+    
     @action(detail=True, methods=['patch', 'put'])
     def update_status(self, request, pk=None):
         """
@@ -413,44 +673,17 @@ class OrderViewSet(viewsets.ModelViewSet):
                     'error': 'Status field is required'
                 }, status=status.HTTP_400_BAD_REQUEST)
             
-            # Validate status
-            valid_statuses = [choice[0] for choice in Order.STATUS_CHOICES]
-            if new_status not in valid_statuses:
-                return Response({
-                    'error': f'Invalid status. Valid statuses are: {", ".join(valid_statuses)}'
-                }, status=status.HTTP_400_BAD_REQUEST)
+            # Check status transition rules, see api/state_machine.py
+            error = transition_error(order.status, new_status)
+            if error:
+                return Response({'error': error}, status=status.HTTP_400_BAD_REQUEST)
             
-            # Check status transition rules
-            current_status = order.status
-            if current_status == 'pending' and new_status not in ['success', 'failed', 'cancelled']:
-                return Response({
-                    'error': f'Cannot change status from "{current_status}" to "{new_status}". Pending orders can only be changed to success, failed, or cancelled.'
-                }, status=status.HTTP_400_BAD_REQUEST)
-            
-            if current_status == 'success' and new_status not in ['sent', 'shipped', 'delivered']:
-                return Response({
-                    'error': f'Cannot change status from "{current_status}" to "{new_status}". Success orders can only be changed to sent, shipped, or delivered.'
-                }, status=status.HTTP_400_BAD_REQUEST)
-            
-            if current_status == 'sent' and new_status not in ['shipped', 'delivered']:
-                return Response({
-                    'error': f'Cannot change status from "{current_status}" to "{new_status}". Sent orders can only be changed to shipped or delivered.'
-                }, status=status.HTTP_400_BAD_REQUEST)
-            
-            if current_status == 'shipped' and new_status != 'delivered':
-                return Response({
-                    'error': f'Cannot change status from "{current_status}" to "{new_status}". Shipped orders can only be changed to delivered.'
-                }, status=status.HTTP_400_BAD_REQUEST)
-            
-            if current_status in ['failed', 'cancelled', 'delivered']:
-                return Response({
-                    'error': f'Cannot change status from "{current_status}". This status is final.'
-                }, status=status.HTTP_400_BAD_REQUEST)
-            
-            # Update order status
+            # Update order status, unless it changed since it was read
             old_status = order.status
-            order.status = new_status
-            order.save()
+            if not transition(order, new_status, 'api'):
+                return Response({
+                    'error': f'Order status changed concurrently. Current status: {order.status}'
+                }, status=status.HTTP_409_CONFLICT)
             
             return Response({
                 'order_id': str(order.id),
@@ -467,6 +700,117 @@ class OrderViewSet(viewsets.ModelViewSet):
             )
 
 
+class CustomerViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    Customers keyed by normalized email, with their orders
+    """
+    queryset = Customer.objects.all()
+    serializer_class = CustomerSerializer
+    pagination_class = OrderPagination
+    permission_classes = [permissions.IsAuthenticated]
+    versioning_class = OrderListVersioning
+    
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        email = self.request.query_params.get('email')
+        if email:
+            # Exact match on the unique email index
+            queryset = queryset.filter(email=normalize_email(email))
+        return queryset
+    
+    @action(detail=True, methods=['get'])
+    def orders(self, request, pk=None):
+        """
+        The customer's orders, newest first, in order list format (?version= as for /api/orders/)
+        Keyset paginated: follow the next/previous links (?cursor=), optionally with ?page_size=
+        """
+        customer = get_object_or_404(Customer.objects.only('pk'), pk=pk)
+        serializer = FastOrderSerializer(ORDER_LIST_SERIALIZERS[request.version])
+        paginator = CustomerOrderPagination()
+        rows = paginator.paginate_queryset(
+            Order.objects.filter(customer=customer).values(*serializer.columns), request, view=self
+        )
+        return paginator.get_paginated_response(
+            serializer.serialize(tuple(row[column] for column in serializer.columns) for row in rows)
+        )
+
+
+class LabelBatchViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    Label batch status and the rendered PDF
+    """
+    queryset = LabelBatch.objects.defer('document')
+    serializer_class = LabelBatchSerializer
+    pagination_class = OrderPagination
+    permission_classes = [permissions.IsAuthenticated]
+    
+    @action(detail=True, methods=['get'], renderer_classes=[JSONRenderer, PDFRenderer])
+    def download(self, request, pk=None):
+        """
+        The merged labels and packing slips, once the batch is done
+        """
+        batch = get_object_or_404(LabelBatch, pk=pk)
+        if batch.status != 'done':
+            return Response({
+                'error': f'Label batch is {batch.status}',
+                'status': batch.status
+            }, status=status.HTTP_409_CONFLICT)
+        
+        response = HttpResponse(bytes(batch.document), content_type='application/pdf')
+        response['Content-Disposition'] = f'attachment; filename="labels-{batch.id}.pdf"'
+        return response
+
+
+class ReportViewSet(viewsets.ViewSet):
+    """
+    Admin reports, served from precomputed tables
+    """
+    permission_classes = [IsAdminUser]
+    
+    @action(detail=False, methods=['get'])
+    def sales(self, request):
+        """
+        Orders, units and revenue by status and currency per hour or day (?granularity=hour|day&from=&to=)
+        Add ?by=product to split them by product. Reads only the sales rollups.
+        """
+        try:
+            report = sales_report(
+                request.query_params.get('granularity', 'day'),
+                request.query_params.get('from'),
+                request.query_params.get('to'),
+                by_product=request.query_params.get('by') == 'product'
+            )
+        except ExportFilterError as e:
+            raise ValidationError({e.field: [e.message]})
+        return Response(report)
+    
+    @action(detail=False, methods=['get'])
+    def restock(self, request):
+        """
+        Sales velocity, days of stock and reorder suggestions per product, most urgent first
+        ?needs_restock=true keeps only products at or below their reorder point; ?limit= caps the list.
+        Served from a cached forecast refreshed by manage.py refresh_restock_report.
+        """
+        limit = request.query_params.get('limit')
+        if limit is not None:
+            try:
+                limit = int(limit)
+            except ValueError:
+                raise ValidationError({'limit': ['Must be an integer.']})
+            if limit < 1:
+                raise ValidationError({'limit': ['Must be at least 1.']})
+        
+        report = get_restock_report()
+        products = report['products']
+        if request.query_params.get('needs_restock') in ('true', '1'):
+            products = [product for product in products if product['needs_restock']]
+        return Response({
+            **report,
+            'count': len(products),
+            'products': products[:limit] if limit else products,
+        })
+
+
 @method_decorator(csrf_exempt, name='dispatch')
 class StripeWebhookView(APIView):
     """
@@ -496,84 +840,79 @@ class StripeWebhookView(APIView):
         # Handle checkout session events
         if event['type'] == 'checkout.session.completed':
             session = event['data']['object']
-            self.handle_checkout_session_completed(session)
+            self.handle_checkout_session_completed(session, event['id'])
         elif event['type'] == 'checkout.session.expired':
             session = event['data']['object']
-            self.handle_checkout_session_expired(session)
+            self.handle_checkout_session_expired(session, event['id'])
         elif event['type'] == 'checkout.session.async_payment_succeeded':
             session = event['data']['object']
-            self.handle_checkout_session_completed(session)
+            self.handle_checkout_session_completed(session, event['id'])
         elif event['type'] == 'checkout.session.async_payment_failed':
             session = event['data']['object']
-            self.handle_checkout_session_failed(session)
+            self.handle_checkout_session_failed(session, event['id'])
         # Handle payment intent events as backup
         elif event['type'] == 'payment_intent.succeeded':
             payment_intent = event['data']['object']
-            self.handle_payment_intent_succeeded(payment_intent)
+            self.handle_payment_intent_succeeded(payment_intent, event['id'])
         elif event['type'] == 'payment_intent.payment_failed':
             payment_intent = event['data']['object']
-            self.handle_payment_intent_failed(payment_intent)
+            self.handle_payment_intent_failed(payment_intent, event['id'])
         elif event['type'] == 'payment_intent.canceled':
             payment_intent = event['data']['object']
-            self.handle_payment_intent_canceled(payment_intent)
+            self.handle_payment_intent_canceled(payment_intent, event['id'])
         
         return Response({'status': 'success'})
     
-    def handle_checkout_session_completed(self, session):
+    def handle_checkout_session_completed(self, session, event_id=None):
         """
         Handle successful checkout session completion
         """
         try:
             order = Order.objects.get(stripe_session_id=session.id)
             
-            # Only update if not already success to avoid duplicate stock reduction
-            if order.status != 'success':
-                order.status = 'success'
-                order.save()
-                
-                # Reduce product stock
-                product = order.product
-                if reduce_product_stock(product, 1):
-                    print(f"✅ Webhook: Order {order.id} marked as success - stock reduced for product {product.name} (new stock: {product.stock})")
+            # Only the call that moves the order to success reduces stock, so duplicates are skipped
+            if try_transition(order, 'success', 'webhook', event_id):
+                # Reduce stock for every item, all or nothing
+                short = reduce_order_stock(order)
+                if not short:
+                    print(f"✅ Webhook: Order {order.id} marked as success - stock reduced for {len(order_lines(order))} item(s)")
                 else:
-                    print(f"⚠️  Warning: Order {order.id} completed but product {product.name} has no stock left")
+                    print(f"⚠️  Warning: Order {order.id} completed but {', '.join(short)} has no stock left")
             else:
-                print(f"ℹ️  Order {order.id} already marked as success, skipping duplicate update")
+                print(f"ℹ️  Order {order.id} is already {order.status}, skipping duplicate update")
                 
         except Order.DoesNotExist:
             print(f"❌ Error: Order not found for session {session.id}")
         except Exception as e:
             print(f"❌ Error handling checkout session completed: {e}")
     
-    def handle_checkout_session_expired(self, session):
+    def handle_checkout_session_expired(self, session, event_id=None):
         """
         Handle expired checkout session
         """
         try:
             order = Order.objects.get(stripe_session_id=session.id)
-            order.status = 'failed'
-            order.save()
-            print(f"❌ Webhook: Order {order.id} marked as failed - checkout session expired")
+            if try_transition(order, 'failed', 'webhook', event_id):
+                print(f"❌ Webhook: Order {order.id} marked as failed - checkout session expired")
         except Order.DoesNotExist:
             print(f"❌ Error: Order not found for session {session.id}")
         except Exception as e:
             print(f"❌ Error handling checkout session expired: {e}")
     
-    def handle_checkout_session_failed(self, session):
+    def handle_checkout_session_failed(self, session, event_id=None):
         """
         Handle failed checkout session (async payment failed)
         """
         try:
             order = Order.objects.get(stripe_session_id=session.id)
-            order.status = 'failed'
-            order.save()
-            print(f"❌ Webhook: Order {order.id} marked as failed - async payment failed")
+            if try_transition(order, 'failed', 'webhook', event_id):
+                print(f"❌ Webhook: Order {order.id} marked as failed - async payment failed")
         except Order.DoesNotExist:
             print(f"❌ Error: Order not found for session {session.id}")
         except Exception as e:
             print(f"❌ Error handling checkout session failed: {e}")
     
-    def handle_payment_intent_succeeded(self, payment_intent):
+    def handle_payment_intent_succeeded(self, payment_intent, event_id=None):
         """
         Handle successful payment intent (backup method)
         """
@@ -582,19 +921,16 @@ class StripeWebhookView(APIView):
             if payment_intent.get('metadata', {}).get('order_id'):
                 order = Order.objects.get(id=payment_intent['metadata']['order_id'])
                 
-                # Only update if not already success to avoid duplicate stock reduction
-                if order.status != 'success':
-                    order.status = 'success'
-                    order.save()
-                    
-                    # Reduce product stock
-                    product = order.product
-                    if reduce_product_stock(product, 1):
-                        print(f"✅ Payment Intent: Order {order.id} marked as success - stock reduced for product {product.name} (new stock: {product.stock})")
+                # Only the call that moves the order to success reduces stock, so duplicates are skipped
+                if try_transition(order, 'success', 'webhook', event_id):
+                    # Reduce stock for every item, all or nothing
+                    short = reduce_order_stock(order)
+                    if not short:
+                        print(f"✅ Payment Intent: Order {order.id} marked as success - stock reduced for {len(order_lines(order))} item(s)")
                     else:
-                        print(f"⚠️  Warning: Order {order.id} completed but product {product.name} has no stock left")
+                        print(f"⚠️  Warning: Order {order.id} completed but {', '.join(short)} has no stock left")
                 else:
-                    print(f"ℹ️  Order {order.id} already marked as success, skipping duplicate update")
+                    print(f"ℹ️  Order {order.id} is already {order.status}, skipping duplicate update")
                     
             else:
                 # Try to find by session ID if available
@@ -602,26 +938,23 @@ class StripeWebhookView(APIView):
                 if session_id:
                     order = Order.objects.get(stripe_session_id=session_id)
                     
-                    # Only update if not already success to avoid duplicate stock reduction
-                    if order.status != 'success':
-                        order.status = 'success'
-                        order.save()
-                        
-                        # Reduce product stock
-                        product = order.product
-                        if reduce_product_stock(product, 1):
-                            print(f"✅ Payment Intent: Order {order.id} marked as success - stock reduced for product {product.name} (new stock: {product.stock})")
+                    # Only the call that moves the order to success reduces stock, so duplicates are skipped
+                    if try_transition(order, 'success', 'webhook', event_id):
+                        # Reduce stock for every item, all or nothing
+                        short = reduce_order_stock(order)
+                        if not short:
+                            print(f"✅ Payment Intent: Order {order.id} marked as success - stock reduced for {len(order_lines(order))} item(s)")
                         else:
-                            print(f"⚠️  Warning: Order {order.id} completed but product {product.name} has no stock left")
+                            print(f"⚠️  Warning: Order {order.id} completed but {', '.join(short)} has no stock left")
                     else:
-                        print(f"ℹ️  Order {order.id} already marked as success, skipping duplicate update")
+                        print(f"ℹ️  Order {order.id} is already {order.status}, skipping duplicate update")
                         
         except Order.DoesNotExist:
             print(f"❌ Error: Order not found for payment intent {payment_intent.id}")
         except Exception as e:
             print(f"❌ Error handling payment intent succeeded: {e}")
     
-    def handle_payment_intent_failed(self, payment_intent):
+    def handle_payment_intent_failed(self, payment_intent, event_id=None):
         """
         Handle failed payment intent (backup method)
         """
@@ -629,23 +962,21 @@ class StripeWebhookView(APIView):
             # Try to find order by session ID first
             if payment_intent.get('metadata', {}).get('order_id'):
                 order = Order.objects.get(id=payment_intent['metadata']['order_id'])
-                order.status = 'failed'
-                order.save()
-                print(f"Order {order.id} marked as failed - payment intent failed")
+                if try_transition(order, 'failed', 'webhook', event_id):
+                    print(f"Order {order.id} marked as failed - payment intent failed")
             else:
                 # Try to find by session ID if available
                 session_id = payment_intent.get('metadata', {}).get('session_id')
                 if session_id:
                     order = Order.objects.get(stripe_session_id=session_id)
-                    order.status = 'failed'
-                    order.save()
-                    print(f"Order {order.id} marked as failed - payment intent failed (via session)")
+                    if try_transition(order, 'failed', 'webhook', event_id):
+                        print(f"Order {order.id} marked as failed - payment intent failed (via session)")
         except Order.DoesNotExist:
             print(f"Order not found for payment intent {payment_intent.id}")
         except Exception as e:
             print(f"Error handling payment intent failed: {e}")
     
-    def handle_payment_intent_canceled(self, payment_intent):
+    def handle_payment_intent_canceled(self, payment_intent, event_id=None):
         """
         Handle canceled payment intent (backup method)
         """
@@ -653,17 +984,15 @@ class StripeWebhookView(APIView):
             # Try to find order by session ID first
             if payment_intent.get('metadata', {}).get('order_id'):
                 order = Order.objects.get(id=payment_intent['metadata']['order_id'])
-                order.status = 'failed'
-                order.save()
-                print(f"Order {order.id} marked as failed - payment intent canceled")
+                if try_transition(order, 'failed', 'webhook', event_id):
+                    print(f"Order {order.id} marked as failed - payment intent canceled")
             else:
                 # Try to find by session ID if available
                 session_id = payment_intent.get('metadata', {}).get('session_id')
                 if session_id:
                     order = Order.objects.get(stripe_session_id=session_id)
-                    order.status = 'failed'
-                    order.save()
-                    print(f"Order {order.id} marked as failed - payment intent canceled (via session)")
+                    if try_transition(order, 'failed', 'webhook', event_id):
+                        print(f"Order {order.id} marked as failed - payment intent canceled (via session)")
         except Order.DoesNotExist:
             print(f"Order not found for payment intent {payment_intent.id}")
         except Exception as e:
@@ -686,16 +1015,13 @@ class OrderSuccessView(APIView):
                     session = stripe.checkout.Session.retrieve(order.stripe_session_id)
                     if session.payment_status == 'paid':
                         # Update order status and reduce stock
-                        if order.status != 'success':
-                            order.status = 'success'
-                            order.save()
-                            
-                            # Reduce product stock
-                            product = order.product
-                            if reduce_product_stock(product, 1):
-                                print(f"✅ Success Page: Order {order.id} marked as success - stock reduced for product {product.name} (new stock: {product.stock})")
+                        if try_transition(order, 'success', 'success_page'):
+                            # Reduce stock for every item, all or nothing
+                            short = reduce_order_stock(order)
+                            if not short:
+                                print(f"✅ Success Page: Order {order.id} marked as success - stock reduced for {len(order_lines(order))} item(s)")
                             else:
-                                print(f"⚠️  Warning: Order {order.id} completed but product {product.name} has no stock left")
+                                print(f"⚠️  Warning: Order {order.id} completed but {', '.join(short)} has no stock left")
                 except stripe.error.StripeError as e:
                     print(f"❌ Error checking Stripe session: {e}")
             
@@ -737,9 +1063,7 @@ class OrderCancelView(APIView):
         try:
             order = Order.objects.get(id=order_id)
             # Mark order as failed if cancelled
-            if order.status == 'pending':
-                order.status = 'failed'
-                order.save()
+            try_transition(order, 'failed', 'cancel_page')
             
             # Return JSON response instead of HTML
             return Response({
@@ -768,6 +1092,54 @@ class OrderCancelView(APIView):
             )
 
 
+class OrderEventsView(View):
+    """
+    Stream order status changes as Server-Sent Events (public access).
+    Must be served by the ASGI application so the stream doesn't hold a worker.
+    """
+
+    async def get(self, request, order_id):
+        order = await Order.objects.filter(id=order_id).values('status', 'updated_at').afirst()
+        if order is None:
+            return JsonResponse({'error': 'Order not found'}, status=404)
+
+        response = StreamingHttpResponse(
+            self.stream(str(order_id), order['status'], order['updated_at']),
+            content_type='text/event-stream'
+        )
+        response['Cache-Control'] = 'no-cache'
+        response['X-Accel-Buffering'] = 'no'  # Disable nginx buffering
+        return response
+
+    async def stream(self, order_id, current_status, updated_at):
+        keepalive = getattr(settings, 'ORDER_EVENTS_KEEPALIVE', 15)
+        queue = broadcaster.subscribe(order_id)
+        try:
+            yield 'retry: 3000\n\n'
+            yield self.format_event({
+                'order_id': order_id,
+                'status': current_status,
+                'updated_at': updated_at.isoformat(),
+            })
+            # Close the stream once the order can't change anymore
+            while current_status not in FINAL_STATUSES:
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=keepalive)
+                except asyncio.TimeoutError:
+                    yield ': keepalive\n\n'
+                    continue
+                if event['status'] == current_status:
+                    continue
+                current_status = event['status']
+                yield self.format_event(event)
+        finally:
+            broadcaster.unsubscribe(order_id, queue)
+
+    @staticmethod
+    def format_event(event):
+        return f"event: status\ndata: {json.dumps(event)}\n\n"
+
+
 class CORSTestView(APIView):
     """
     Test endpoint for CORS debugging
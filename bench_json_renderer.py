@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark: DRF's JSON renderer/parser vs the orjson-backed ones in api/
+Uses real ProductSerializer/OrderSerializer output from a throwaway in-memory database
+
+Usage: python bench_json_renderer.py [repeats]
+"""
+
+import os
+import sys
+import time
+import base64
+from io import BytesIO
+
+# Setup Django with an in-memory database
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'sorbo_back.settings')
+from django.conf import settings
+settings.DATABASES['default']['NAME'] = ':memory:'
+
+import django
+django.setup()
+
+from django.core.management import call_command
+from django.utils import timezone
+from rest_framework import parsers, renderers
+
+from api.models import Product, Order
+from api.parsers import JSONParser
+from api.renderers import JSONRenderer, orjson
+from api.serializers import ProductSerializer, OrderSerializer
+
+PICTURE = "data:image/jpeg;base64," + base64.b64encode(os.urandom(30000)).decode()
+
+
+def create_data(products=500, orders=2000):
+    call_command('migrate', verbosity=0)
+    Product.objects.bulk_create([
+        Product(
+            picture=PICTURE,
+            name=f"Producto {i} – edición",
+            description=f"Descripción del producto {i}",
+            stock=i % 50,
+            type=f"type-{i % 20}",
+            price_pesos=f"{100 + i}.50",
+        )
+        for i in range(products)
+    ])
+    product_ids = list(Product.objects.values_list('id', flat=True))
+    Order.objects.bulk_create([
+        Order(
+            product_id=product_ids[i % products],
+            client_name=f"Cliente {i}",
+            client_email=f"cliente{i}@example.com",
+            client_phone="5512345678",
+            client_address=f"Calle {i}, CDMX",
+            total_pesos="150.50",
+        )
+        for i in range(orders)
+    ])
+
+
+def best_of(func, repeats):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return min(timings)
+
+
+def compare(label, stock_func, fast_func, repeats):
+    stock_ms = best_of(stock_func, repeats)
+    fast_ms = best_of(fast_func, repeats)
+    print(f"{label:<32} {stock_ms:>10.2f} {fast_ms:>10.2f} {stock_ms / fast_ms:>8.1f}x")
+
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    create_data()
+
+    payloads = {
+        'ProductSerializer (500)': ProductSerializer(Product.objects.all(), many=True).data,
+        'OrderSerializer (2000)': OrderSerializer(Order.objects.select_related('product'), many=True).data,
+        'status dicts (2000)': [
+            {'order_id': order.id, 'status': order.status, 'total': order.total_pesos,
+             'created_at': order.created_at, 'updated_at': timezone.now()}
+            for order in Order.objects.all()
+        ],
+    }
+
+    stock_renderer = renderers.JSONRenderer()
+    fast_renderer = JSONRenderer()
+
+    print("🚀 JSON renderer/parser benchmark")
+    print(f"orjson available: {orjson is not None}")
+    print("=" * 64)
+    print(f"{'payload':<32} {'DRF (ms)':>10} {'api (ms)':>10} {'speedup':>9}")
+
+    for label, data in payloads.items():
+        assert stock_renderer.render(data) == fast_renderer.render(data), f"Output differs for {label}"
+        compare(f"render {label}", lambda: stock_renderer.render(data), lambda: fast_renderer.render(data), repeats)
+
+    for label, data in payloads.items():
+        body = stock_renderer.render(data)
+        stock_parser, fast_parser = parsers.JSONParser(), JSONParser()
+        compare(
+            f"parse {label}",
+            lambda: stock_parser.parse(BytesIO(body)),
+            lambda: fast_parser.parse(BytesIO(body)),
+            repeats
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Benchmark: product list rendering with and without the fragment cache
+Runs against a throwaway in-memory database, so it never touches db.sqlite3
+
+Usage: python bench_product_fragments.py [repeats]
+"""
+
+import os
+import sys
+import time
+import base64
+
+# Setup Django with an in-memory database
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'sorbo_back.settings')
+from django.conf import settings
+settings.DATABASES['default']['NAME'] = ':memory:'
+
+import django
+django.setup()
+
+from django.core.cache import caches
+from django.core.management import call_command
+from rest_framework.renderers import JSONRenderer
+
+from api.fragments import render_product_list
+from api.models import Product
+from api.serializers import ProductSerializer
+
+PICTURE = "data:image/jpeg;base64," + base64.b64encode(os.urandom(3000)).decode()
+
+
+def create_products(count):
+    Product.objects.all().delete()
+    Product.objects.bulk_create([
+        Product(
+            picture=PICTURE,
+            name=f"Product {i}",
+            description=f"Description for product {i}",
+            stock=i % 50,
+            type=f"type-{i % 20}",
+            price_pesos=f"{100 + i % 900}.50",
+        )
+        for i in range(count)
+    ], batch_size=1000)
+
+
+def without_cache():
+    products = list(Product.objects.all())
+    return JSONRenderer().render(ProductSerializer(products, many=True).data)
+
+
+def with_cache():
+    # Same as ProductViewSet.list: only keys are loaded, full rows for misses
+    products = list(Product.objects.only('id', 'updated_at'))
+    return render_product_list(products)
+
+
+def best_of(func, repeats):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return min(timings)
+
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    call_command('migrate', verbosity=0)
+
+    print("🚀 Product list rendering benchmark")
+    print("=" * 60)
+    print(f"{'products':>10} {'DRF (ms)':>12} {'cold (ms)':>12} {'warm (ms)':>12} {'speedup':>9}")
+
+    for count in (1000, 10000):
+        create_products(count)
+        assert without_cache() == with_cache(), "Fragment output differs from DRF output"
+
+        drf_ms = best_of(without_cache, repeats)
+
+        caches[settings.PRODUCT_FRAGMENT_CACHE_ALIAS].clear()
+        start = time.perf_counter()
+        with_cache()
+        cold_ms = (time.perf_counter() - start) * 1000
+
+        warm_ms = best_of(with_cache, repeats)
+        print(f"{count:>10} {drf_ms:>12.1f} {cold_ms:>12.1f} {warm_ms:>12.1f} {drf_ms / warm_ms:>8.1f}x")
+
+    print("\nDRF: ProductSerializer + JSONRenderer on every call")
+    print("cold: fragment cache empty, every product serialized and stored")
+    print("warm: every fragment served from the cache")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Benchmark: product name suggestions from the in-memory prefix index
+Reports build time, memory footprint and per-lookup latency
+Runs against a throwaway in-memory database, so it never touches db.sqlite3
+
+Usage: python bench_suggest.py [products]
+"""
+
+import os
+import sys
+import time
+
+# Setup Django with an in-memory database
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'sorbo_back.settings')
+from django.conf import settings
+settings.DATABASES['default']['NAME'] = ':memory:'
+
+import django
+django.setup()
+
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from api.models import Product
+from api.suggest import get_prefix_index
+
+FLAVORS = ["Mango", "Limón", "Fresa", "Chocolate", "Vainilla", "Nuez", "Tamarindo", "Guanábana"]
+KINDS = ["Paleta", "Helado", "Nieve", "Sorbete"]
+PREFIXES = ["p", "pal", "paleta de", "lim", "limon", "guanabana 1", "sorbete de chocolate 1", "zzz"]
+
+
+def create_products(count):
+    Product.objects.bulk_create([
+        Product(
+            picture="",
+            name=f"{KINDS[i % len(KINDS)]} de {FLAVORS[i % len(FLAVORS)]} {i}",
+            description="",
+            stock=i % 50,
+            type=KINDS[i % len(KINDS)].lower(),
+            price_pesos="25.00",
+        )
+        for i in range(count)
+    ], batch_size=1000)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    repeats = 10000
+    call_command('migrate', verbosity=0)
+    create_products(count)
+
+    start = time.perf_counter()
+    index = get_prefix_index()
+    build_ms = (time.perf_counter() - start) * 1000
+
+    print("🚀 Product suggest benchmark")
+    print("=" * 60)
+    print(f"Products: {len(index)}, word keys: {len(index.word_keys)}")
+    print(f"Build: {build_ms:.1f} ms")
+    print(f"Memory: {index.memory_footprint() / 1024:.1f} KiB "
+          f"({index.memory_footprint() / max(len(index), 1):.0f} bytes/product)")
+    print(f"\n{'prefix':<24} {'results':>8} {'µs/lookup':>10}")
+
+    with CaptureQueriesContext(connection) as queries:
+        for prefix in PREFIXES:
+            results = get_prefix_index().suggest(prefix)
+            start = time.perf_counter()
+            for _ in range(repeats):
+                index.suggest(prefix)
+            lookup_us = (time.perf_counter() - start) * 1e6 / repeats
+            print(f"{prefix!r:<24} {len(results):>8} {lookup_us:>10.2f}")
+    assert not queries.captured_queries, "Suggest lookups hit the database"
+
+
+if __name__ == "__main__":
+    main()
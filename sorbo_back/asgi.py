@@ -3,6 +3,11 @@ ASGI config for sorbo_back project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+The order status stream (/api/orders/<id>/events/) is an async view and must
+be served through this application, e.g.:
+
+    gunicorn sorbo_back.asgi:application -k uvicorn.workers.UvicornWorker
+
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
 """
@@ -135,6 +135,15 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
     ),
+    # API only - no browsable API in production
+    'DEFAULT_RENDERER_CLASSES': (
+        'api.renderers.JSONRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'api.parsers.JSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ),
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 10
 }
@@ -226,6 +235,71 @@ STRIPE_CANCEL_URL = os.environ.get('FRONTEND_URL', 'https://yourdomain.com') + '
 # Frontend Configuration
 FRONTEND_URL = os.environ.get('FRONTEND_URL', 'https://yourdomain.com')
 
+# Order status events (Server-Sent Events on /api/orders/<id>/events/)
+ORDER_EVENTS_POLL_INTERVAL = 1.0  # Seconds between cross-process status checks
+ORDER_EVENTS_KEEPALIVE = 15  # Seconds between keep-alive comments on idle streams
+
+# Cache - shared by all gunicorn workers
+# Uses Redis when REDIS_URL is set (requires the redis package), otherwise files on disk
+REDIS_URL = os.environ.get('REDIS_URL')
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': BASE_DIR / 'cache',
+            'OPTIONS': {
+                'MAX_ENTRIES': 5000,
+            },
+        }
+    }
+
+# Product JSON fragments are keyed by updated_at and never go stale,
+# so a per-process cache is safe for them
+CACHES['fragments'] = {
+    'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    'LOCATION': 'sorbo-fragments',
+    'OPTIONS': {
+        'MAX_ENTRIES': 20000,
+    },
+}
+
+# Product catalog response cache (also holds the restock report); the default
+# cache above is already shared between processes
+CATALOG_CACHE_ALIAS = 'default'
+CATALOG_CACHE_TIMEOUT = 300  # Seconds
+PRODUCT_FRAGMENT_CACHE_ALIAS = 'fragments'
+PRODUCT_FRAGMENT_TIMEOUT = 86400  # Seconds
+
+# Product delta sync: hold back changes newer than this so late commits aren't skipped
+CHANGES_SETTLE_SECONDS = 2
+
+# Parquet order export: leave orders updated this recently for the next run
+ORDER_EXPORT_SETTLE_SECONDS = 5
+
+# Product catalog import (manage.py import_products and POST /api/products/import/)
+PRODUCT_IMPORT_WORKERS = None  # Image processes for manage.py import_products, defaults to the CPU count
+PRODUCT_IMPORT_CHUNK_SIZE = 500  # Rows per transaction
+PRODUCT_IMPORT_MAX_IMAGE_SIZE = 1200  # Pixels, pictures are downscaled only if Pillow is installed
+
+# Restock forecast (GET /api/reports/restock/ and manage.py refresh_restock_report)
+RESTOCK_LEAD_TIME_DAYS = 7  # Days from placing a supplier order to receiving it
+RESTOCK_SAFETY_DAYS = 3  # Extra days of sales kept as safety stock
+RESTOCK_COVER_DAYS = 30  # Days of sales a suggested order should cover
+RESTOCK_REPORT_TIMEOUT = 7200  # Seconds; refresh the report more often than this
+
+# Shipping labels (POST /api/orders/labels/ and manage.py process_label_batches)
+LABEL_WORKERS = None  # Render processes, defaults to the CPU count
+LABEL_MAX_ORDERS = 2000  # Orders per batch
+LABEL_POLL_INTERVAL = 5  # Seconds between queue checks when idle
+LABEL_STALE_SECONDS = 600  # Batches processing longer than this are picked up again
+
 # Logging Configuration
 LOGGING = {
     'version': 1,
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Test script for bulk order status transitions
+Marks every paid order on the first page as sent in one request, then repeats it
+"""
+
+import time
+import uuid
+import requests
+
+# Configuration
+BASE_URL = "http://localhost:8000/api"
+LOGIN_URL = f"{BASE_URL}/login/"
+ORDERS_URL = f"{BASE_URL}/orders/"
+BULK_STATUS_URL = f"{BASE_URL}/orders/bulk_status/"
+
+# Test credentials
+TEST_CREDENTIALS = {
+    "username": "s0rb0mx24",
+    "password": "s0rb0s0rb1t0"
+}
+
+
+def login():
+    """Login and get access token"""
+    response = requests.post(LOGIN_URL, json=TEST_CREDENTIALS)
+    if response.status_code == 200:
+        return response.json()['access_token']
+    print(f"Login failed: {response.status_code} - {response.text}")
+    return None
+
+
+def summarize(results):
+    counts = {}
+    for result in results:
+        counts[result['result']] = counts.get(result['result'], 0) + 1
+    return counts
+
+
+def test_bulk_order_status():
+    print("=== Testing Bulk Order Status ===\n")
+
+    token = login()
+    if not token:
+        return
+    headers = {"Authorization": f"Bearer {token}"}
+
+    orders = requests.get(ORDERS_URL, params={"page_size": 100}, headers=headers).json()['results']
+    order_ids = [order['id'] for order in orders]
+    paid = [order['id'] for order in orders if order['status'] == 'success']
+    print(f"Loaded {len(order_ids)} orders, {len(paid)} in success status")
+
+    print("\n1. Marking the whole page as sent...")
+    start = time.perf_counter()
+    response = requests.post(
+        BULK_STATUS_URL, json={"order_ids": order_ids + [str(uuid.uuid4())], "status": "sent"}, headers=headers
+    )
+    elapsed = (time.perf_counter() - start) * 1000
+    if response.status_code != 200:
+        print(f"❌ Bulk update failed: {response.status_code} - {response.text}")
+        return
+    data = response.json()
+    print(f"✅ {data['updated']} orders updated in {elapsed:.0f}ms: {summarize(data['results'])}")
+    if data['updated'] == len(paid):
+        print("✅ Exactly the paid orders were moved to sent")
+    else:
+        print(f"❌ Expected {len(paid)} updates")
+    for result in data['results']:
+        if result['result'] == 'invalid':
+            print(f"   Example rejection: {result['error']}")
+            break
+
+    print("\n2. Repeating the request...")
+    response = requests.post(BULK_STATUS_URL, json={"order_ids": paid, "status": "sent"}, headers=headers)
+    counts = summarize(response.json().get('results', []))
+    print(f"{'✅' if set(counts) <= {'unchanged'} else '❌'} {counts}")
+
+    print("\n3. Invalid status...")
+    response = requests.post(BULK_STATUS_URL, json={"order_ids": paid[:1], "status": "lost"}, headers=headers)
+    print(f"{'✅' if response.status_code == 400 else '❌'} {response.status_code} - {response.text.strip()}")
+
+
+if __name__ == "__main__":
+    test_bulk_order_status()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Test script for cart checkout
+Places one order for several products with a single Stripe checkout session
+"""
+
+import uuid
+import requests
+
+# Configuration
+BASE_URL = "http://localhost:8000/api"
+PRODUCTS_URL = f"{BASE_URL}/products/"
+ORDERS_URL = f"{BASE_URL}/orders/"
+CART_URL = f"{BASE_URL}/orders/cart/"
+
+CLIENT_INFO = {
+    "client_name": "Cart Tester",
+    "client_email": "cart.tester@example.com",
+    "client_phone": "+525512345678",
+    "client_address": "Av. Reforma 222, CDMX"
+}
+
+
+def test_cart_checkout():
+    print("=== Testing Cart Checkout ===\n")
+
+    products = requests.get(PRODUCTS_URL, params={"page_size": 100}).json()
+    products = products.get('results', products) if isinstance(products, dict) else products
+    in_stock = [product for product in products if product['stock'] > 0 and product['currency'] == 'MXN']
+    if len(in_stock) < 2:
+        print("❌ Need at least two MXN products in stock")
+        return
+    first, second = in_stock[:2]
+
+    print("1. Placing a cart order...")
+    items = [
+        {"product_id": first['id'], "quantity": 1},
+        {"product_id": second['id'], "quantity": 1},
+        {"product_id": first['id']},
+    ]
+    response = requests.post(CART_URL, json={"items": items, **CLIENT_INFO})
+    if response.status_code != 201:
+        print(f"❌ Cart checkout failed: {response.status_code} - {response.text}")
+        return
+    data = response.json()
+    print(f"✅ Order {data['order_id']} for {data['total_pesos']} {data['currency']}")
+    print(f"   Checkout URL: {data['checkout_url']}")
+
+    order = requests.get(f"{ORDERS_URL}{data['order_id']}/").json()
+    lines = [(item['product_name'], item['quantity']) for item in order['items']]
+    print(f"{'✅' if len(lines) == 2 and lines[0][1] == 2 else '❌'} Items: {lines}")
+
+    print("\n2. More units than in stock...")
+    response = requests.post(
+        CART_URL, json={"items": [{"product_id": first['id'], "quantity": first['stock'] + 1}], **CLIENT_INFO}
+    )
+    print(f"{'✅' if response.status_code == 400 else '❌'} {response.status_code} - {response.text.strip()}")
+
+    print("\n3. Unknown product...")
+    response = requests.post(CART_URL, json={"items": [{"product_id": str(uuid.uuid4())}], **CLIENT_INFO})
+    print(f"{'✅' if response.status_code == 400 else '❌'} {response.status_code} - {response.text.strip()}")
+
+
+if __name__ == "__main__":
+    test_cart_checkout()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Test script for the category facets endpoint
+Checks that per-category counts follow product creates, stock changes and deletes
+"""
+
+import uuid
+
+import requests
+
+# Configuration
+BASE_URL = "http://localhost:8000/api"
+LOGIN_URL = f"{BASE_URL}/login/"
+PRODUCTS_URL = f"{BASE_URL}/products/"
+CATEGORIES_URL = f"{BASE_URL}/categories/"
+
+# Test credentials
+TEST_CREDENTIALS = {
+    "username": "s0rb0mx24",
+    "password": "s0rb0s0rb1t0"
+}
+
+TEST_TYPE = "categoria-de-prueba"
+
+
+def login():
+    """Login and get access token"""
+    response = requests.post(LOGIN_URL, json=TEST_CREDENTIALS)
+    if response.status_code == 200:
+        return response.json()['access_token']
+    print(f"Login failed: {response.status_code} - {response.text}")
+    return None
+
+
+def get_counts(name):
+    """Return (product_count, in_stock_count) for a category, (0, 0) if it isn't listed"""
+    for category in requests.get(CATEGORIES_URL).json():
+        if category['name'] == name:
+            return category['product_count'], category['in_stock_count']
+    return 0, 0
+
+
+def find_product_id(name, product_type):
+    """Return the id of the product with this name in a category, None if it isn't listed"""
+    url = PRODUCTS_URL
+    params = {"type": product_type}
+    while url:
+        data = requests.get(url, params=params).json()
+        for product in data['results']:
+            if product['name'] == name:
+                return product['id']
+        url, params = data['next'], None
+    return None
+
+
+def check(label, actual, expected):
+    if actual == expected:
+        print(f"✅ {label}: {actual}")
+    else:
+        print(f"❌ {label}: expected {expected}, got {actual}")
+
+
+def test_categories():
+    print("=== Testing Category Facets ===\n")
+
+    response = requests.get(CATEGORIES_URL)
+    print(f"1. Listing categories: {response.status_code}")
+    for category in response.json():
+        print(f"   - {category['name']}: {category['product_count']} products, {category['in_stock_count']} in stock")
+
+    token = login()
+    if not token:
+        return
+    headers = {"Authorization": f"Bearer {token}"}
+    before = get_counts(TEST_TYPE)
+
+    print("\n2. Creating a product in a test category...")
+    product = {
+        # Unique per run; the create response carries no id, so the product is looked up by name
+        "name": f"Producto de prueba {uuid.uuid4().hex[:8]}",
+        "description": "Creado por test_categories.py",
+        "stock": 1,
+        "type": TEST_TYPE,
+        "price_pesos": "10.00"
+    }
+    response = requests.post(PRODUCTS_URL, json=product, headers=headers)
+    if response.status_code != 201:
+        print(f"❌ Failed to create product: {response.status_code} - {response.text}")
+        return
+    product_id = find_product_id(product['name'], TEST_TYPE)
+    if not product_id:
+        print("❌ Created product not found in its category")
+        return
+    check("Counts after create", get_counts(TEST_TYPE), (before[0] + 1, before[1] + 1))
+
+    print("\n3. Setting its stock to 0...")
+    requests.patch(f"{PRODUCTS_URL}{product_id}/", json={"stock": 0}, headers=headers)
+    check("Counts after stock change", get_counts(TEST_TYPE), (before[0] + 1, before[1]))
+
+    print("\n4. Deleting the product...")
+    requests.delete(f"{PRODUCTS_URL}{product_id}/", headers=headers)
+    check("Counts after delete", get_counts(TEST_TYPE), before)
+
+
+if __name__ == "__main__":
+    test_categories()
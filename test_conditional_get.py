@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Test script for conditional GET (ETag / 304) on product and order reads
+"""
+
+import requests
+
+# Configuration
+BASE_URL = "http://localhost:8000/api"
+PRODUCTS_URL = f"{BASE_URL}/products/"
+
+
+def check_not_modified(url):
+    """Fetch a URL, then fetch it again with its ETag and expect 304"""
+    response = requests.get(url)
+    if response.status_code != 200:
+        print(f"❌ FAILED: {url} returned {response.status_code}")
+        return None
+
+    etag = response.headers.get('ETag')
+    print(f"   - ETag: {etag}")
+    print(f"   - Last-Modified: {response.headers.get('Last-Modified')}")
+    if not etag:
+        print("❌ No ETag header")
+        return None
+
+    response = requests.get(url, headers={"If-None-Match": etag})
+    if response.status_code == 304 and not response.content:
+        print("✅ Unchanged resource returns 304 with an empty body")
+    else:
+        print(f"❌ Expected 304, got {response.status_code}")
+    return etag
+
+
+def test_conditional_get():
+    print("=== Testing Conditional GET ===\n")
+
+    print("1. Product list...")
+    check_not_modified(PRODUCTS_URL)
+
+    products = requests.get(PRODUCTS_URL).json().get('results', [])
+    if products:
+        print("\n2. Product detail...")
+        check_not_modified(f"{PRODUCTS_URL}{products[0]['id']}/")
+
+    print("\n3. Stale ETag...")
+    response = requests.get(PRODUCTS_URL, headers={"If-None-Match": '"stale"'})
+    if response.status_code == 200:
+        print("✅ Stale ETag returns the full response")
+    else:
+        print(f"❌ Expected 200, got {response.status_code}")
+
+
+if __name__ == "__main__":
+    test_conditional_get()
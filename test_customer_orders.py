@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Test script for customers and their keyset-paginated orders
+Looks up the customer of the newest order by email and walks all of their orders
+"""
+
+import time
+import requests
+
+# Configuration
+BASE_URL = "http://localhost:8000/api"
+LOGIN_URL = f"{BASE_URL}/login/"
+ORDERS_URL = f"{BASE_URL}/orders/"
+CUSTOMERS_URL = f"{BASE_URL}/customers/"
+
+# Test credentials
+TEST_CREDENTIALS = {
+    "username": "s0rb0mx24",
+    "password": "s0rb0s0rb1t0"
+}
+
+
+def login():
+    """Login and get access token"""
+    response = requests.post(LOGIN_URL, json=TEST_CREDENTIALS)
+    if response.status_code == 200:
+        return response.json()['access_token']
+    print(f"Login failed: {response.status_code} - {response.text}")
+    return None
+
+
+def test_customer_orders():
+    print("=== Testing Customer Orders ===\n")
+
+    token = login()
+    if not token:
+        return
+    headers = {"Authorization": f"Bearer {token}"}
+
+    orders = requests.get(ORDERS_URL, params={"page_size": 1}, headers=headers).json()['results']
+    if not orders or not orders[0]['customer_id']:
+        print("❌ Need an order with a client email")
+        return
+    order = orders[0]
+
+    print("1. Looking up the customer by email (different case)...")
+    response = requests.get(CUSTOMERS_URL, params={"email": f"  {order['client_email'].upper()} "}, headers=headers)
+    customers = response.json()['results']
+    found = len(customers) == 1 and customers[0]['id'] == order['customer_id']
+    print(f"{'✅' if found else '❌'} {customers[0]['email'] if customers else 'not found'}")
+
+    print("\n2. Walking the customer's orders 10 at a time...")
+    url = f"{CUSTOMERS_URL}{order['customer_id']}/orders/"
+    params = {"page_size": 10}
+    seen, pages = [], 0
+    start = time.perf_counter()
+    while url:
+        data = requests.get(url, params=params, headers=headers).json()
+        seen += [item['id'] for item in data['results']]
+        url, params, pages = data['next'], None, pages + 1
+    elapsed = (time.perf_counter() - start) * 1000
+    print(f"✅ {len(seen)} orders in {pages} pages ({elapsed:.0f}ms)")
+    print(f"{'✅' if len(seen) == len(set(seen)) else '❌'} No order repeated")
+    print(f"{'✅' if order['id'] in seen else '❌'} Newest order included")
+
+
+if __name__ == "__main__":
+    test_customer_orders()
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Golden-output test for the fast-path list serializers
+Checks that FastProductSerializer/FastOrderSerializer render byte-for-byte the
+same JSON as ProductSerializer and the order list serializers, and that the
+order list keeps its payload keys in both versions. Runs against a throwaway
+in-memory database, so it never touches db.sqlite3.
+
+Run with: python test_fast_serializers.py (or pytest test_fast_serializers.py)
+"""
+
+import os
+from decimal import Decimal
+
+# Setup Django with an in-memory database
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'sorbo_back.settings')
+from django.conf import settings
+settings.DATABASES['default']['NAME'] = ':memory:'
+
+import django
+django.setup()
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from api.fast_serializers import FastProductSerializer, FastOrderSerializer
+from api.models import Product, Order
+from api.serializers import ProductSerializer, OrderListSerializer, OrderSnapshotListSerializer
+
+# Keys of /api/orders/ entries; version 1 is the format clients had before the snapshot
+ORDER_KEYS = {
+    'id', 'product', 'customer_id', 'client_name', 'client_email', 'client_phone', 'client_address',
+    'stripe_session_id', 'status', 'total_pesos', 'currency', 'created_at', 'updated_at',
+}
+PRODUCT_KEYS = {
+    'id', 'picture', 'name', 'description', 'stock', 'type', 'price_pesos', 'currency', 'created_at', 'updated_at',
+}
+SNAPSHOT_KEYS = {'id', 'name', 'price_pesos', 'currency', 'picture_hash'}
+
+PRODUCTS = [
+    # Empty picture, smallest price
+    dict(picture='', name='Sorbete', description='Limón', stock=0, type='helado', price_pesos=Decimal('0')),
+    # Unicode, quotes, line separators and a big price
+    dict(picture='data:image/png;base64,iVBORw0KGgo=', name='Paleta "Mango"   ñ',
+         description='Línea 1\nLínea 2', stock=12, type='paleta', price_pesos=Decimal('99999999.99')),
+    # Price with a single decimal
+    dict(picture='data:image/jpeg;base64,/9j/4AAQ', name='Nieve', description='', stock=3,
+         type='nieve', price_pesos=Decimal('10.5'), currency='USD'),
+]
+
+
+def setup_data():
+    call_command('migrate', verbosity=0)
+    Order.objects.all().delete()
+    Product.objects.all().delete()
+    products = [Product.objects.create(**data) for data in PRODUCTS]
+    for index, product in enumerate(products):
+        order = Order(
+            client_name=f'Cliente {index} ñ',
+            client_email=f'cliente{index}@example.com',
+            client_phone='' if index else '5512345678',
+            client_address='Calle 1\nCDMX',
+            stripe_session_id=None if index == 0 else f'cs_test_{index}',
+            status=['pending', 'success', 'cancelled'][index],
+            total_pesos=product.price_pesos,
+            currency=product.currency,
+        )
+        order.capture_product(product)
+        order.save()
+    # The snapshot must not follow later product edits
+    Product.objects.filter(pk=products[0].pk).update(name='Renamed', price_pesos=Decimal('1'))
+
+
+def render(data):
+    return JSONRenderer().render(data)
+
+
+def test_products_match():
+    setup_data()
+    queryset = Product.objects.all()
+    fast = FastProductSerializer()
+    expected = render(ProductSerializer(queryset, many=True).data)
+    actual = render(fast.serialize(queryset.values_list(*fast.columns)))
+    assert actual == expected, f"\n{actual}\n!=\n{expected}"
+
+
+def test_orders_match():
+    setup_data()
+    queryset = Order.objects.all()
+    fast = FastOrderSerializer()
+    expected = render(OrderListSerializer(queryset, many=True).data)
+    actual = render(fast.serialize(queryset.values_list(*fast.columns)))
+    assert actual == expected, f"\n{actual}\n!=\n{expected}"
+    # Version 1 shows the current product
+    assert b'Renamed' in actual
+
+
+def test_snapshot_orders_match():
+    setup_data()
+    queryset = Order.objects.all()
+    fast = FastOrderSerializer(OrderSnapshotListSerializer)
+    expected = render(OrderSnapshotListSerializer(queryset, many=True).data)
+    rows = queryset.values_list(*fast.columns)
+    assert 'api_product' not in str(rows.query)
+    actual = render(fast.serialize(rows))
+    assert actual == expected, f"\n{actual}\n!=\n{expected}"
+    assert b'Renamed' not in actual
+
+
+def test_orders_match_in_other_timezone():
+    setup_data()
+    queryset = Order.objects.all()
+    for serializer_class in (OrderListSerializer, OrderSnapshotListSerializer):
+        fast = FastOrderSerializer(serializer_class)
+        with timezone.override('America/Mexico_City'):
+            expected = render(serializer_class(queryset, many=True).data)
+            actual = render(fast.serialize(queryset.values_list(*fast.columns)))
+        assert actual == expected, f"\n{actual}\n!=\n{expected}"
+
+
+def test_order_list_payload_keys():
+    setup_data()
+    # ALLOWED_HOSTS is empty, so DEBUG only accepts localhost
+    client = APIClient(HTTP_HOST='localhost')
+    client.force_authenticate(User.objects.get_or_create(username='payload-keys')[0])
+    for params, product_keys in (({}, PRODUCT_KEYS), ({'version': '1'}, PRODUCT_KEYS), ({'version': '2'}, SNAPSHOT_KEYS)):
+        response = client.get('/api/orders/', params)
+        assert response.status_code == 200, response.content
+        for entry in response.json()['results']:
+            assert set(entry) == ORDER_KEYS
+            assert set(entry['product']) == product_keys
+    assert client.get('/api/orders/', {'version': '3'}).status_code == 404
+
+
+if __name__ == "__main__":
+    for test in (test_products_match, test_orders_match, test_snapshot_orders_match,
+                 test_orders_match_in_other_timezone, test_order_list_payload_keys):
+        test()
+        print(f"✅ {test.__name__}")
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Test script for shipping label batches
+Queues labels for the first page of orders and waits for the worker to render them
+(run python manage.py process_label_batches alongside the server)
+"""
+
+import time
+import requests
+
+# Configuration
+BASE_URL = "http://localhost:8000/api"
+LOGIN_URL = f"{BASE_URL}/login/"
+ORDERS_URL = f"{BASE_URL}/orders/"
+LABELS_URL = f"{BASE_URL}/orders/labels/"
+
+# Test credentials
+TEST_CREDENTIALS = {
+    "username": "s0rb0mx24",
+    "password": "s0rb0s0rb1t0"
+}
+
+
+def login():
+    """Login and get access token"""
+    response = requests.post(LOGIN_URL, json=TEST_CREDENTIALS)
+    if response.status_code == 200:
+        return response.json()['access_token']
+    print(f"Login failed: {response.status_code} - {response.text}")
+    return None
+
+
+def test_label_batches():
+    print("=== Testing Shipping Label Batches ===\n")
+
+    token = login()
+    if not token:
+        return
+    headers = {"Authorization": f"Bearer {token}"}
+
+    orders = requests.get(ORDERS_URL, params={"page_size": 100}, headers=headers).json()['results']
+    order_ids = [order['id'] for order in orders]
+    print(f"Loaded {len(order_ids)} orders")
+    if not order_ids:
+        return
+
+    print("\n1. Queueing labels...")
+    start = time.perf_counter()
+    response = requests.post(LABELS_URL, json={"order_ids": order_ids}, headers=headers)
+    elapsed = (time.perf_counter() - start) * 1000
+    if response.status_code != 202:
+        print(f"❌ Queueing failed: {response.status_code} - {response.text}")
+        return
+    batch = response.json()
+    print(f"✅ Batch {batch['id']} queued in {elapsed:.0f}ms ({batch['order_count']} orders)")
+
+    print("\n2. Download before rendering...")
+    response = requests.get(f"{BASE_URL}/label-batches/{batch['id']}/download/", headers=headers)
+    print(f"{'✅' if response.status_code in (200, 409) else '❌'} {response.status_code}")
+
+    print("\n3. Waiting for the worker...")
+    deadline = time.time() + 60
+    while batch['status'] in ('pending', 'processing') and time.time() < deadline:
+        time.sleep(1)
+        batch = requests.get(f"{BASE_URL}/label-batches/{batch['id']}/", headers=headers).json()
+    if batch['status'] != 'done':
+        print(f"❌ Batch is {batch['status']} {batch['error']}")
+        return
+    print(f"✅ Rendered {batch['page_count']} pages")
+
+    print("\n4. Downloading the PDF...")
+    response = requests.get(batch['download_url'], headers=headers)
+    is_pdf = response.headers.get('Content-Type') == 'application/pdf' and response.content.startswith(b'%PDF')
+    print(f"{'✅' if is_pdf else '❌'} {len(response.content)} bytes")
+    if is_pdf:
+        with open('labels.pdf', 'wb') as output:
+            output.write(response.content)
+        print("   Saved to labels.pdf")
+
+    print("\n5. Unknown order...")
+    response = requests.post(
+        LABELS_URL, json={"order_ids": ["00000000-0000-0000-0000-000000000000"]}, headers=headers
+    )
+    print(f"{'✅' if response.status_code == 400 else '❌'} {response.status_code} - {response.text.strip()}")
+
+
+if __name__ == "__main__":
+    test_label_batches()
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Test script for the order status Server-Sent Events stream
+Run the server with the ASGI app (uvicorn) before running this script
+"""
+
+import json
+import sys
+import requests
+
+# Configuration
+BASE_URL = "http://localhost:8000/api"
+ORDERS_URL = f"{BASE_URL}/orders/"
+
+
+def listen_for_status_changes(order_id, max_events=5):
+    """Open the event stream for an order and print every status received"""
+    print(f"Listening for status changes on order {order_id}...")
+    response = requests.get(f"{ORDERS_URL}{order_id}/events/", stream=True, timeout=60)
+
+    if response.status_code != 200:
+        print(f"❌ FAILED: {response.status_code} - {response.text}")
+        return
+
+    print(f"✅ Stream opened ({response.headers.get('Content-Type')})")
+    received = 0
+    for line in response.iter_lines(decode_unicode=True):
+        if line.startswith('data: '):
+            event = json.loads(line[len('data: '):])
+            received += 1
+            print(f"   - Status: {event['status']} (updated at {event['updated_at']})")
+            if received >= max_events:
+                break
+        elif line.startswith(':'):
+            print("   - keep-alive")
+
+    print(f"✅ Received {received} status event(s)")
+
+
+def test_missing_order():
+    """The stream should return 404 for unknown orders"""
+    response = requests.get(f"{ORDERS_URL}00000000-0000-0000-0000-000000000000/events/")
+    if response.status_code == 404:
+        print("✅ Unknown order returns 404")
+    else:
+        print(f"❌ Expected 404, got {response.status_code}")
+
+
+if __name__ == "__main__":
+    test_missing_order()
+    if len(sys.argv) > 1:
+        listen_for_status_changes(sys.argv[1])
+    else:
+        print("Usage: python test_order_events.py <order_id>")
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Test script for the streaming order export
+Downloads the CSV and NDJSON exports chunk by chunk and checks they agree
+For scheduled dumps use: python manage.py export_orders --format csv -o orders.csv
+"""
+
+import csv
+import io
+import json
+import time
+import requests
+
+# Configuration
+BASE_URL = "http://localhost:8000/api"
+LOGIN_URL = f"{BASE_URL}/login/"
+EXPORT_URL = f"{BASE_URL}/orders/export/"
+
+# Test credentials
+TEST_CREDENTIALS = {
+    "username": "s0rb0mx24",
+    "password": "s0rb0s0rb1t0"
+}
+
+
+def login():
+    """Login and get access token"""
+    response = requests.post(LOGIN_URL, json=TEST_CREDENTIALS)
+    if response.status_code == 200:
+        return response.json()['access_token']
+    print(f"Login failed: {response.status_code} - {response.text}")
+    return None
+
+
+def download(params, headers):
+    """Stream an export and return its body, the chunk count and the elapsed time"""
+    start = time.perf_counter()
+    chunks = 0
+    body = io.BytesIO()
+    with requests.get(EXPORT_URL, params=params, headers=headers, stream=True) as response:
+        if response.status_code != 200:
+            print(f"❌ Export failed: {response.status_code} - {response.text}")
+            return None, 0, 0
+        for chunk in response.iter_content(chunk_size=None):
+            body.write(chunk)
+            chunks += 1
+    return body.getvalue().decode('utf-8'), chunks, time.perf_counter() - start
+
+
+def test_order_export():
+    print("=== Testing Order Export ===\n")
+
+    token = login()
+    if not token:
+        return
+    headers = {"Authorization": f"Bearer {token}"}
+
+    print("1. CSV export...")
+    csv_body, chunks, seconds = download({"format": "csv"}, headers)
+    if csv_body is None:
+        return
+    rows = list(csv.DictReader(io.StringIO(csv_body)))
+    print(f"✅ {len(rows)} orders in {chunks} chunks ({seconds:.2f}s)")
+
+    print("\n2. NDJSON export...")
+    ndjson_body, chunks, seconds = download({"format": "ndjson"}, headers)
+    if ndjson_body is None:
+        return
+    records = [json.loads(line) for line in ndjson_body.splitlines()]
+    print(f"✅ {len(records)} orders in {chunks} chunks ({seconds:.2f}s)")
+
+    if [row['id'] for row in rows] == [record['id'] for record in records]:
+        print("✅ Both exports list the same orders in the same order")
+    else:
+        print("❌ CSV and NDJSON exports differ")
+
+    if records:
+        order = requests.get(f"{BASE_URL}/orders/{records[0]['id']}/", headers=headers).json()
+        exported = (records[0]['created_at'], rows[0]['created_at'])
+        if exported == (order['created_at'], order['created_at']):
+            print(f"✅ Timestamps match the API: {order['created_at']}")
+        else:
+            print(f"❌ Exported timestamps {exported} differ from the API's {order['created_at']}")
+
+    print("\n3. Filtered export (paid orders)...")
+    body, _, _ = download({"format": "ndjson", "status": "success,sent,shipped,delivered"}, headers)
+    statuses = {json.loads(line)['status'] for line in (body or '').splitlines()}
+    print(f"   Statuses: {sorted(statuses)}")
+
+    print("\n4. Invalid filter...")
+    response = requests.get(EXPORT_URL, params={"format": "ndjson", "from": "yesterday"}, headers=headers)
+    print(f"{'✅' if response.status_code == 400 else '❌'} {response.status_code} - {response.text.strip()}")
+
+
+if __name__ == "__main__":
+    test_order_export()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Test for the admin order search (api/customers.py search_orders)
+Runs against a throwaway in-memory database, so it never touches db.sqlite3.
+
+Run with: python test_order_search.py (or pytest test_order_search.py)
+"""
+
+import os
+from decimal import Decimal
+
+# Setup Django with an in-memory database
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'sorbo_back.settings')
+from django.conf import settings
+settings.DATABASES['default']['NAME'] = ':memory:'
+
+import django
+django.setup()
+
+from django.core.management import call_command
+
+from api.customers import search_orders
+from api.models import Customer, Order, Product
+
+_orders = {}
+
+
+def setup_data():
+    if _orders:
+        return _orders
+    call_command('migrate', verbosity=0)
+    product = Product.objects.create(
+        picture='', name='Paleta', description='', stock=10, type='paleta', price_pesos=Decimal('20')
+    )
+    clients = (
+        ('old', 'Ana López', 'ana@example.com', '5550001111'),
+        ('new', 'Ana López', 'ana@example.com', '5550002222'),
+        ('smith', 'Smith Ruiz', 'smith@example.com', '5550003333'),
+        ('angel', 'Ángel Ruiz', 'angel@example.com', '5550004444'),
+    )
+    for key, name, email, phone in clients:
+        _orders[key] = Order.objects.create(
+            product=product, client_name=name, client_email=email, client_phone=phone,
+            client_address='CDMX', total_pesos=Decimal('20'),
+        )
+    return _orders
+
+
+def found(term):
+    return set(search_orders(Order.objects.all(), term).values_list('pk', flat=True))
+
+
+def test_name_prefix_ignores_case():
+    orders = setup_data()
+    ana = {orders['old'].pk, orders['new'].pk}
+    assert found('smith') == {orders['smith'].pk}
+    assert found('ana') == ana
+    assert found('ANA LÓ') == ana
+    assert found('ángel') == {orders['angel'].pk}
+    # Prefix only
+    assert found('ruiz') == set()
+
+
+def test_phone_matches_older_orders():
+    orders = setup_data()
+    # The customer's phone follows the latest order
+    assert Customer.objects.get(email='ana@example.com').phone == '5550002222'
+    assert found('5550001111') == {orders['old'].pk}
+    assert found('5550002222') == {orders['new'].pk}
+
+
+def test_email_and_id():
+    orders = setup_data()
+    assert found(' ANA@example.com ') == {orders['old'].pk, orders['new'].pk}
+    assert found(str(orders['smith'].pk)) == {orders['smith'].pk}
+
+
+if __name__ == "__main__":
+    for test in (test_name_prefix_ignores_case, test_phone_matches_older_orders, test_email_and_id):
+        test()
+        print(f"✅ {test.__name__}")
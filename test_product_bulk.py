@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Test script for the bulk product endpoint
+Creates, updates and deletes a batch of products in single requests
+"""
+
+import time
+import requests
+
+# Configuration
+BASE_URL = "http://localhost:8000/api"
+LOGIN_URL = f"{BASE_URL}/login/"
+BULK_URL = f"{BASE_URL}/products/bulk/"
+
+# Test credentials
+TEST_CREDENTIALS = {
+    "username": "s0rb0mx24",
+    "password": "s0rb0s0rb1t0"
+}
+
+BATCH_SIZE = 5000
+
+
+def login():
+    """Login and get access token"""
+    response = requests.post(LOGIN_URL, json=TEST_CREDENTIALS)
+    if response.status_code == 200:
+        return response.json()['access_token']
+    print(f"Login failed: {response.status_code} - {response.text}")
+    return None
+
+
+def post_bulk(items, headers):
+    start = time.perf_counter()
+    response = requests.post(BULK_URL, json=items, headers=headers)
+    return response, time.perf_counter() - start
+
+
+def test_product_bulk():
+    print("=== Testing Bulk Product Endpoint ===\n")
+
+    token = login()
+    if not token:
+        return
+    headers = {"Authorization": f"Bearer {token}"}
+
+    print(f"1. Creating {BATCH_SIZE} products...")
+    items = [
+        {
+            "name": f"Producto masivo {i}",
+            "description": "Creado por test_product_bulk.py",
+            "stock": i % 10,
+            "type": "prueba-masiva",
+            "price_pesos": "25.00"
+        }
+        for i in range(BATCH_SIZE)
+    ]
+    response, seconds = post_bulk(items, headers)
+    if response.status_code != 200:
+        print(f"❌ Bulk create failed: {response.status_code} - {response.text[:500]}")
+        return
+    results = response.json()['results']
+    ids = [result['id'] for result in results]
+    print(f"✅ {len(results)} products created in {seconds:.2f}s")
+
+    print("\n2. Updating their stock...")
+    response, seconds = post_bulk([{"id": product_id, "stock": 99} for product_id in ids], headers)
+    statuses = {result['status'] for result in response.json().get('results', [])}
+    print(f"{'✅' if statuses == {'updated'} else '❌'} Update returned {statuses} in {seconds:.2f}s")
+
+    print("\n3. Sending one invalid item...")
+    response, _ = post_bulk([{"id": ids[0], "stock": -1}], headers)
+    if response.status_code == 400:
+        print(f"✅ Rejected: {response.json()['errors']}")
+    else:
+        print(f"❌ Expected 400, got {response.status_code}")
+
+    print("\n4. Deleting them...")
+    response, seconds = post_bulk([{"action": "delete", "id": product_id} for product_id in ids], headers)
+    statuses = {result['status'] for result in response.json().get('results', [])}
+    print(f"{'✅' if statuses == {'deleted'} else '❌'} Delete returned {statuses} in {seconds:.2f}s")
+
+
+if __name__ == "__main__":
+    test_product_bulk()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Test script for the product catalog response cache
+Checks that repeated reads are served from cache and that writes invalidate it
+"""
+
+import time
+import requests
+
+# Configuration
+BASE_URL = "http://localhost:8000/api"
+LOGIN_URL = f"{BASE_URL}/login/"
+PRODUCTS_URL = f"{BASE_URL}/products/"
+
+# Test credentials
+TEST_CREDENTIALS = {
+    "username": "s0rb0mx24",
+    "password": "s0rb0s0rb1t0"
+}
+
+
+def login():
+    """Login and get access token"""
+    response = requests.post(LOGIN_URL, json=TEST_CREDENTIALS)
+    if response.status_code == 200:
+        return response.json()['access_token']
+    print(f"Login failed: {response.status_code} - {response.text}")
+    return None
+
+
+def timed_get(url):
+    start = time.perf_counter()
+    response = requests.get(url)
+    return response, (time.perf_counter() - start) * 1000
+
+
+def test_product_cache():
+    print("=== Testing Product Catalog Cache ===\n")
+
+    print("1. Reading the product list twice...")
+    first, first_ms = timed_get(PRODUCTS_URL)
+    second, second_ms = timed_get(PRODUCTS_URL)
+    print(f"   - First request: {first_ms:.1f} ms")
+    print(f"   - Second request: {second_ms:.1f} ms")
+    if first.json() == second.json():
+        print("✅ Both responses are identical")
+    else:
+        print("❌ Responses differ")
+
+    products = first.json().get('results', [])
+    if not products:
+        print("⚠️  No products to update, skipping invalidation test")
+        return
+
+    token = login()
+    if not token:
+        return
+
+    print("\n2. Updating a product and reading it again...")
+    product = products[0]
+    new_name = f"{product['name']} (updated)"
+    headers = {"Authorization": f"Bearer {token}"}
+    response = requests.patch(f"{PRODUCTS_URL}{product['id']}/", json={"name": new_name}, headers=headers)
+    if response.status_code != 200:
+        print(f"❌ Failed to update product: {response.status_code} - {response.text}")
+        return
+
+    response = requests.get(f"{PRODUCTS_URL}{product['id']}/")
+    if response.json()['name'] == new_name:
+        print("✅ Cache invalidated after update")
+    else:
+        print("❌ Stale product returned after update")
+
+    # Restore the original name
+    requests.patch(f"{PRODUCTS_URL}{product['id']}/", json={"name": product['name']}, headers=headers)
+
+
+if __name__ == "__main__":
+    test_product_cache()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Test script for the product delta sync endpoint
+Builds a local copy of the catalog from /api/products/changes/ and checks that
+an update and a delete arrive in the next incremental fetch
+"""
+
+import time
+import uuid
+
+import requests
+
+# Configuration
+BASE_URL = "http://localhost:8000/api"
+LOGIN_URL = f"{BASE_URL}/login/"
+PRODUCTS_URL = f"{BASE_URL}/products/"
+CHANGES_URL = f"{PRODUCTS_URL}changes/"
+
+# Test credentials
+TEST_CREDENTIALS = {
+    "username": "s0rb0mx24",
+    "password": "s0rb0s0rb1t0"
+}
+
+# Changes newer than CHANGES_SETTLE_SECONDS are held back by the server
+SETTLE_SECONDS = 3
+
+
+def login():
+    """Login and get access token"""
+    response = requests.post(LOGIN_URL, json=TEST_CREDENTIALS)
+    if response.status_code == 200:
+        return response.json()['access_token']
+    print(f"Login failed: {response.status_code} - {response.text}")
+    return None
+
+
+def sync(local, cursor=None):
+    """Apply every page of changes to the local copy and return the new cursor"""
+    while True:
+        params = {"since": cursor} if cursor else {}
+        data = requests.get(CHANGES_URL, params=params).json()
+        for product in data['products']:
+            local[product['id']] = product
+        for product_id in data['deleted']:
+            local.pop(product_id, None)
+        cursor = data['cursor']
+        if not data['has_more']:
+            return cursor
+
+
+def test_product_changes():
+    print("=== Testing Product Delta Sync ===\n")
+
+    token = login()
+    if not token:
+        return
+    headers = {"Authorization": f"Bearer {token}"}
+
+    print("1. Full sync...")
+    local = {}
+    cursor = sync(local)
+    print(f"✅ Local copy has {len(local)} products")
+
+    print("\n2. Creating, updating and deleting a product...")
+    product = {
+        # Unique per run; the create response carries no id, so the product is found by name
+        "name": f"Producto de sincronización {uuid.uuid4().hex[:8]}",
+        "description": "Creado por test_product_changes.py",
+        "stock": 1,
+        "type": "prueba",
+        "price_pesos": "10.00"
+    }
+    response = requests.post(PRODUCTS_URL, json=product, headers=headers)
+    if response.status_code != 201:
+        print(f"❌ Failed to create product: {response.status_code} - {response.text}")
+        return
+    time.sleep(SETTLE_SECONDS)
+    cursor = sync(local, cursor)
+    product_id = next((pk for pk, synced in local.items() if synced['name'] == product['name']), None)
+    if not product_id:
+        print("❌ New product missing")
+        return
+    print("✅ New product synced")
+
+    requests.patch(f"{PRODUCTS_URL}{product_id}/", json={"stock": 5}, headers=headers)
+    time.sleep(SETTLE_SECONDS)
+    cursor = sync(local, cursor)
+    print("✅ Update synced" if local.get(product_id, {}).get('stock') == 5 else "❌ Update missing")
+
+    requests.delete(f"{PRODUCTS_URL}{product_id}/", headers=headers)
+    time.sleep(SETTLE_SECONDS)
+    sync(local, cursor)
+    print("✅ Delete synced" if product_id not in local else "❌ Deleted product still present")
+
+
+if __name__ == "__main__":
+    test_product_changes()
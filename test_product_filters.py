@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Test script for product list filters and ordering
+"""
+
+from decimal import Decimal
+import requests
+
+# Configuration
+BASE_URL = "http://localhost:8000/api"
+PRODUCTS_URL = f"{BASE_URL}/products/"
+
+
+def get_products(**params):
+    response = requests.get(PRODUCTS_URL, params=params)
+    if response.status_code != 200:
+        print(f"❌ FAILED ({params}): {response.status_code} - {response.text}")
+        return None
+    return response.json()['results']
+
+
+def test_product_filters():
+    print("=== Testing Product Filters ===\n")
+
+    print("1. In stock, cheapest first...")
+    products = get_products(in_stock='true', ordering='price_pesos')
+    if products is not None:
+        prices = [Decimal(product['price_pesos']) for product in products]
+        if all(product['stock'] > 0 for product in products) and prices == sorted(prices):
+            print(f"✅ {len(products)} in-stock product(s) sorted by price")
+        else:
+            print("❌ Wrong stock filter or ordering")
+
+    print("\n2. Price range...")
+    products = get_products(min_price='50', max_price='500')
+    if products is not None:
+        if all(Decimal('50') <= Decimal(product['price_pesos']) <= Decimal('500') for product in products):
+            print(f"✅ {len(products)} product(s) between $50 and $500")
+        else:
+            print("❌ Product outside the price range")
+
+    print("\n3. Type filter...")
+    all_products = get_products() or []
+    if all_products:
+        product_type = all_products[0]['type']
+        products = get_products(type=product_type, ordering='name')
+        if products and all(product['type'] == product_type for product in products):
+            print(f"✅ {len(products)} product(s) of type '{product_type}'")
+        else:
+            print("❌ Type filter returned other types")
+
+    print("\n4. Invalid price...")
+    response = requests.get(PRODUCTS_URL, params={'min_price': 'abc'})
+    if response.status_code == 400:
+        print(f"✅ Invalid price rejected: {response.json()}")
+    else:
+        print(f"❌ Expected 400, got {response.status_code}")
+
+
+if __name__ == "__main__":
+    test_product_filters()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Test script for the product catalog import endpoint
+Uploads a small generated CSV (one bad row included) and prints the import report
+For large files use: python manage.py import_products catalog.csv
+"""
+
+import io
+import csv
+import requests
+
+# Configuration
+BASE_URL = "http://localhost:8000/api"
+LOGIN_URL = f"{BASE_URL}/login/"
+IMPORT_URL = f"{BASE_URL}/products/import/"
+
+# Test credentials
+TEST_CREDENTIALS = {
+    "username": "s0rb0mx24",
+    "password": "s0rb0s0rb1t0"
+}
+
+# 1x1 transparent PNG
+PICTURE = (
+    "data:image/png;base64,iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNk"
+    "+M9QDwADhgGAWjR9awAAAABJRU5ErkJggg=="
+)
+
+
+def login():
+    """Login and get access token"""
+    response = requests.post(LOGIN_URL, json=TEST_CREDENTIALS)
+    if response.status_code == 200:
+        return response.json()['access_token']
+    print(f"Login failed: {response.status_code} - {response.text}")
+    return None
+
+
+def build_csv(rows=200):
+    output = io.StringIO()
+    writer = csv.writer(output)
+    writer.writerow(['name', 'description', 'stock', 'type', 'price_pesos', 'picture'])
+    for i in range(rows):
+        writer.writerow([f"Producto importado {i}", "Creado por test_product_import.py", i % 5, "importado", "30.00", PICTURE])
+    # Invalid stock and price
+    writer.writerow(["Producto inválido", "Debe rechazarse", -1, "importado", "abc", ""])
+    return output.getvalue().encode()
+
+
+def test_product_import():
+    print("=== Testing Product Import ===\n")
+
+    token = login()
+    if not token:
+        return
+    headers = {"Authorization": f"Bearer {token}"}
+
+    files = {"file": ("catalogo.csv", build_csv(), "text/csv")}
+    response = requests.post(IMPORT_URL, files=files, headers=headers)
+    if response.status_code != 200:
+        print(f"❌ Import failed: {response.status_code} - {response.text}")
+        return
+
+    report = response.json()
+    print(f"Rows: {report['rows']}, created: {report['created']}, updated: {report['updated']}, "
+          f"rejected: {report['rejected']} ({report['rows_per_second']} rows/s)")
+    for reject in report['rejects']:
+        print(f"   - line {reject['line']}: {reject['errors']}")
+
+    if report['created'] == 200 and report['rejected'] == 1:
+        print("✅ Valid rows imported and the bad row rejected")
+    else:
+        print("❌ Unexpected import report")
+
+
+if __name__ == "__main__":
+    test_product_import()
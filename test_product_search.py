@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Test script for full-text product search (?q=)
+"""
+
+import requests
+
+# Configuration
+BASE_URL = "http://localhost:8000/api"
+PRODUCTS_URL = f"{BASE_URL}/products/"
+
+
+def search(query):
+    response = requests.get(PRODUCTS_URL, params={"q": query})
+    if response.status_code != 200:
+        print(f"❌ FAILED: {response.status_code} - {response.text}")
+        return []
+    data = response.json()
+    print(f"   - '{query}': {data['count']} result(s), {response.elapsed.total_seconds() * 1000:.1f} ms")
+    for product in data['results'][:5]:
+        print(f"     • {product['name']} ({product['type']})")
+    return data['results']
+
+
+def test_product_search():
+    print("=== Testing Product Search ===\n")
+
+    products = requests.get(PRODUCTS_URL).json().get('results', [])
+    if not products:
+        print("⚠️  No products found, create some first")
+        return
+
+    name = products[0]['name']
+    print("1. Searching for an existing product name...")
+    results = search(name)
+    if any(product['id'] == products[0]['id'] for product in results):
+        print("✅ Product found by its name")
+    else:
+        print("❌ Product not found by its name")
+
+    print("\n2. Prefix search...")
+    prefix = name.split()[0][:3]
+    if search(prefix):
+        print("✅ Prefix search returns results")
+    else:
+        print("❌ Prefix search returned nothing")
+
+    print("\n3. Search without matches...")
+    if not search("zzzzqqqxxx"):
+        print("✅ No results for an unknown term")
+
+
+if __name__ == "__main__":
+    test_product_search()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Test for purge_deleted_products
+Soft-deleted products are hard-deleted only once nothing references them: neither
+an order nor any line of a cart order. Runs against a throwaway in-memory
+database, so it never touches db.sqlite3.
+
+Run with: python test_purge_deleted_products.py (or pytest test_purge_deleted_products.py)
+"""
+
+import io
+import os
+from datetime import timedelta
+from decimal import Decimal
+
+# Setup Django with an in-memory database
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'sorbo_back.settings')
+from django.conf import settings
+settings.DATABASES['default']['NAME'] = ':memory:'
+
+import django
+django.setup()
+
+from django.core.management import call_command
+from django.utils import timezone
+
+from api.cart import build_order, place_order
+from api.models import Product
+
+CLIENT = dict(client_name='Cliente', client_email='cliente@example.com', client_phone='', client_address='CDMX')
+
+
+def make_product(name):
+    return Product.objects.create(
+        picture='', name=name, description='', stock=10, type='paleta', price_pesos=Decimal('20')
+    )
+
+
+def soft_delete_long_ago(*products):
+    for product in products:
+        product.soft_delete()
+    Product.all_objects.filter(pk__in=[product.pk for product in products]).update(
+        deleted_at=timezone.now() - timedelta(days=40)
+    )
+
+
+def purge():
+    call_command('purge_deleted_products', days=30, sleep=0, stdout=io.StringIO())
+
+
+def setup_data():
+    call_command('migrate', verbosity=0)
+
+
+def test_purge_keeps_products_with_orders():
+    setup_data()
+    ordered, unused = make_product('Pedida'), make_product('Sin pedidos')
+    place_order(*build_order([(ordered, 1)], CLIENT))
+    soft_delete_long_ago(ordered, unused)
+    purge()
+    assert Product.all_objects.filter(pk=ordered.pk).exists()
+    assert not Product.all_objects.filter(pk=unused.pk).exists()
+
+
+def test_purge_keeps_later_cart_lines():
+    setup_data()
+    first, second, unused = make_product('Primera'), make_product('Segunda'), make_product('Libre')
+    place_order(*build_order([(first, 1), (second, 2)], CLIENT))
+    # second is only referenced by the order's second line
+    soft_delete_long_ago(second, unused)
+    purge()
+    assert Product.all_objects.filter(pk=second.pk).exists()
+    assert not Product.all_objects.filter(pk=unused.pk).exists()
+
+
+if __name__ == "__main__":
+    for test in (test_purge_keeps_products_with_orders, test_purge_keeps_later_cart_lines):
+        test()
+        print(f"✅ {test.__name__}")
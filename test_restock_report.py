@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Test script for the restock forecast report
+Lists the products most at risk of running out and checks the filters
+The cached forecast is refreshed by: python manage.py refresh_restock_report
+"""
+
+import time
+import requests
+
+# Configuration
+BASE_URL = "http://localhost:8000/api"
+LOGIN_URL = f"{BASE_URL}/login/"
+RESTOCK_URL = f"{BASE_URL}/reports/restock/"
+
+# Test credentials
+TEST_CREDENTIALS = {
+    "username": "s0rb0mx24",
+    "password": "s0rb0s0rb1t0"
+}
+
+
+def login():
+    """Login and get access token"""
+    response = requests.post(LOGIN_URL, json=TEST_CREDENTIALS)
+    if response.status_code == 200:
+        return response.json()['access_token']
+    print(f"Login failed: {response.status_code} - {response.text}")
+    return None
+
+
+def test_restock_report():
+    print("=== Testing Restock Report ===\n")
+
+    token = login()
+    if not token:
+        return
+    headers = {"Authorization": f"Bearer {token}"}
+
+    print("1. Full report...")
+    start = time.perf_counter()
+    response = requests.get(RESTOCK_URL, headers=headers)
+    elapsed = (time.perf_counter() - start) * 1000
+    if response.status_code != 200:
+        print(f"❌ Report failed: {response.status_code} - {response.text}")
+        return
+    report = response.json()
+    print(f"✅ {report['count']} products, generated at {report['generated_at']} "
+          f"in {report['seconds']}s (response {elapsed:.0f}ms)")
+
+    days = [product['days_of_stock'] for product in report['products'] if product['days_of_stock'] is not None]
+    print(f"{'✅' if days == sorted(days) else '❌'} Products sorted by days of stock left")
+
+    print("\n2. Products that need restocking...")
+    response = requests.get(RESTOCK_URL, params={"needs_restock": "true", "limit": 10}, headers=headers)
+    data = response.json()
+    print(f"✅ {data['count']} products at or below their reorder point, top {len(data['products'])}:")
+    for product in data['products']:
+        print(f"   {product['name']}: stock {product['stock']}, {product['velocity']}/day, "
+              f"{product['days_of_stock']} days left, order {product['suggested_order']}")
+    if all(product['needs_restock'] for product in data['products']):
+        print("✅ Filter applied")
+    else:
+        print("❌ Filter returned products that don't need restocking")
+
+    print("\n3. Invalid limit...")
+    response = requests.get(RESTOCK_URL, params={"limit": "all"}, headers=headers)
+    print(f"{'✅' if response.status_code == 400 else '❌'} {response.status_code} - {response.text.strip()}")
+
+    print("\n4. Anonymous access...")
+    response = requests.get(RESTOCK_URL)
+    print(f"{'✅' if response.status_code == 401 else '❌'} {response.status_code}")
+
+
+if __name__ == "__main__":
+    test_restock_report()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Test script for the admin sales report
+Reads daily and hourly totals and checks them against the order list
+To backfill or repair the rollups use: python manage.py rebuild_sales_rollups
+"""
+
+import time
+from collections import Counter
+import requests
+
+# Configuration
+BASE_URL = "http://localhost:8000/api"
+LOGIN_URL = f"{BASE_URL}/login/"
+ORDERS_URL = f"{BASE_URL}/orders/"
+SALES_URL = f"{BASE_URL}/reports/sales/"
+
+# Test credentials
+TEST_CREDENTIALS = {
+    "username": "s0rb0mx24",
+    "password": "s0rb0s0rb1t0"
+}
+
+
+def login():
+    """Login and get access token"""
+    response = requests.post(LOGIN_URL, json=TEST_CREDENTIALS)
+    if response.status_code == 200:
+        return response.json()['access_token']
+    print(f"Login failed: {response.status_code} - {response.text}")
+    return None
+
+
+def timed_report(params, headers):
+    start = time.perf_counter()
+    response = requests.get(SALES_URL, params=params, headers=headers)
+    return response, (time.perf_counter() - start) * 1000
+
+
+def test_sales_report():
+    print("=== Testing Sales Report ===\n")
+
+    token = login()
+    if not token:
+        return
+    headers = {"Authorization": f"Bearer {token}"}
+
+    print("1. Daily report for the last 30 days...")
+    response, ms = timed_report({"granularity": "day"}, headers)
+    if response.status_code != 200:
+        print(f"❌ Report failed: {response.status_code} - {response.text}")
+        return
+    report = response.json()
+    print(f"✅ {len(report['buckets'])} rows from {report['from']} to {report['to']} ({ms:.0f}ms)")
+    for row in report['totals']:
+        print(f"   {row['status']:<10} {row['currency']}: {row['orders']} orders, {row['units']} units, ${row['revenue']}")
+
+    print("\n2. Comparing with the order list...")
+    counts = Counter()
+    page = 1
+    while True:
+        orders = requests.get(ORDERS_URL, params={"page": page}, headers=headers).json()
+        for order in orders['results']:
+            if order['created_at'] >= report['from']:
+                counts[order['status']] += 1
+        if not orders.get('next'):
+            break
+        page += 1
+    reported = Counter()
+    for row in report['totals']:
+        reported[row['status']] += row['orders']
+    if counts == reported:
+        print("✅ Order counts by status match the rollups")
+    else:
+        print(f"❌ Orders {dict(counts)} vs rollups {dict(reported)}")
+
+    print("\n3. Hourly report by product...")
+    response, ms = timed_report({"granularity": "hour", "by": "product"}, headers)
+    print(f"{'✅' if response.status_code == 200 else '❌'} {response.status_code}: "
+          f"{len(response.json().get('buckets', []))} rows ({ms:.0f}ms)")
+
+    print("\n4. Invalid granularity...")
+    response, _ = timed_report({"granularity": "week"}, headers)
+    print(f"{'✅' if response.status_code == 400 else '❌'} {response.status_code} - {response.text.strip()}")
+
+    print("\n5. Anonymous access...")
+    response = requests.get(SALES_URL)
+    print(f"{'✅' if response.status_code == 401 else '❌'} {response.status_code}")
+
+
+if __name__ == "__main__":
+    test_sales_report()
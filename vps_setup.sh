@@ -100,7 +100,7 @@ Group=sorbo
 WorkingDirectory=/home/sorbo/sorbo_back
 Environment="PATH=/home/sorbo/sorbo_back/venv/bin"
 Environment="DJANGO_SETTINGS_MODULE=sorbo_back.settings_production"
-ExecStart=/home/sorbo/sorbo_back/venv/bin/gunicorn --workers 2 --bind unix:/home/sorbo/sorbo_back/sorbo.sock sorbo_back.wsgi:application
+ExecStart=/home/sorbo/sorbo_back/venv/bin/gunicorn --workers 2 -k uvicorn.workers.UvicornWorker --bind unix:/home/sorbo/sorbo_back/sorbo.sock sorbo_back.asgi:application
 Restart=always
 
 [Install]